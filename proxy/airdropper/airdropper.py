@@ -1,6 +1,5 @@
 import requests
 import base58
-import psycopg2.extensions
 
 from datetime import datetime
 from decimal import Decimal
@@ -32,10 +31,9 @@ AIRDROP_AMOUNT_SOL = ACCOUNT_CREATION_PRICE_SOL / 2
 class FailedAttempts(BaseDB):
     def __init__(self) -> None:
         super().__init__('failed_airdrop_attempts', [])
-        self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
 
     def airdrop_failed(self, eth_address, reason):
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'''
             INSERT INTO {self._table_name} (attempt_time, eth_address, reason)
             VALUES ({datetime.now().timestamp()}, '{eth_address}', '{reason}')
@@ -45,19 +43,18 @@ class FailedAttempts(BaseDB):
 class AirdropReadySet(BaseDB):
     def __init__(self):
         super().__init__('airdrop_ready', [])
-        self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
 
     def register_airdrop(self, eth_address: str, airdrop_info: dict):
         finished = int(datetime.now().timestamp())
         duration = finished - airdrop_info['scheduled']
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'''
             INSERT INTO {self._table_name} (eth_address, scheduled_ts, finished_ts, duration, amount_galans)
             VALUES ('{eth_address}', {airdrop_info['scheduled']}, {finished}, {duration}, {airdrop_info['amount']})
             ''')
 
     def is_airdrop_ready(self, eth_address):
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f"SELECT 1 FROM {self._table_name} WHERE eth_address = '{eth_address}'")
             return cur.fetchone() is not None
 
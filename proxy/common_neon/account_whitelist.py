@@ -1,5 +1,10 @@
+from __future__ import annotations
+
+import threading
+
+from collections import OrderedDict
 from datetime import datetime
-from typing import Union
+from typing import Union, Optional, NamedTuple
 from logged_groups import logged_group
 
 from ..common_neon.address import EthereumAddress
@@ -10,11 +15,53 @@ from ..common_neon.config import Config
 from ..common_neon.solana_interactor import SolInteractor
 
 
+class AccountPermissionCache:
+    """
+    Balance differences of permission tokens, shared by all validations of the process.
+    Readers don't take the lock: the lookup and the replacement of an item in a dict are atomic.
+    Items are kept in the order of updates, so the oldest ones are evicted first.
+    Concurrent validations can update items with slightly out-of-order timestamps,
+    so the expiration checks the timestamp of each item instead of relying on its position.
+    """
+
+    class Item(NamedTuple):
+        last_update: float
+        diff: int
+
+    _max_size = 100_000
+
+    def __init__(self):
+        self._item_dict: OrderedDict[str, AccountPermissionCache.Item] = OrderedDict()
+        self._update_lock = threading.Lock()
+
+    def get(self, ether_addr: str) -> Optional[AccountPermissionCache.Item]:
+        return self._item_dict.get(ether_addr, None)
+
+    def set(self, ether_addr: str, last_update: float, diff: int, update_int: int) -> None:
+        with self._update_lock:
+            self._item_dict[ether_addr] = AccountPermissionCache.Item(last_update=last_update, diff=diff)
+            self._item_dict.move_to_end(ether_addr)
+
+            while len(self._item_dict) > self._max_size:
+                self._item_dict.popitem(last=False)
+            # expired items are at the beginning, the first fresh item stops the eviction
+            while self._item_dict and (last_update - next(iter(self._item_dict.values())).last_update >= update_int):
+                self._item_dict.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._update_lock:
+            self._item_dict = OrderedDict()
+
+
+# NeonTxValidator creates a new AccountWhitelist for each tx
+_permission_cache = AccountPermissionCache()
+
+
 @logged_group("neon.AccountWhitelist")
 class AccountWhitelist:
-    def __init__(self, config: Config, solana: SolInteractor):
+    def __init__(self, config: Config, solana: SolInteractor, account_cache: Optional[AccountPermissionCache] = None):
         self.solana = solana
-        self.account_cache = {}
+        self.account_cache = account_cache if account_cache is not None else _permission_cache
         self.permission_update_int = config.account_permission_update_int
         self.mint_authority_file = "/spl/bin/evm_loader-keypair.json"
         self.allowance_token = None
@@ -92,19 +139,16 @@ class AccountWhitelist:
         if self.allowance_token is None and self.denial_token is None:
             return True
 
-        cached = self.account_cache.get(ether_addr, None)
+        cached = self.account_cache.get(str(ether_addr))
         current_time = self.get_current_time()
         if cached is not None:
-            diff = current_time - cached['last_update']
+            diff = current_time - cached.last_update
             if diff < self.permission_update_int:
-                return cached['diff'] >= min_balance
+                return cached.diff >= min_balance
 
         try:
             diff = self.read_balance_diff(ether_addr)
-            self.account_cache[ether_addr] = {
-                'last_update': current_time,
-                'diff': diff
-            }
+            self.account_cache.set(str(ether_addr), current_time, diff, self.permission_update_int)
             return diff >= min_balance
         except BaseException as exc:
             self.error(f'Failed to read permissions for {ether_addr}', exc_info=exc)
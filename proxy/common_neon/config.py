@@ -10,9 +10,11 @@ class Config:
     def __init__(self):
         self._solana_url = SOLANA_URL
         self._pp_solana_url = os.environ.get("PP_SOLANA_URL", SOLANA_URL)
+        self._solana_ws_url = os.environ.get("SOLANA_WS_URL", None)
         self._evm_loader_id = SolPubKey(EVM_LOADER_ID)
         self._evm_step_cnt_inc_pct = self._env_decimal("EVM_STEP_COUNT_INC_PCT", "0.5")
         self._mempool_capacity = self._env_int("MEMPOOL_CAPACITY", 10, 4096)
+        self._mempool_client_conn_cnt = self._env_int("MEMPOOL_CLIENT_CONNECTION_COUNT", 1, 4)
         self._holder_size = self._env_int("HOLDER_SIZE", 1024, 131072)  # 128*1024
         self._min_op_balance_to_warn = self._env_int("MIN_OPERATOR_BALANCE_TO_WARN", 9000000000, 9000000000)
         self._min_op_balance_to_err = self._env_int("MIN_OPERATOR_BALANCE_TO_ERR", 1000000000, 1000000000)
@@ -37,11 +39,23 @@ class Config:
         self._start_slot = os.environ.get('START_SLOT', '0')
         self._indexer_parallel_request_cnt = self._env_int("INDEXER_PARALLEL_REQUEST_COUNT", 1, 10)
         self._indexer_poll_cnt = self._env_int("INDEXER_POLL_COUNT", 1, 1000)
+        self._indexer_prefetch_tx_cnt = self._env_int("INDEXER_PREFETCH_TX_COUNT", 0, 2000)
         self._max_account_cnt = self._env_int("MAX_ACCOUNT_COUNT", 20, 60)
         self._skip_preflight = self._env_bool("SKIP_PREFLIGHT", False)
         self._fuzzing_blockhash = self._env_bool("FUZZING_BLOCKHASH", False)
         self._confirm_timeout_sec = self._env_int("CONFIRM_TIMEOUT_SEC", 10, 10)
         self._confirm_check_msec = self._env_int("CONFIRM_CHECK_MSEC", 10, 100)
+        self._rpc_batch_thread_cnt = self._env_int("RPC_BATCH_THREAD_COUNT", 1, 8)
+        self._max_rpc_batch_size = self._env_int("MAX_RPC_BATCH_SIZE", 1, 1000)
+        self._ws_subscription_queue_size = self._env_int("WS_SUBSCRIPTION_QUEUE_SIZE", 1, 1000)
+        self._account_cache_size = self._env_int("ACCOUNT_CACHE_SIZE", 0, 0)
+        self._account_cache_ttl_slot_cnt = self._env_int("ACCOUNT_CACHE_TTL_SLOT_COUNT", 1, 1)
+        self._account_cache_ttl_msec = self._env_int("ACCOUNT_CACHE_TTL_MSEC", 1, 400)
+        self._finalized_response_cache_size = self._env_int("FINALIZED_RESPONSE_CACHE_SIZE", 0, 4096)
+        self._blockhash_refresh_msec = self._env_int("BLOCKHASH_REFRESH_MSEC", 0, 400)
+        self._solana_conn_pool_size = self._env_int("SOLANA_CONN_POOL_SIZE", 1, 8)
+        self._solana_timeout_sec = self._env_int("SOLANA_TIMEOUT_SEC", 1, 15)
+        self._max_log_result_cnt = self._env_int("MAX_LOG_RESULT_COUNT", 1, 10000)
 
         pyth_mapping_account = os.environ.get("PYTH_MAPPING_ACCOUNT", None)
         self._pyth_mapping_account = SolPubKey(pyth_mapping_account) if pyth_mapping_account is not None else None
@@ -69,6 +83,10 @@ class Config:
     def solana_url(self) -> str:
         return self._solana_url
 
+    @property
+    def solana_ws_url(self) -> Optional[str]:
+        return self._solana_ws_url
+
     @property
     def evm_step_cnt_inc_pct(self) -> Decimal:
         return self._evm_step_cnt_inc_pct
@@ -77,6 +95,10 @@ class Config:
     def mempool_capacity(self) -> int:
         return self._mempool_capacity
 
+    @property
+    def mempool_client_conn_cnt(self) -> int:
+        return self._mempool_client_conn_cnt
+
     @property
     def pyth_mapping_account(self) -> Optional[SolPubKey]:
         return self._pyth_mapping_account
@@ -187,6 +209,10 @@ class Config:
     def indexer_poll_cnt(self) -> int:
         return self._indexer_poll_cnt
 
+    @property
+    def indexer_prefetch_tx_cnt(self) -> int:
+        return self._indexer_prefetch_tx_cnt
+
     @property
     def max_account_cnt(self) -> int:
         return self._max_account_cnt
@@ -207,15 +233,61 @@ class Config:
     def confirm_check_msec(self) -> int:
         return self._confirm_check_msec
 
+    @property
+    def rpc_batch_thread_cnt(self) -> int:
+        return self._rpc_batch_thread_cnt
+
+    @property
+    def max_rpc_batch_size(self) -> int:
+        return self._max_rpc_batch_size
+
+    @property
+    def ws_subscription_queue_size(self) -> int:
+        return self._ws_subscription_queue_size
+
+    @property
+    def account_cache_size(self) -> int:
+        return self._account_cache_size
+
+    @property
+    def account_cache_ttl_slot_cnt(self) -> int:
+        return self._account_cache_ttl_slot_cnt
+
+    @property
+    def account_cache_ttl_msec(self) -> int:
+        return self._account_cache_ttl_msec
+
+    @property
+    def finalized_response_cache_size(self) -> int:
+        return self._finalized_response_cache_size
+
+    @property
+    def blockhash_refresh_msec(self) -> int:
+        return self._blockhash_refresh_msec
+
+    @property
+    def solana_conn_pool_size(self) -> int:
+        return self._solana_conn_pool_size
+
+    @property
+    def solana_timeout_sec(self) -> int:
+        return self._solana_timeout_sec
+
+    @property
+    def max_log_result_cnt(self) -> int:
+        return self._max_log_result_cnt
+
     def __str__(self):
         return '\n        '.join([
             '',
             f"SOLANA_URL: {self.solana_url},",
             f"EVM_LOADER_ID: {self.evm_loader_id},",
             f"PP_SOLANA_URL: {self.pyth_solana_url}",
+            f"SOLANA_WS_URL: {self.solana_ws_url}",
             f"PYTH_MAPPING_ACCOUNT: {self.pyth_mapping_account}",
             f"EVM_STEP_COUNT_INC_PCT: {self._evm_step_cnt_inc_pct},",
             f"MP_CAPACITY: {self.mempool_capacity}",
+            f"MEMPOOL_CLIENT_CONNECTION_COUNT: {self.mempool_client_conn_cnt}",
             f"HOLDER_SIZE: {self.holder_size}",
             f"MIN_OPERATOR_BALANCE_TO_WARN: {self.min_operator_balance_to_warn}",
             f"MIN_OPERATOR_BALANCE_TO_ERR: {self.min_operator_balance_to_err}",
@@ -240,10 +312,22 @@ class Config:
             f"START_SLOT: {self.start_slot}",
             f"INDEXER_PARALLEL_REQUEST_COUNT: {self.indexer_parallel_request_cnt}",
             f"INDEXER_POLL_COUNT: {self.indexer_poll_cnt}",
+            f"INDEXER_PREFETCH_TX_COUNT: {self.indexer_prefetch_tx_cnt}",
             f"MAX_ACCOUNT_COUNT: {self.max_account_cnt}",
             f"SKIP_PREFLIGHT: {self.skip_preflight}",
             f"FUZZING_BLOCKHASH: {self.fuzzing_blockhash}",
             f"CONFIRM_TIMEOUT_SEC: {self.confirm_timeout_sec}",
             f"CONFIRM_CHECK_MSEC: {self.confirm_check_msec}",
+            f"RPC_BATCH_THREAD_COUNT: {self.rpc_batch_thread_cnt}",
+            f"MAX_RPC_BATCH_SIZE: {self.max_rpc_batch_size}",
+            f"WS_SUBSCRIPTION_QUEUE_SIZE: {self.ws_subscription_queue_size}",
+            f"ACCOUNT_CACHE_SIZE: {self.account_cache_size}",
+            f"ACCOUNT_CACHE_TTL_SLOT_COUNT: {self.account_cache_ttl_slot_cnt}",
+            f"ACCOUNT_CACHE_TTL_MSEC: {self.account_cache_ttl_msec}",
+            f"FINALIZED_RESPONSE_CACHE_SIZE: {self.finalized_response_cache_size}",
+            f"BLOCKHASH_REFRESH_MSEC: {self.blockhash_refresh_msec}",
+            f"SOLANA_CONN_POOL_SIZE: {self.solana_conn_pool_size}",
+            f"SOLANA_TIMEOUT_SEC: {self.solana_timeout_sec}",
+            f"MAX_LOG_RESULT_COUNT: {self.max_log_result_cnt}",
             ""
         ])
@@ -299,8 +299,7 @@ def emulator(contract, sender, data, value):
         retry_cnt = 0
         while True:
             try:
-                return neon_cli().call(
-                    "emulate",
+                return neon_cli().emulate(
                     "--token_mint", str(neon_token_mint),
                     "--chain_id", str(chain_id),
                     "--max_steps_to_execute", str(max_evm_steps_to_execute),
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import queue
+import select
+import subprocess
+import threading
+import time
+
+from typing import List, Optional
+
+from logged_groups import logged_group, LogMng
+
+
+class EmulatorWorkerError(RuntimeError):
+    pass
+
+
+@logged_group("neon.Proxy")
+class EmulatorWorker:
+    """
+    Long-lived emulator process.
+    Each request is one JSON line on stdin: {"id": 1, "args": [...], "logging_ctx": {...}}
+    Each response is one JSON line on stdout: {"id": 1, "exit_code": 0, "stdout": "...", "stderr": "..."}
+    The args are the neon-cli arguments without --logging_ctx, including the global ones (--url, --evm_loader, ...),
+    so the worker should apply them to each request.
+    """
+
+    def __init__(self, cmd: List[str]):
+        self._cmd = cmd
+        self._proc: Optional[subprocess.Popen] = None
+        self._request_counter = itertools.count()
+        self._read_buf = b''
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._proc.pid if self._proc is not None else None
+
+    def is_alive(self) -> bool:
+        return (self._proc is not None) and (self._proc.poll() is None)
+
+    def start(self) -> None:
+        self.stop()
+        self.debug(f'Start emulator worker: {" ".join(self._cmd)}')
+        self._proc = subprocess.Popen(self._cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self._read_buf = b''
+
+    def stop(self) -> None:
+        if self._proc is None:
+            return
+
+        proc, self._proc = self._proc, None
+        try:
+            proc.kill()
+            proc.wait(timeout=1)
+        except BaseException as exc:
+            self.debug(f'Fail to stop emulator worker {proc.pid}: {str(exc)}')
+
+    def call(self, args: List[str], timeout: float) -> str:
+        if not self.is_alive():
+            self.start()
+
+        request_id = next(self._request_counter) + 1
+        request = {
+            'id': request_id,
+            'args': args,
+            'logging_ctx': LogMng.get_logging_context()
+        }
+
+        try:
+            self._proc.stdin.write(json.dumps(request).encode('utf-8') + b'\n')
+            self._proc.stdin.flush()
+            response = json.loads(self._read_line(time.monotonic() + timeout, timeout, args))
+        except subprocess.TimeoutExpired:
+            self.stop()
+            raise
+        except (OSError, ValueError, EOFError) as exc:
+            self.stop()
+            raise EmulatorWorkerError(f'emulator worker failed: {str(exc)}')
+
+        if response.get('id') != request_id:
+            self.stop()
+            raise EmulatorWorkerError(f'emulator worker returned wrong response id: {response.get("id")}')
+
+        output = response.get('stdout', '')
+        exit_code = response.get('exit_code', 0)
+        if (not output) and (exit_code != 0):
+            raise subprocess.CalledProcessError(
+                exit_code, self._cmd + args, output=output, stderr=response.get('stderr', '')
+            )
+        return output
+
+    def _read_line(self, deadline: float, timeout: float, args: List[str]) -> bytes:
+        fd = self._proc.stdout.fileno()
+        while True:
+            pos = self._read_buf.find(b'\n')
+            if pos != -1:
+                line, self._read_buf = self._read_buf[:pos], self._read_buf[pos + 1:]
+                return line
+
+            wait_time = deadline - time.monotonic()
+            if wait_time <= 0:
+                raise subprocess.TimeoutExpired(self._cmd + args, timeout)
+
+            readable, _, _ = select.select([fd], [], [], wait_time)
+            if not readable:
+                continue
+
+            chunk = os.read(fd, 64 * 1024)
+            if not chunk:
+                raise EOFError('emulator worker closed stdout')
+            self._read_buf += chunk
+
+
+@logged_group("neon.Proxy")
+class EmulatorPool:
+    def __init__(self, cmd: List[str], size: int):
+        self._worker_list = [EmulatorWorker(cmd) for _ in range(size)]
+        self._idle_worker_queue: queue.Queue[EmulatorWorker] = queue.Queue()
+        for worker in self._worker_list:
+            self._idle_worker_queue.put(worker)
+
+    @property
+    def size(self) -> int:
+        return len(self._worker_list)
+
+    def call(self, *args: str, timeout: float) -> str:
+        arg_list = list(args)
+        worker = self._idle_worker_queue.get()
+        try:
+            # A worker can die between requests, so give it one restart before reporting the error
+            was_alive = worker.is_alive()
+            try:
+                return worker.call(arg_list, timeout)
+            except EmulatorWorkerError as exc:
+                if not was_alive:
+                    raise
+                self.debug(f'Restart emulator worker after failure: {str(exc)}')
+            return worker.call(arg_list, timeout)
+        finally:
+            self._idle_worker_queue.put(worker)
+
+    def stop(self) -> None:
+        for worker in self._worker_list:
+            worker.stop()
+
+
+_emulator_pool_lock = threading.Lock()
+_emulator_pool: Optional[EmulatorPool] = None
+_emulator_pool_pid = 0
+
+
+def get_emulator_pool(cmd: List[str], size: int) -> EmulatorPool:
+    """Returns the pool of the current process, the pool of the parent process isn't inherited after fork()"""
+    global _emulator_pool
+    global _emulator_pool_pid
+
+    with _emulator_pool_lock:
+        pid = os.getpid()
+        if (_emulator_pool is None) or (_emulator_pool_pid != pid):
+            _emulator_pool = EmulatorPool(cmd, size)
+            _emulator_pool_pid = pid
+        return _emulator_pool
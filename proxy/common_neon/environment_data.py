@@ -4,6 +4,10 @@ SOLANA_URL = os.environ.get("SOLANA_URL", "http://localhost:8899")
 
 EVM_LOADER_ID = os.environ.get("EVM_LOADER")
 neon_cli_timeout = float(os.environ.get("NEON_CLI_TIMEOUT", "2.5"))
+EMULATOR_POOL_SIZE = int(os.environ.get("EMULATOR_POOL_SIZE", "0"))
+# The command of a long-lived emulator process, see EmulatorWorker for the JSON-lines protocol.
+# The global neon-cli arguments (--commitment, --url, --evm_loader, --loglevel, -vvv) are sent in each request.
+EMULATOR_WORKER_CMD = os.environ.get("EMULATOR_WORKER_CMD", "")
 
 LOG_NEON_CLI_DEBUG = os.environ.get("LOG_NEON_CLI_DEBUG", "NO") == "YES"
 RETRY_ON_FAIL = int(os.environ.get("RETRY_ON_FAIL", "10"))
@@ -1,5 +1,6 @@
 import json
 import os
+import shlex
 import subprocess
 import sys
 from typing import List, Optional
@@ -9,6 +10,8 @@ from logged_groups import logged_group, LogMng
 
 from ..common_neon.solana_transaction import SolAccount
 from ..common_neon.environment_data import SOLANA_URL, EVM_LOADER_ID, LOG_NEON_CLI_DEBUG, neon_cli_timeout
+from ..common_neon.environment_data import EMULATOR_POOL_SIZE, EMULATOR_WORKER_CMD
+from ..common_neon.emulator_pool import get_emulator_pool
 
 
 class CliBase:
@@ -88,20 +91,32 @@ class neon_cli(CliBase):
     def call(self, *args):
         try:
             ctx = json.dumps(LogMng.get_logging_context())
-            cmd = ["neon-cli",
-                   "--commitment=recent",
-                   "--url", SOLANA_URL,
-                   f"--evm_loader={EVM_LOADER_ID}",
-                   f"--logging_ctx={ctx}",
-                   f"--loglevel={self._emulator_logging_level}"
-                   ]\
-                  + (["-vvv"] if LOG_NEON_CLI_DEBUG else [])\
-                  + list(args)
+            cmd = ["neon-cli", f"--logging_ctx={ctx}"] + self._global_arg_list() + list(args)
             return self.run_cli(cmd, timeout=neon_cli_timeout, universal_newlines=True)
         except subprocess.CalledProcessError as err:
             self.error("ERR: neon-cli error {}".format(err))
             raise
 
+    def emulate(self, *args):
+        if (EMULATOR_POOL_SIZE <= 0) or (not EMULATOR_WORKER_CMD):
+            return self.call("emulate", *args)
+
+        try:
+            pool = get_emulator_pool(shlex.split(EMULATOR_WORKER_CMD), EMULATOR_POOL_SIZE)
+            # the logging context is sent in the request
+            return pool.call(*self._global_arg_list(), "emulate", *args, timeout=neon_cli_timeout)
+        except subprocess.CalledProcessError as err:
+            self.error("ERR: neon-cli error {}".format(err))
+            raise
+
+    def _global_arg_list(self) -> List[str]:
+        return ["--commitment=recent",
+                "--url", SOLANA_URL,
+                f"--evm_loader={EVM_LOADER_ID}",
+                f"--loglevel={self._emulator_logging_level}"
+                ]\
+            + (["-vvv"] if LOG_NEON_CLI_DEBUG else [])
+
     @property
     def _emulator_logging_level(self):
         level = logging.getLogger("neon.Emulator").getEffectiveLevel()
@@ -18,6 +18,11 @@ class InvalidParamError(EthereumError):
         EthereumError.__init__(self, message=message, code=-32602, data=data)
 
 
+class LimitExceededError(EthereumError):
+    def __init__(self, message, data=None):
+        EthereumError.__init__(self, message=message, code=-32005, data=data)
+
+
 class ALTError(RuntimeError):
     pass
 
@@ -58,7 +58,12 @@ class NeonTx(rlp.Serializable):
 
     def __init__(self, *args, **kwargs):
         rlp.Serializable.__init__(self, *args, **kwargs)
-        self._msg = None
+        # fields are immutable, a change creates a new object (see rlp.Serializable.copy),
+        #   so the calculated values are valid for the lifetime of the object
+        self._msg: Optional[bytes] = None
+        self._msg_hash: Optional[bytes] = None
+        self._signed_hash: Optional[bytes] = None
+        self._sender_address: Optional[bytes] = None
 
     @classmethod
     def fromString(cls, s) -> NeonTx:
@@ -105,6 +110,11 @@ class NeonTx(rlp.Serializable):
             self._msg = self._unsigned_msg()
         return self._msg
 
+    def hash_unsigned(self) -> bytes:
+        if self._msg_hash is None:
+            self._msg_hash = keccak_256(self.unsigned_msg()).digest()
+        return self._msg_hash
+
     def _signature(self) -> keys.Signature:
         return keys.Signature(vrs=[1 if self.v % 2 == 0 else 0, self.r, self.s])
 
@@ -125,22 +135,28 @@ class NeonTx(rlp.Serializable):
         if self.r >= self.secpk1n or self.s >= self.secpk1n or self.r == 0 or self.s == 0:
             raise InvalidNeonTx(f"Invalid signature values: r={self.r} s={self.s}!")
 
-        sighash = keccak_256(self._unsigned_msg()).digest()
         sig = self._signature()
-        pub = sig.recover_public_key_from_msg_hash(sighash)
+        pub = sig.recover_public_key_from_msg_hash(self.hash_unsigned())
 
         return pub.to_canonical_address()
 
+    def _cached_sender(self) -> bytes:
+        if self._sender_address is None:
+            self._sender_address = self._sender()
+        return self._sender_address
+
     def sender(self) -> str:
-        return self._sender().hex()
+        return self._cached_sender().hex()
 
     def hash_signed(self) -> bytes:
-        return keccak_256(rlp.encode((self.nonce, self.gasPrice, self.gasLimit,
-                                      self.toAddress, self.value, self.callData,
-                                      self.v, self.r, self.s))).digest()
+        if self._signed_hash is None:
+            self._signed_hash = keccak_256(rlp.encode((self.nonce, self.gasPrice, self.gasLimit,
+                                                       self.toAddress, self.value, self.callData,
+                                                       self.v, self.r, self.s))).digest()
+        return self._signed_hash
 
     def contract(self) -> Optional[str]:
         if self.toAddress:
             return None
-        contract_addr = rlp.encode((self._sender(), self.nonce))
+        contract_addr = rlp.encode((self._cached_sender(), self.nonce))
         return keccak_256(contract_addr).digest()[-20:].hex()
@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable
+
+from sha3 import keccak_256
+
+
+LOGS_BLOOM_BYTE_LEN = 256
+EMPTY_LOGS_BLOOM = '0x' + '00' * LOGS_BLOOM_BYTE_LEN
+
+
+def logs_bloom_bits(value: bytes) -> int:
+    """The 3 bits of the 2048-bit bloom for the value, as in the Ethereum Yellow Paper (4.3.1)"""
+    value_hash = keccak_256(value).digest()
+    bits = 0
+    for idx in (0, 2, 4):
+        bits |= 1 << (((value_hash[idx] << 8) | value_hash[idx + 1]) & 2047)
+    return bits
+
+
+@lru_cache(maxsize=4096)
+def _hex_logs_bloom_bits(hex_value: str) -> int:
+    # contracts and event signatures are repeated in the logs of a block
+    return logs_bloom_bits(bytes.fromhex(hex_value[2:]))
+
+
+def calc_logs_bloom(log_list: Iterable[Dict[str, Any]]) -> int:
+    """The bloom of the addresses and topics of the logs, bit N of the result is bit N of the 2048-bit bloom"""
+    logs_bloom = 0
+    for log in log_list:
+        logs_bloom |= _hex_logs_bloom_bits(log['address'])
+        for topic in log['topics']:
+            logs_bloom |= _hex_logs_bloom_bits(topic)
+    return logs_bloom
+
+
+def logs_bloom_to_hex(logs_bloom: int) -> str:
+    return '0x' + logs_bloom.to_bytes(LOGS_BLOOM_BYTE_LEN, 'big').hex()
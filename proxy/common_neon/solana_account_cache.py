@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Any, Iterable, Union
+
+from ..common_neon.solana_transaction import SolPubKey
+
+
+@dataclasses.dataclass
+class _SolAccountCacheEntry:
+    account_info: Optional[Any]
+    block_slot: int
+    time_msec: int
+
+
+class SolAccountInfoCache:
+    """
+    LRU cache of account infos keyed by (pubkey, commitment).
+    An entry expires after `ttl_slot_cnt` newer slots were seen for its commitment, or after `ttl_msec`.
+    """
+
+    _CacheKey = Tuple[str, str]
+
+    def __init__(self, max_size: int, ttl_slot_cnt: int, ttl_msec: int):
+        self._max_size = max_size
+        self._ttl_slot_cnt = ttl_slot_cnt
+        self._ttl_msec = ttl_msec
+        self._lock = threading.Lock()
+        self._entry_dict: OrderedDict[SolAccountInfoCache._CacheKey, _SolAccountCacheEntry] = OrderedDict()
+        self._last_slot_dict: Dict[str, int] = {}
+        self._hit_cnt = 0
+        self._miss_cnt = 0
+        self._stat_hit_cnt = 0
+        self._stat_miss_cnt = 0
+
+    @staticmethod
+    def _now_msec() -> int:
+        return int(time.monotonic() * 1000)
+
+    def __len__(self) -> int:
+        return len(self._entry_dict)
+
+    @property
+    def hit_ratio(self) -> float:
+        total_cnt = self._hit_cnt + self._miss_cnt
+        return self._hit_cnt / total_cnt if total_cnt else 0.0
+
+    def pop_stat(self) -> Tuple[int, int]:
+        """Returns (hit count, miss count) since the previous call"""
+        with self._lock:
+            stat = (self._stat_hit_cnt, self._stat_miss_cnt)
+            self._stat_hit_cnt = self._stat_miss_cnt = 0
+            return stat
+
+    def _is_expired(self, commitment: str, entry: _SolAccountCacheEntry) -> bool:
+        if self._now_msec() - entry.time_msec >= self._ttl_msec:
+            return True
+        last_slot = self._last_slot_dict.get(commitment, 0)
+        return last_slot - entry.block_slot >= self._ttl_slot_cnt
+
+    def get(self, pubkey: Union[str, SolPubKey], commitment: str) -> Tuple[bool, Optional[Any]]:
+        """Returns (is found, account info), account info is None for an absent account"""
+        key = (str(pubkey), commitment)
+        with self._lock:
+            entry = self._entry_dict.get(key)
+            if entry is not None:
+                if not self._is_expired(commitment, entry):
+                    self._entry_dict.move_to_end(key)
+                    self._hit_cnt += 1
+                    self._stat_hit_cnt += 1
+                    return True, entry.account_info
+                del self._entry_dict[key]
+
+            self._miss_cnt += 1
+            self._stat_miss_cnt += 1
+            return False, None
+
+    def put(self, pubkey: Union[str, SolPubKey], commitment: str, block_slot: int,
+            account_info: Optional[Any]) -> None:
+        key = (str(pubkey), commitment)
+        with self._lock:
+            if block_slot > self._last_slot_dict.get(commitment, 0):
+                self._last_slot_dict[commitment] = block_slot
+
+            self._entry_dict[key] = _SolAccountCacheEntry(account_info, block_slot, self._now_msec())
+            self._entry_dict.move_to_end(key)
+            while len(self._entry_dict) > self._max_size:
+                self._entry_dict.popitem(last=False)
+
+    def invalidate(self, pubkey_list: Iterable[Union[str, SolPubKey]]) -> None:
+        with self._lock:
+            for pubkey in pubkey_list:
+                for commitment in self._last_slot_dict.keys():
+                    self._entry_dict.pop((str(pubkey), commitment), None)
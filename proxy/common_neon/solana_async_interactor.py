@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import random
+
+from typing import Any, Dict, List, Optional, Union
+
+import aiohttp
+import base58
+
+from logged_groups import logged_group
+
+from ..common_neon.address import EthereumAddress, ether2program
+from ..common_neon.config import Config
+from ..common_neon.constants import NEON_ACCOUNT_TAG
+from ..common_neon.errors import SolanaUnavailableError
+from ..common_neon.layouts import ACCOUNT_INFO_LAYOUT
+from ..common_neon.solana_account_cache import SolAccountInfoCache
+from ..common_neon.solana_interactor import SolInteractor, AccountInfo, NeonAccountInfo
+from ..common_neon.solana_transaction import SolBlockhash, SolPubKey
+from ..common_neon.utils import SolanaBlockInfo
+
+
+class _SolRetryableError(Exception):
+    def __init__(self, status: int, retry_after: Optional[float]):
+        super().__init__(f'HTTP status {status}')
+        self.retry_after = retry_after
+
+
+@logged_group("neon.Proxy")
+class AsyncSolInteractor:
+    """
+    Asyncio version of SolInteractor for code running in an event loop.
+    It has a bounded pool of connections, per-call timeouts and jittered exponential backoff on retries.
+    """
+
+    _backoff_base_sec = 0.1
+    _backoff_max_sec = 2.0
+    # rate limits and temporary failures of the Solana node
+    _retry_status_set = {429, 502, 503, 504}
+
+    def __init__(self, config: Config, solana_url: str, account_cache: Optional[SolAccountInfoCache] = None):
+        self._config = config
+        self._endpoint_uri = solana_url
+        self._request_counter = itertools.count()
+        self._account_cache = account_cache
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # the session is bound to the running event loop
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._config.solana_conn_pool_size),
+                timeout=aiohttp.ClientTimeout(total=self._config.solana_timeout_sec),
+                json_serialize=json.dumps
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_backoff_sec(self, retry: int, retry_after: Optional[float]) -> float:
+        backoff_sec = random.uniform(0, min(self._backoff_max_sec, self._backoff_base_sec * (2 ** retry)))
+        if retry_after is not None:
+            backoff_sec = max(backoff_sec, min(retry_after, self._backoff_max_sec))
+        return backoff_sec
+
+    async def _send_post_request(self, request: Any) -> Any:
+        """This method is used to make retries to send request to Solana"""
+
+        retry = 0
+        while True:
+            try:
+                retry += 1
+                async with self._get_session().post(self._endpoint_uri, json=request) as raw_response:
+                    if raw_response.status in self._retry_status_set:
+                        retry_after = raw_response.headers.get('Retry-After', '')
+                        raise _SolRetryableError(
+                            raw_response.status, float(retry_after) if retry_after.isdigit() else None
+                        )
+                    raw_response.raise_for_status()
+                    return await raw_response.json(content_type=None)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError, _SolRetryableError) as exc:
+                # Hide the Solana URL
+                str_err = (str(exc) or type(exc).__name__).replace(self._endpoint_uri, 'XXXXX')
+
+                if retry <= self._config.retry_on_fail:
+                    retry_after = exc.retry_after if isinstance(exc, _SolRetryableError) else None
+                    backoff_sec = self._get_backoff_sec(retry, retry_after)
+                    self.debug(
+                        f'Receive error {str_err} on connection to Solana. '
+                        f'Attempt {retry + 1} to send the request to Solana node in {backoff_sec:.3f} sec...'
+                    )
+                    await asyncio.sleep(backoff_sec)
+                    continue
+
+                self.warning(f'Connection exception on send request to Solana. Retry {retry}: {str_err}.')
+                raise SolanaUnavailableError(str_err)
+
+    async def _send_rpc_request(self, method: str, *params: Any) -> Dict[str, Any]:
+        request_id = next(self._request_counter) + 1
+
+        request = {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": method,
+            "params": params
+        }
+        return await self._send_post_request(request)
+
+    async def _send_rpc_batch_request(self, method: str, params_list: List[Any]) -> List[Dict[str, Any]]:
+        full_request_list = []
+        request_list_list: List[List[Dict[str, Any]]] = []
+        request_list = []
+        request_data_len = 0
+
+        for params in params_list:
+            request_id = next(self._request_counter) + 1
+            request = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            request_list.append(request)
+            request_data_len += len(json.dumps(request)) + 2
+            full_request_list.append(request)
+
+            # Protection from big payload
+            if request_data_len >= 48 * 1024 or len(full_request_list) == len(params_list):
+                request_list_list.append(request_list)
+                request_list = []
+                request_data_len = 0
+
+        # parts of a big batch are sent in parallel through the connection pool
+        response_list_list = await asyncio.gather(*[self._send_post_request(r) for r in request_list_list])
+        full_response_list = list(itertools.chain.from_iterable(response_list_list))
+        full_response_list.sort(key=lambda r: r["id"])
+
+        for request, response in itertools.zip_longest(full_request_list, full_response_list):
+            if (request is None) or (response is None) or (request["id"] != response["id"]):
+                raise RuntimeError(f"Invalid RPC response: request {request} response {response}")
+
+        return full_response_list
+
+    async def is_healthy(self) -> bool:
+        status = (await self._send_rpc_request('getHealth')).get('result', 'bad')
+        return status == 'ok'
+
+    async def get_block_slot(self, commitment='confirmed') -> int:
+        opts = {
+            'commitment': commitment
+        }
+        return (await self._send_rpc_request('getSlot', opts)).get('result', 0)
+
+    async def get_block_info(self, block_slot: int, commitment='confirmed') -> SolanaBlockInfo:
+        opts = {
+            "commitment": commitment,
+            "encoding": "json",
+            "transactionDetails": "none",
+            "rewards": False
+        }
+
+        response = await self._send_rpc_request('getBlock', block_slot, opts)
+        net_block = response.get('result', None)
+        if not net_block:
+            return SolanaBlockInfo(block_slot=block_slot)
+
+        return SolInteractor._decode_block_info(block_slot, net_block)
+
+    async def get_block_height(self, block_slot: Optional[int] = None, commitment='confirmed') -> int:
+        opts = {
+            'commitment': commitment
+        }
+        if block_slot is None:
+            block_height_resp = await self._send_rpc_request('getBlockHeight', opts)
+            block_height = block_height_resp.get('result', None)
+        else:
+            block_height = (await self.get_block_info(block_slot, commitment)).block_height
+        return block_height if block_height is not None else 0
+
+    async def get_recent_blockhash(self, commitment='confirmed') -> SolBlockhash:
+        opts = {
+            'commitment': commitment
+        }
+        blockhash_resp = await self._send_rpc_request('getLatestBlockhash', opts)
+        if not blockhash_resp.get("result"):
+            raise RuntimeError("failed to get recent blockhash")
+        blockhash = blockhash_resp.get("result", {}).get("value", {}).get("blockhash", None)
+        return SolBlockhash(blockhash)
+
+    async def get_account_info(self, pubkey: SolPubKey, length=None,
+                               commitment='processed') -> Optional[AccountInfo]:
+        account_info_list = await self.get_account_info_list([pubkey], length, commitment)
+        return account_info_list[0] if len(account_info_list) > 0 else None
+
+    async def get_account_info_list(self, src_account_list: List[SolPubKey], length=None,
+                                    commitment='processed') -> List[Optional[AccountInfo]]:
+        if (self._account_cache is None) or (length is not None):
+            return await self._get_account_info_list_impl(src_account_list, length, commitment)
+
+        cached_info_dict: Dict[int, Optional[AccountInfo]] = {}
+        missed_account_list: List[SolPubKey] = []
+        for idx, pubkey in enumerate(src_account_list):
+            is_found, account_info = self._account_cache.get(pubkey, commitment)
+            if is_found:
+                cached_info_dict[idx] = account_info
+            else:
+                missed_account_list.append(pubkey)
+
+        missed_info_iter = iter(await self._get_account_info_list_impl(missed_account_list, length, commitment))
+        account_info_list = []
+        for idx in range(len(src_account_list)):
+            if idx in cached_info_dict:
+                account_info_list.append(cached_info_dict[idx])
+                continue
+
+            account_info = next(missed_info_iter, False)
+            if account_info is False:
+                # The request has failed, return the received part of accounts
+                break
+            account_info_list.append(account_info)
+        return account_info_list
+
+    async def _get_account_info_list_impl(self, src_account_list: List[SolPubKey], length,
+                                          commitment: str) -> List[Optional[AccountInfo]]:
+        opts = {
+            "encoding": "base64",
+            "commitment": commitment,
+        }
+
+        if not (length is None):
+            opts['dataSlice'] = {
+                'offset': 0,
+                'length': length
+            }
+
+        use_cache = (self._account_cache is not None) and (length is None)
+        account_info_list = []
+        if len(src_account_list) == 0:
+            return account_info_list
+
+        chunk_size = SolInteractor._account_chunk_size
+        chunk_list = [src_account_list[i:i + chunk_size] for i in range(0, len(src_account_list), chunk_size)]
+        request_list = [([str(a) for a in account_list], opts) for account_list in chunk_list]
+        response_list = await self._send_rpc_batch_request("getMultipleAccounts", request_list)
+
+        for account_list, result in zip(chunk_list, response_list):
+            error = result.get('error', None)
+            if error:
+                self.debug(f"Can't get information about accounts {[str(a) for a in account_list]}: {error}")
+                return account_info_list
+
+            block_slot = result.get('result', {}).get('context', {}).get('slot', 0)
+            for pubkey, info in zip(account_list, result.get('result', {}).get('value', None)):
+                if info is None:
+                    account_info = None
+                else:
+                    account_info = AccountInfo.from_raw_account(SolPubKey(pubkey), info)
+                account_info_list.append(account_info)
+
+                if use_cache:
+                    self._account_cache.put(pubkey, commitment, block_slot, account_info)
+        return account_info_list
+
+    async def get_program_account_info_list(self, program: SolPubKey, offset: int, length: int,
+                                            data_offset: int, data: bytes,
+                                            commitment='processed') -> List[AccountInfo]:
+        opts = {
+            "encoding": "base64",
+            "commitment": commitment,
+            "dataSlice": {
+                "offset": offset,
+                "length": length
+            },
+            "filters": [{
+                "memcmp": {
+                    "offset": data_offset,
+                    "bytes": base58.b58encode(data).decode('utf-8'),
+                    "encoding": "base58"
+                }
+            }]
+        }
+        response = await self._send_rpc_request("getProgramAccounts", str(program), opts)
+        error = response.get('error')
+        if error is not None:
+            self.debug(f'fail to get program accounts: {error}')
+            return []
+
+        account_info_list: List[AccountInfo] = []
+        for raw_account in response.get('result', []):
+            address = SolPubKey(raw_account.get('pubkey'))
+            account_info_list.append(AccountInfo.from_raw_account(address, raw_account.get('account', {})))
+        return account_info_list
+
+    async def get_neon_account_info_list(self, eth_accounts: List[Union[str, EthereumAddress]]
+                                         ) -> List[Optional[NeonAccountInfo]]:
+        requests_list = []
+        for eth_account in eth_accounts:
+            if isinstance(eth_account, str):
+                eth_account = EthereumAddress(eth_account)
+            account_sol, _nonce = ether2program(eth_account)
+            requests_list.append(account_sol)
+        responses_list = await self.get_account_info_list(requests_list)
+        accounts_list = []
+        for account_sol, info in zip(requests_list, responses_list):
+            if info is None or len(info.data) < ACCOUNT_INFO_LAYOUT.sizeof() or info.tag != NEON_ACCOUNT_TAG:
+                accounts_list.append(None)
+                continue
+            accounts_list.append(NeonAccountInfo.from_account_info(info))
+        return accounts_list
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from typing import Callable, Optional, Tuple
+
+from logged_groups import logged_group
+
+from ..common_neon.solana_transaction import SolBlockhash
+
+
+@logged_group("neon.Proxy")
+class BlockhashProvider:
+    """
+    Keeps a recent blockhash refreshed in the background, so senders don't wait for getLatestBlockhash.
+    A blockhash is valid for 150 slots, the cached value older than max_age_sec is fetched synchronously.
+    """
+
+    _max_age_sec = 30.0
+
+    def __init__(self, get_recent_blockhash: Callable[[], SolBlockhash], refresh_sec: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self._get_recent_blockhash = get_recent_blockhash
+        self._refresh_sec = refresh_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refresh_event = threading.Event()
+        self._blockhash: Optional[SolBlockhash] = None
+        self._blockhash_time = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> BlockhashProvider:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='blockhash-provider', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.refresh()
+            except BaseException as exc:
+                self.warning('Failed to refresh recent blockhash', exc_info=exc)
+            self._refresh_event.wait(self._refresh_sec)
+            self._refresh_event.clear()
+
+    def refresh(self) -> SolBlockhash:
+        blockhash = self._get_recent_blockhash()
+        with self._lock:
+            self._blockhash = blockhash
+            self._blockhash_time = self._clock()
+        return blockhash
+
+    def get_blockhash(self) -> Tuple[SolBlockhash, float]:
+        """Returns (blockhash, age in seconds)"""
+        with self._lock:
+            blockhash = self._blockhash
+            age = self._clock() - self._blockhash_time
+        if (blockhash is None) or (age >= self._max_age_sec):
+            return self.refresh(), 0.0
+        return blockhash, age
+
+    def invalidate(self, blockhash: SolBlockhash) -> None:
+        """Drops the blockhash rejected with BlockhashNotFound and wakes up the refresh"""
+        with self._lock:
+            if self._blockhash != blockhash:
+                return
+            self._blockhash = None
+        self._refresh_event.set()
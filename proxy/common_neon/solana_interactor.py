@@ -16,7 +16,9 @@ from logged_groups import logged_group
 from typing import Dict, Union, Any, List, Optional, Tuple, cast
 
 from ..common_neon.utils import SolanaBlockInfo
-from ..common_neon.solana_transaction import SolTx, SolBlockhash, SolPubKey
+from ..common_neon.solana_transaction import SolTx, SolBlockhash, SolPubKey, SolWrappedTx
+from ..common_neon.solana_account_cache import SolAccountInfoCache
+from ..common_neon.solana_blockhash_provider import BlockhashProvider
 from ..common_neon.layouts import ACCOUNT_INFO_LAYOUT
 from ..common_neon.layouts import ACTIVE_HOLDER_ACCOUNT_INFO_LAYOUT, FINALIZED_HOLDER_ACCOUNT_INFO_LAYOUT
 from ..common_neon.layouts import HOLDER_ACCOUNT_INFO_LAYOUT
@@ -30,13 +32,56 @@ from ..common_neon.config import Config
 from ..common_neon.elf_params import ElfParams
 
 
-@dataclasses.dataclass
 class AccountInfo:
-    address: SolPubKey
-    tag: int
-    lamports: int
-    owner: SolPubKey
-    data: bytes
+    """Solana account, the data and the owner from an RPC response are decoded on the first access"""
+
+    def __init__(self, address: SolPubKey, tag: int, lamports: int, owner: SolPubKey, data: bytes):
+        self.address = address
+        self.lamports = lamports
+        self._tag: Optional[int] = tag
+        self._owner = owner
+        self._data = data
+        self._raw_owner: Optional[str] = None
+        self._raw_data: Optional[str] = None
+
+    @staticmethod
+    def from_raw_account(address: SolPubKey, raw_account: Dict[str, Any]) -> AccountInfo:
+        info = AccountInfo(address, None, raw_account.get('lamports', 0), None, None)
+        info._raw_owner = raw_account.get('owner', None)
+        info._raw_data = raw_account.get('data', None)[0]
+        return info
+
+    @property
+    def owner(self) -> SolPubKey:
+        raw_owner = self._raw_owner
+        if raw_owner is not None:
+            self._owner = SolPubKey(raw_owner)
+            self._raw_owner = None
+        return self._owner
+
+    @property
+    def data(self) -> bytes:
+        raw_data = self._raw_data
+        if raw_data is not None:
+            self._data = base64.b64decode(raw_data)
+            self._raw_data = None
+        return self._data
+
+    @property
+    def tag(self) -> int:
+        if self._tag is None:
+            data = self.data
+            self._tag = data[0] if len(data) > 0 else 0
+        return self._tag
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, AccountInfo):
+            return False
+        return (self.address, self.tag, self.lamports, self.owner, self.data) == \
+               (other.address, other.tag, other.lamports, other.owner, other.data)
+
+    def __repr__(self) -> str:
+        return f'AccountInfo(address={self.address}, tag={self.tag}, lamports={self.lamports}, owner={self.owner})'
 
 
 @dataclasses.dataclass
@@ -253,6 +298,9 @@ class SolSendResult:
 
 @logged_group("neon.Proxy")
 class SolInteractor:
+    # the limit of getMultipleAccounts
+    _account_chunk_size = 50
+
     def __init__(self, config: Config, solana_url: str) -> None:
         self._config = config
         self._request_counter = itertools.count()
@@ -260,6 +308,46 @@ class SolInteractor:
         self._session = requests.sessions.Session()
         self._fuzzing_hash_cycle = False
 
+        self._account_cache: Optional[SolAccountInfoCache] = None
+        if config.account_cache_size > 0:
+            self._account_cache = SolAccountInfoCache(
+                config.account_cache_size, config.account_cache_ttl_slot_cnt, config.account_cache_ttl_msec
+            )
+        self._blockhash_provider: Optional[BlockhashProvider] = None
+
+    @property
+    def account_cache(self) -> Optional[SolAccountInfoCache]:
+        return self._account_cache
+
+    @property
+    def blockhash_provider(self) -> Optional[BlockhashProvider]:
+        return self._blockhash_provider
+
+    def start_blockhash_provider(self) -> None:
+        """Starts prefetching of recent blockhashes, it's done in processes which send transactions"""
+        if (self._blockhash_provider is not None) or (self._config.blockhash_refresh_msec == 0):
+            return
+
+        # the background thread has its own http session
+        solana = SolInteractor(self._config, self._endpoint_uri)
+        refresh_sec = float(self._config.blockhash_refresh_msec) / 1000
+        self._blockhash_provider = BlockhashProvider(solana.get_recent_blockhash, refresh_sec).start()
+
+    def invalidate_account_info_list(self, pubkey_list: List[Union[str, SolPubKey]]) -> None:
+        if self._account_cache is not None:
+            self._account_cache.invalidate(pubkey_list)
+
+    def invalidate_neon_account_info_list(self, eth_account_list: List[Union[str, EthereumAddress]]) -> None:
+        if self._account_cache is None:
+            return
+
+        pubkey_list: List[SolPubKey] = []
+        for eth_account in eth_account_list:
+            if isinstance(eth_account, str):
+                eth_account = EthereumAddress(eth_account)
+            pubkey_list.append(ether2program(eth_account)[0])
+        self._account_cache.invalidate(pubkey_list)
+
     def _send_post_request(self, request) -> requests.Response:
         """This method is used to make retries to send request to Solana"""
 
@@ -382,13 +470,15 @@ class SolInteractor:
 
     @staticmethod
     def _decode_account_info(address: SolPubKey, raw_account: Dict[str, Any]) -> AccountInfo:
-        data = base64.b64decode(raw_account.get('data', None)[0])
-        account_tag = data[0] if len(data) > 0 else 0
-        lamports = raw_account.get('lamports', 0)
-        owner = SolPubKey(raw_account.get('owner', None))
-        return AccountInfo(address, account_tag, lamports, owner, data)
+        return AccountInfo.from_raw_account(address, raw_account)
 
     def get_account_info(self, pubkey: SolPubKey, length=None, commitment='processed') -> Optional[AccountInfo]:
+        use_cache = (self._account_cache is not None) and (length is None)
+        if use_cache:
+            is_found, account_info = self._account_cache.get(pubkey, commitment)
+            if is_found:
+                return account_info
+
         opts = {
             "encoding": "base64",
             "commitment": commitment,
@@ -408,14 +498,47 @@ class SolInteractor:
             return None
 
         raw_account = result.get('result', {}).get('value', None)
+        account_info = None
         if raw_account is None:
             self.debug(f"Can't get information about {str(pubkey)}")
-            return None
+        else:
+            account_info = self._decode_account_info(pubkey, raw_account)
 
-        return self._decode_account_info(pubkey, raw_account)
+        if use_cache:
+            block_slot = result.get('result', {}).get('context', {}).get('slot', 0)
+            self._account_cache.put(pubkey, commitment, block_slot, account_info)
+        return account_info
 
     def get_account_info_list(self, src_account_list: List[SolPubKey], length=None,
                               commitment='processed') -> List[AccountInfo]:
+        if (self._account_cache is None) or (length is not None):
+            return self._get_account_info_list_impl(src_account_list, length, commitment)
+
+        cached_info_dict: Dict[int, Optional[AccountInfo]] = {}
+        missed_account_list: List[SolPubKey] = []
+        for idx, pubkey in enumerate(src_account_list):
+            is_found, account_info = self._account_cache.get(pubkey, commitment)
+            if is_found:
+                cached_info_dict[idx] = account_info
+            else:
+                missed_account_list.append(pubkey)
+
+        missed_info_iter = iter(self._get_account_info_list_impl(missed_account_list, length, commitment))
+        account_info_list = []
+        for idx in range(len(src_account_list)):
+            if idx in cached_info_dict:
+                account_info_list.append(cached_info_dict[idx])
+                continue
+
+            account_info = next(missed_info_iter, False)
+            if account_info is False:
+                # The request has failed, return the received part of accounts
+                break
+            account_info_list.append(account_info)
+        return account_info_list
+
+    def _get_account_info_list_impl(self, src_account_list: List[SolPubKey], length,
+                                    commitment: str) -> List[AccountInfo]:
         opts = {
             "encoding": "base64",
             "commitment": commitment,
@@ -427,22 +550,35 @@ class SolInteractor:
                 'length': length
             }
 
+        use_cache = (self._account_cache is not None) and (length is None)
         account_info_list = []
-        while len(src_account_list) > 0:
-            account_list = [str(a) for a in src_account_list[:50]]
-            src_account_list = src_account_list[50:]
-            result = self._send_rpc_request("getMultipleAccounts", account_list, opts)
-
+        if len(src_account_list) == 0:
+            return account_info_list
+
+        # all chunks are sent in one batch instead of the round trip per chunk
+        chunk_list = [
+            src_account_list[i:i + self._account_chunk_size]
+            for i in range(0, len(src_account_list), self._account_chunk_size)
+        ]
+        request_list = [([str(a) for a in account_list], opts) for account_list in chunk_list]
+        response_list = self._send_rpc_batch_request("getMultipleAccounts", request_list)
+
+        for account_list, result in zip(chunk_list, response_list):
             error = result.get('error', None)
             if error:
-                self.debug(f"Can't get information about accounts {account_list}: {error}")
+                self.debug(f"Can't get information about accounts {[str(a) for a in account_list]}: {error}")
                 return account_info_list
 
+            block_slot = result.get('result', {}).get('context', {}).get('slot', 0)
             for pubkey, info in zip(account_list, result.get('result', {}).get('value', None)):
                 if info is None:
-                    account_info_list.append(None)
+                    account_info = None
                 else:
-                    account_info_list.append(self._decode_account_info(SolPubKey(pubkey), info))
+                    account_info = self._decode_account_info(SolPubKey(pubkey), info)
+                account_info_list.append(account_info)
+
+                if use_cache:
+                    self._account_cache.put(pubkey, commitment, block_slot, account_info)
         return account_info_list
 
     def get_program_account_info_list(self, program: SolPubKey, offset: int, length: int,
@@ -666,7 +802,20 @@ class SolInteractor:
             block_height = self.get_block_info(cast(int, block_slot), commitment).block_height
         return block_height if block_height is not None else 0
 
+    @staticmethod
+    def _get_writable_key_list(tx_list: List[SolTx]) -> List[str]:
+        key_set = set()
+        for tx in tx_list:
+            if isinstance(tx, SolWrappedTx):
+                tx = tx.tx
+            for ix in tx.instructions:
+                key_set.update(str(meta.pubkey) for meta in ix.keys if meta.is_writable)
+        return list(key_set)
+
     def send_tx_list(self, tx_list: List[SolTx], skip_preflight: bool) -> List[SolSendResult]:
+        if self._account_cache is not None:
+            self._account_cache.invalidate(self._get_writable_key_list(tx_list))
+
         opts = {
             "skipPreflight": skip_preflight,
             "encoding": "base64",
@@ -734,6 +883,27 @@ class SolInteractor:
 
         return block_slot, (block_slot != 0)
 
+    def get_confirmed_tx_sig_list(self, tx_sig_list: List[str]) -> List[str]:
+        """Returns the transactions from the list, which reached the confirmed commitment"""
+        opts = {
+            "searchTransactionHistory": False
+        }
+
+        confirmed_tx_sig_list: List[str] = []
+        while len(tx_sig_list) > 0:
+            (part_tx_sig_list, tx_sig_list) = (tx_sig_list[:100], tx_sig_list[100:])
+            response = self._send_rpc_request("getSignatureStatuses", part_tx_sig_list, opts)
+
+            result = response.get('result', None)
+            if not result:
+                continue
+
+            for tx_sig, status in zip(part_tx_sig_list, result.get('value', [])):
+                if status and (status.get('confirmationStatus', '') != 'processed'):
+                    confirmed_tx_sig_list.append(tx_sig)
+
+        return confirmed_tx_sig_list
+
     def get_tx_receipt_list(self, tx_sig_list: List[str], commitment='confirmed') -> List[Optional[Dict[str, Any]]]:
         if len(tx_sig_list) == 0:
             return []
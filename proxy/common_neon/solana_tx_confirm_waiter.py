@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import abc
+import base64
+import json
+import secrets
+import socket
+import ssl
+import struct
+import time
+
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+from logged_groups import logged_group
+
+from ..common.utils import build_http_request
+from ..http.parser import HttpParser, httpParserTypes
+from ..http.websocket import WebsocketFrame, websocketOpcodes
+from ..common_neon.solana_interactor import SolInteractor
+
+
+class SolTxConfirmWaiter(abc.ABC):
+    """Waits until all transactions from the list reach the confirmed commitment"""
+
+    @abc.abstractmethod
+    def wait_for_confirmation(self, tx_sig_list: List[str], timeout_sec: float) -> bool:
+        """Returns True if all transactions are confirmed before the timeout"""
+
+
+@logged_group("neon.Proxy")
+class SolTxPollConfirmWaiter(SolTxConfirmWaiter):
+    """Polls getSignatureStatuses until all transactions are confirmed"""
+
+    def __init__(self, solana: SolInteractor, check_delay_sec: float):
+        self._solana = solana
+        self._check_delay_sec = check_delay_sec
+
+    def is_confirmed(self, tx_sig_list: List[str]) -> bool:
+        block_slot, is_confirmed = self._solana.get_confirmed_slot_for_tx_sig_list(tx_sig_list)
+        return is_confirmed
+
+    def get_confirmed_tx_sig_list(self, tx_sig_list: List[str]) -> List[str]:
+        return self._solana.get_confirmed_tx_sig_list(tx_sig_list)
+
+    def wait_for_confirmation(self, tx_sig_list: List[str], timeout_sec: float) -> bool:
+        elapsed_time = 0.0
+        while elapsed_time < timeout_sec:
+            elapsed_time += self._check_delay_sec
+
+            if self.is_confirmed(tx_sig_list):
+                return True
+            time.sleep(self._check_delay_sec)
+        return False
+
+
+class _SolWebsocket:
+    """Minimal blocking websocket client for the Solana PubSub API"""
+
+    _connect_timeout_sec = 1.0
+
+    def __init__(self, ws_url: str, deadline: float):
+        url = urlsplit(ws_url)
+        is_secure = (url.scheme == 'wss')
+        port = url.port or (443 if is_secure else 80)
+
+        self._deadline = deadline
+        self._buffer = b''
+        self._sock: Optional[socket.socket] = None
+        try:
+            timeout = min(self._get_timeout(), self._connect_timeout_sec)
+            self._sock = socket.create_connection((url.hostname, port), timeout=timeout)
+            if is_secure:
+                self._sock = ssl.create_default_context().wrap_socket(self._sock, server_hostname=url.hostname)
+            self._upgrade(url.netloc.encode('utf8'), (url.path or '/').encode('utf8'))
+        except BaseException as exc:
+            if self._sock is not None:
+                self._sock.close()
+            if isinstance(exc, TimeoutError):
+                # an unavailable websocket isn't a reason to stop waiting for transactions
+                raise ConnectionError(f'failed to connect to websocket: {str(exc)}')
+            raise
+
+    def __enter__(self) -> _SolWebsocket:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._sock.close()
+
+    def _get_timeout(self) -> float:
+        timeout = self._deadline - time.monotonic()
+        if timeout <= 0:
+            raise TimeoutError('websocket timeout')
+        return timeout
+
+    def _upgrade(self, host: bytes, path: bytes) -> None:
+        key = base64.b64encode(secrets.token_bytes(16))
+        self._sock.sendall(build_http_request(
+            b'GET', path,
+            headers={
+                b'Host': host,
+                b'Connection': b'Upgrade',
+                b'Upgrade': b'websocket',
+                b'Sec-WebSocket-Key': key,
+                b'Sec-WebSocket-Version': b'13',
+            }
+        ))
+
+        while b'\r\n\r\n' not in self._buffer:
+            self._recv()
+        header_len = self._buffer.index(b'\r\n\r\n') + 4
+        raw_response, self._buffer = self._buffer[:header_len], self._buffer[header_len:]
+
+        response = HttpParser(httpParserTypes.RESPONSE_PARSER)
+        response.parse(raw_response)
+        if (response.code != b'101') or (not response.has_header(b'Sec-WebSocket-Accept')) or \
+                (response.header(b'Sec-WebSocket-Accept') != WebsocketFrame.key_to_accept(key)):
+            raise ConnectionError(f'failed to upgrade to websocket: {response.code}')
+
+    def _recv(self) -> None:
+        self._sock.settimeout(self._get_timeout())
+        data = self._sock.recv(65536)
+        if not data:
+            raise ConnectionError('websocket is closed')
+        self._buffer += data
+
+    def _recv_exactly(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            self._recv()
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def _send_frame(self, opcode: int, data: bytes) -> None:
+        frame = WebsocketFrame()
+        frame.fin = True
+        frame.opcode = opcode
+        frame.masked = True
+        frame.data = data
+        frame.payload_length = len(data)
+        self._sock.settimeout(self._get_timeout())
+        self._sock.sendall(frame.build())
+
+    def send_json(self, data: Any) -> None:
+        self._send_frame(websocketOpcodes.TEXT_FRAME, json.dumps(data).encode('utf8'))
+
+    def recv_json(self) -> Any:
+        while True:
+            header = self._recv_exactly(2)
+            opcode, payload_len = header[0] & 0x0f, header[1] & 0x7f
+            if payload_len == 126:
+                payload_len, = struct.unpack('!H', self._recv_exactly(2))
+            elif payload_len == 127:
+                payload_len, = struct.unpack('!Q', self._recv_exactly(8))
+            mask = self._recv_exactly(4) if header[1] & 0x80 else None
+            data = self._recv_exactly(payload_len)
+            if mask is not None:
+                data = WebsocketFrame.apply_mask(data, mask)
+
+            if opcode == websocketOpcodes.PING:
+                self._send_frame(websocketOpcodes.PONG, data)
+            elif opcode == websocketOpcodes.CONNECTION_CLOSE:
+                raise ConnectionError('websocket is closed by the server')
+            elif opcode in (websocketOpcodes.TEXT_FRAME, websocketOpcodes.BINARY_FRAME):
+                return json.loads(data)
+
+
+@logged_group("neon.Proxy")
+class SolTxWebsocketConfirmWaiter(SolTxConfirmWaiter):
+    """
+    Waits for signatureNotification-s from the Solana PubSub API.
+    If the websocket connection fails, it falls back to polling for the remaining time.
+    """
+
+    def __init__(self, ws_url: str, poll_waiter: SolTxPollConfirmWaiter):
+        self._ws_url = ws_url
+        self._poll_waiter = poll_waiter
+
+    def wait_for_confirmation(self, tx_sig_list: List[str], timeout_sec: float) -> bool:
+        deadline = time.monotonic() + timeout_sec
+        try:
+            return self._wait_for_confirmation(tx_sig_list, deadline)
+        except TimeoutError:
+            return False
+        except (OSError, ValueError) as exc:
+            self.warning(f'Fallback to polling of transaction statuses, websocket error: {str(exc)}')
+
+        return self._poll_waiter.wait_for_confirmation(tx_sig_list, max(deadline - time.monotonic(), 0.0))
+
+    def _wait_for_confirmation(self, tx_sig_list: List[str], deadline: float) -> bool:
+        with _SolWebsocket(self._ws_url, deadline) as ws:
+            req_sig_dict: Dict[int, str] = {}
+            for req_id, tx_sig in enumerate(tx_sig_list, start=1):
+                req_sig_dict[req_id] = tx_sig
+                ws.send_json({
+                    'jsonrpc': '2.0',
+                    'id': req_id,
+                    'method': 'signatureSubscribe',
+                    'params': [tx_sig, {'commitment': 'confirmed'}]
+                })
+
+            sub_sig_dict: Dict[int, str] = {}
+            wait_sig_set: Set[str] = set(tx_sig_list)
+            while len(wait_sig_set) > 0:
+                msg = ws.recv_json()
+                if 'id' in msg:
+                    tx_sig = req_sig_dict.pop(msg['id'], None)
+                    if msg.get('error') is not None:
+                        raise ValueError(f'signatureSubscribe failed: {msg["error"]}')
+                    sub_sig_dict[msg['result']] = tx_sig
+
+                    # Solana doesn't notify about transactions confirmed before the subscription
+                    if len(req_sig_dict) == 0:
+                        confirmed_tx_sig_list = self._poll_waiter.get_confirmed_tx_sig_list(list(wait_sig_set))
+                        wait_sig_set.difference_update(confirmed_tx_sig_list)
+
+                elif msg.get('method') == 'signatureNotification':
+                    sub_id = msg.get('params', {}).get('subscription')
+                    wait_sig_set.discard(sub_sig_dict.get(sub_id))
+        return True
+
+
+def create_sol_tx_confirm_waiter(solana: SolInteractor, ws_url: Optional[str],
+                                 check_delay_sec: float) -> SolTxConfirmWaiter:
+    poll_waiter = SolTxPollConfirmWaiter(solana, check_delay_sec)
+    if not ws_url:
+        return poll_waiter
+    return SolTxWebsocketConfirmWaiter(ws_url, poll_waiter)
@@ -11,6 +11,7 @@ from typing import Optional, List, Dict
 from ..common_neon.solana_transaction import SolTx, SolWrappedTx, SolBlockhash, SolTxReceipt, SolAccount
 from ..common_neon.solana_tx_error_parser import SolTxErrorParser, SolTxError
 from ..common_neon.solana_interactor import SolInteractor
+from ..common_neon.solana_tx_confirm_waiter import SolTxConfirmWaiter, create_sol_tx_confirm_waiter
 from ..common_neon.errors import NodeBehindError, NoMoreRetriesError, NonceTooLowError, BlockedAccountsError
 from ..common_neon.errors import BudgetExceededError
 from ..common_neon.config import Config
@@ -59,11 +60,15 @@ class SolTxListSender:
     _one_block_time = 0.4
 
     def __init__(self, config: Config, solana: SolInteractor, signer: SolAccount,
-                 skip_preflight: Optional[bool] = None):
+                 skip_preflight: Optional[bool] = None, confirm_waiter: Optional[SolTxConfirmWaiter] = None):
         self._config = config
         self._solana = solana
         self._signer = signer
         self._skip_preflight = skip_preflight if skip_preflight is not None else config.skip_preflight
+        if confirm_waiter is None:
+            confirm_check_delay = float(config.confirm_check_msec) / 1000
+            confirm_waiter = create_sol_tx_confirm_waiter(solana, config.solana_ws_url, confirm_check_delay)
+        self._confirm_waiter = confirm_waiter
         self._retry_idx = 0
         self._blockhash: Optional[SolBlockhash] = None
         self._tx_state_dict: Dict[SolTxSendState.Status, List[SolTxSendState]] = {}
@@ -187,19 +192,10 @@ class SolTxListSender:
         raise SolTxError(tx_state_list[0].receipt)
 
     def _wait_for_confirmation_of_tx_list(self, tx_sig_list: List[str]) -> None:
-        confirm_timeout = self._config.confirm_timeout_sec
-        confirm_check_delay = float(self._config.confirm_check_msec) / 1000
-        elapsed_time = 0.0
-        while elapsed_time < confirm_timeout:
-            elapsed_time += confirm_check_delay
-
-            block_slot, is_confirmed = self._solana.get_confirmed_slot_for_tx_sig_list(tx_sig_list)
-            if is_confirmed:
-                self.debug(f'Got confirmed status for transactions: {tx_sig_list}')
-                return
-            time.sleep(confirm_check_delay)
-
-        self.warning(f'No confirmed status for transactions: {tx_sig_list}')
+        if self._confirm_waiter.wait_for_confirmation(tx_sig_list, self._config.confirm_timeout_sec):
+            self.debug(f'Got confirmed status for transactions: {tx_sig_list}')
+        else:
+            self.warning(f'No confirmed status for transactions: {tx_sig_list}')
 
     def _get_blockhash(self) -> SolBlockhash:
         if self._config.fuzzing_blockhash and (random.randint(0, 3) == 1):
@@ -207,7 +203,12 @@ class SolTxListSender:
             return self._solana.get_blockhash(block_slot)
 
         if self._blockhash is None:
-            self._blockhash = self._solana.get_recent_blockhash()
+            blockhash_provider = self._solana.blockhash_provider
+            if blockhash_provider is None:
+                self._blockhash = self._solana.get_recent_blockhash()
+            else:
+                self._blockhash, age = blockhash_provider.get_blockhash()
+                self.debug(f'recent blockhash {self._blockhash} age {age:.3f} sec')
         return self._blockhash
 
     def _decode_tx_status(self, tx: SolTx, tx_error_parser: SolTxErrorParser) -> SolTxSendState.Status:
@@ -227,6 +228,8 @@ class SolTxListSender:
         elif tx_error_parser.check_if_blockhash_notfound():
             if tx.recent_blockhash == self._blockhash:
                 self._blockhash = None
+            if self._solana.blockhash_provider is not None:
+                self._solana.blockhash_provider.invalidate(tx.recent_blockhash)
             tx.recent_blockhash = None
             return SolTxSendState.Status.BlockhashNotFoundError
         elif tx_error_parser.check_if_accounts_blocked():
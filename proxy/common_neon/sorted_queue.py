@@ -1,5 +1,7 @@
 import bisect
-from typing import TypeVar, Generic, Sequence, List, Callable, Iterator, Union, Optional
+import itertools
+
+from typing import TypeVar, Generic, List, Callable, Iterator, Union, Optional, Dict, Tuple
 
 
 SortedQueueItem = TypeVar('SortedQueueItem')
@@ -8,70 +10,212 @@ SortedQueueEqKey = TypeVar('SortedQueueEqKey')
 
 
 class SortedQueue(Generic[SortedQueueItem, SortedQueueLtKey, SortedQueueEqKey]):
-    class _SortedQueueImpl(Sequence[SortedQueueItem]):
-        def __init__(self, lt_key_func: Callable[[SortedQueueItem], SortedQueueLtKey]):
-            self.queue: List[SortedQueue] = []
-            self.lt_key_func = lt_key_func
-
-        def __getitem__(self, index: int) -> SortedQueueLtKey:
-            return self.lt_key_func(self.queue[index])
+    """
+    Items are stored in sorted chunks (a two-level B+tree) with a Fenwick tree over the chunk sizes,
+    so add/find/pop and the access by index cost O(log n).
 
-        def __len__(self) -> int:
-            return len(self.queue)
+    The sort key is calculated once on adding: (lt_key, -sequence number).
+    Between items with equal lt_keys, a newer item goes before older ones.
+    The position of an item is found by its eq_key, which should be unique in the queue.
+    """
 
-        def bisect_left(self, item: SortedQueueItem) -> int:
-            return bisect.bisect_left(self, self.lt_key_func(item))
+    _chunk_size = 256
 
-        def __iter__(self) -> Iterator[SortedQueueItem]:
-            return iter(self.queue)
+    _SortKey = Tuple[SortedQueueLtKey, int]
 
     def __init__(self, lt_key_func: Callable[[SortedQueueItem], SortedQueueLtKey],
                  eq_key_func: Callable[[SortedQueueItem], SortedQueueEqKey]):
-        self._impl = self._SortedQueueImpl(lt_key_func)
+        self._lt_key_func = lt_key_func
         self._eq_key_func = eq_key_func
+        self._seq = 0
+        self._len = 0
+        self._sort_key_dict: Dict[SortedQueueEqKey, SortedQueue._SortKey] = {}
+        self._key_chunk_list: List[List[SortedQueue._SortKey]] = []
+        self._item_chunk_list: List[List[SortedQueueItem]] = []
+        self._max_key_list: List[SortedQueue._SortKey] = []
+        self._index_tree: List[int] = [0]
+
+    def _rebuild_index(self) -> None:
+        chunk_cnt = len(self._key_chunk_list)
+        self._max_key_list = [key_chunk[-1] for key_chunk in self._key_chunk_list]
+        self._index_tree = [0] * (chunk_cnt + 1)
+        for chunk_idx, key_chunk in enumerate(self._key_chunk_list, start=1):
+            self._index_tree[chunk_idx] += len(key_chunk)
+            parent_idx = chunk_idx + (chunk_idx & -chunk_idx)
+            if parent_idx <= chunk_cnt:
+                self._index_tree[parent_idx] += self._index_tree[chunk_idx]
+
+    def _update_index(self, chunk_idx: int, delta: int) -> None:
+        chunk_idx += 1
+        while chunk_idx < len(self._index_tree):
+            self._index_tree[chunk_idx] += delta
+            chunk_idx += chunk_idx & -chunk_idx
+
+    def _get_chunk_pos(self, chunk_idx: int) -> int:
+        """Returns the number of items before the chunk"""
+        pos = 0
+        while chunk_idx > 0:
+            pos += self._index_tree[chunk_idx]
+            chunk_idx -= chunk_idx & -chunk_idx
+        return pos
+
+    def _locate_index(self, index: int) -> Tuple[int, int]:
+        """Returns (chunk index, offset in the chunk) for the absolute index"""
+        if index < 0:
+            index += self._len
+        if not (0 <= index < self._len):
+            raise IndexError('queue index out of range')
+
+        chunk_idx = 0
+        bit = 1 << (len(self._index_tree) - 1).bit_length()
+        while bit > 0:
+            next_idx = chunk_idx + bit
+            if (next_idx < len(self._index_tree)) and (self._index_tree[next_idx] <= index):
+                chunk_idx = next_idx
+                index -= self._index_tree[next_idx]
+            bit >>= 1
+        return chunk_idx, index
+
+    def _locate_key(self, sort_key: _SortKey) -> Tuple[int, int]:
+        chunk_idx = bisect.bisect_left(self._max_key_list, sort_key)
+        offset = bisect.bisect_left(self._key_chunk_list[chunk_idx], sort_key)
+        return chunk_idx, offset
 
     def __getitem__(self, index: int) -> SortedQueueItem:
-        return self._impl.queue[index]
+        if self._len > 0:
+            # fast path for the queue ends
+            if index == -1:
+                return self._item_chunk_list[-1][-1]
+            elif index == 0:
+                return self._item_chunk_list[0][0]
+
+        chunk_idx, offset = self._locate_index(index)
+        return self._item_chunk_list[chunk_idx][offset]
 
     def extract_list_from(self, index: int) -> List[SortedQueueItem]:
-        extracted_list = self._impl.queue[index:]
-        self._impl.queue = self._impl.queue[:index]
+        if index < 0:
+            index = max(index + self._len, 0)
+        if index >= self._len:
+            return []
+
+        chunk_idx, offset = self._locate_index(index)
+        extracted_list = self._item_chunk_list[chunk_idx][offset:]
+        extracted_list.extend(itertools.chain.from_iterable(self._item_chunk_list[chunk_idx + 1:]))
+
+        del self._key_chunk_list[chunk_idx][offset:]
+        del self._item_chunk_list[chunk_idx][offset:]
+        del self._key_chunk_list[chunk_idx + 1:]
+        del self._item_chunk_list[chunk_idx + 1:]
+        if offset == 0:
+            self._key_chunk_list.pop(chunk_idx)
+            self._item_chunk_list.pop(chunk_idx)
+
+        for item in extracted_list:
+            self._sort_key_dict.pop(self._eq_key_func(item))
+        self._len -= len(extracted_list)
+        self._rebuild_index()
         return extracted_list
 
     def __contains__(self, item: SortedQueueItem) -> bool:
-        return self.find(item) is not None
+        return self._eq_key_func(item) in self._sort_key_dict
 
     def __len__(self) -> int:
-        return len(self._impl)
+        return self._len
 
     def add(self, item: SortedQueueItem) -> None:
-        assert self.find(item) is None, 'item is already in the queue'
-        pos = self._impl.bisect_left(item)
-        self._impl.queue.insert(pos, item)
+        eq_key = self._eq_key_func(item)
+        assert eq_key not in self._sort_key_dict, 'item is already in the queue'
+
+        self._seq += 1
+        sort_key = (self._lt_key_func(item), -self._seq)
+        self._sort_key_dict[eq_key] = sort_key
+        self._len += 1
+
+        if len(self._key_chunk_list) == 0:
+            self._key_chunk_list.append([sort_key])
+            self._item_chunk_list.append([item])
+            self._rebuild_index()
+            return
+
+        chunk_idx = min(bisect.bisect_left(self._max_key_list, sort_key), len(self._max_key_list) - 1)
+        key_chunk = self._key_chunk_list[chunk_idx]
+        item_chunk = self._item_chunk_list[chunk_idx]
+
+        offset = bisect.bisect_left(key_chunk, sort_key)
+        key_chunk.insert(offset, sort_key)
+        item_chunk.insert(offset, item)
+
+        if len(key_chunk) > self._chunk_size * 2:
+            self._key_chunk_list.insert(chunk_idx + 1, key_chunk[self._chunk_size:])
+            self._item_chunk_list.insert(chunk_idx + 1, item_chunk[self._chunk_size:])
+            del key_chunk[self._chunk_size:]
+            del item_chunk[self._chunk_size:]
+            self._rebuild_index()
+        else:
+            self._max_key_list[chunk_idx] = key_chunk[-1]
+            self._update_index(chunk_idx, 1)
 
     def find(self, item: SortedQueueItem) -> Optional[int]:
-        start_pos = self._impl.bisect_left(item)
-        for index in range(start_pos, len(self)):
-            if self._impl.lt_key_func(item) != self._impl.lt_key_func(self._impl.queue[index]):
-                break
-            if self._eq_key_func(self._impl.queue[index]) == self._eq_key_func(item):
-                return index
-        return None
-
-    def pop(self, item_or_index: Union[int, SortedQueueItem]) -> SortedQueueItem:
-        assert len(self) > 0, 'queue is empty'
+        sort_key = self._sort_key_dict.get(self._eq_key_func(item), None)
+        if sort_key is None:
+            return None
 
-        index = item_or_index if isinstance(item_or_index, int) else self.find(item_or_index)
-        assert index is not None, 'item is absent in the queue'
+        chunk_idx, offset = self._locate_key(sort_key)
+        return self._get_chunk_pos(chunk_idx) + offset
 
-        return self._impl.queue.pop(index)
+    def pop(self, item_or_index: Union[int, SortedQueueItem]) -> SortedQueueItem:
+        assert self._len > 0, 'queue is empty'
+
+        if isinstance(item_or_index, int):
+            if item_or_index == -1:
+                chunk_idx = len(self._key_chunk_list) - 1
+                offset = len(self._key_chunk_list[chunk_idx]) - 1
+            else:
+                chunk_idx, offset = self._locate_index(item_or_index)
+        else:
+            sort_key = self._sort_key_dict.get(self._eq_key_func(item_or_index), None)
+            assert sort_key is not None, 'item is absent in the queue'
+            chunk_idx, offset = self._locate_key(sort_key)
+
+        key_chunk = self._key_chunk_list[chunk_idx]
+        item_chunk = self._item_chunk_list[chunk_idx]
+        key_chunk.pop(offset)
+        item = item_chunk.pop(offset)
+
+        self._sort_key_dict.pop(self._eq_key_func(item))
+        self._len -= 1
+
+        if len(key_chunk) == 0:
+            self._key_chunk_list.pop(chunk_idx)
+            self._item_chunk_list.pop(chunk_idx)
+            self._rebuild_index()
+        else:
+            self._max_key_list[chunk_idx] = key_chunk[-1]
+            self._update_index(chunk_idx, -1)
+        return item
 
     def remove_if(self, predict: Callable[[SortedQueueItem], bool]) -> None:
-        self._impl.queue = [item for item in self._impl.queue if not predict(item)]
+        key_list: List[SortedQueue._SortKey] = []
+        item_list: List[SortedQueueItem] = []
+        for key_chunk, item_chunk in zip(self._key_chunk_list, self._item_chunk_list):
+            for sort_key, item in zip(key_chunk, item_chunk):
+                if predict(item):
+                    self._sort_key_dict.pop(self._eq_key_func(item))
+                else:
+                    key_list.append(sort_key)
+                    item_list.append(item)
+
+        self._len = len(item_list)
+        self._key_chunk_list = [key_list[i:i + self._chunk_size] for i in range(0, self._len, self._chunk_size)]
+        self._item_chunk_list = [item_list[i:i + self._chunk_size] for i in range(0, self._len, self._chunk_size)]
+        self._rebuild_index()
 
     def clear(self) -> None:
-        self._impl.queue.clear()
-
-    def __iter__(self):
-        return iter(self._impl)
-
+        self._len = 0
+        self._sort_key_dict.clear()
+        self._key_chunk_list.clear()
+        self._item_chunk_list.clear()
+        self._rebuild_index()
+
+    def __iter__(self) -> Iterator[SortedQueueItem]:
+        return itertools.chain.from_iterable(self._item_chunk_list)
@@ -16,6 +16,7 @@ class NeonTxResultInfo:
         self._block_hash: Optional[str] = None
         self._sol_ix_idx: Optional[int] = None
         self._sol_ix_inner_idx: Optional[int] = None
+        self._logs_bloom = ''
 
     @property
     def block_slot(self) -> Optional[int]:
@@ -41,6 +42,10 @@ class NeonTxResultInfo:
     def return_value(self) -> str:
         return self._return_value
 
+    @property
+    def logs_bloom(self) -> str:
+        return self._logs_bloom
+
     @property
     def sol_sig(self) -> Optional[str]:
         return self._sol_sig
@@ -70,6 +75,9 @@ class NeonTxResultInfo:
         self._gas_used = gas_used
         self._return_value = return_value
 
+    def fill_logs_bloom(self, logs_bloom: str) -> None:
+        self._logs_bloom = logs_bloom
+
     def fill_sol_sig_info(self, sol_sig: str, sol_ix_idx: int, sol_ix_inner_idx: Optional[int]) -> None:
         self._sol_sig = sol_sig
         self._sol_ix_idx = sol_ix_idx
@@ -15,6 +15,7 @@ class SolanaBlockInfo:
     parent_block_slot: Optional[int] = None
     parent_block_hash: str = None
     is_finalized: bool = False
+    logs_bloom: Optional[str] = None
 
     def __str__(self) -> str:
         return str_fmt_object(self)
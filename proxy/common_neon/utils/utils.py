@@ -1,9 +1,14 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Tuple, Union
 from enum import Enum
 
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..environment_data import LOG_FULL_OBJECT_INFO
 
 
@@ -16,6 +21,43 @@ class JsonBytesEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, obj)
 
 
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.hex()
+    raise TypeError(f'Type is not JSON serializable: {type(obj).__name__}')
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """Serializes to UTF-8 JSON with orjson if it is installed, bytes are serialized as in JsonBytesEncoder"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=_orjson_default)
+        except TypeError:
+            # orjson doesn't support integers above 64 bits, the stdlib encoder does
+            pass
+    return json.dumps(obj, cls=JsonBytesEncoder).encode('utf8')
+
+
+def json_loads_bytes(data: Union[bytes, str]) -> Any:
+    """Deserializes UTF-8 JSON with orjson if it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def str_preview(data: Union[bytes, str], max_len: int = 1024) -> str:
+    """Returns the beginning of a long payload for logging, or the whole payload if LOG_FULL_OBJECT_INFO is set"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data_len = len(data)
+        if LOG_FULL_OBJECT_INFO or (data_len <= max_len):
+            return bytes(data).decode('utf8', errors='replace')
+        return bytes(data[:max_len]).decode('utf8', errors='replace') + f'... ({data_len} bytes)'
+
+    if LOG_FULL_OBJECT_INFO or (len(data) <= max_len):
+        return data
+    return data[:max_len] + f'... ({len(data)} chars)'
+
+
 def str_fmt_object(obj: Any) -> str:
     type_name = 'Type'
     class_prefix = "<class '"
@@ -31,6 +31,77 @@
     END;
     $$;
 
+    CREATE OR REPLACE FUNCTION does_table_have_column_type(t_name TEXT, c_name TEXT, c_type TEXT)
+        RETURNS BOOLEAN
+        LANGUAGE plpgsql
+    AS
+    $$
+    DECLARE
+        column_count INT;
+    BEGIN
+        SELECT COUNT(t.column_name)
+          INTO column_count
+          FROM information_schema.columns AS t
+         WHERE t.table_name=t_name AND t.column_name=c_name AND t.data_type=c_type;
+        RETURN column_count > 0;
+    END;
+    $$;
+
+    CREATE OR REPLACE FUNCTION hex_to_bytea(hex_value TEXT)
+        RETURNS BYTEA
+        LANGUAGE plpgsql
+        IMMUTABLE
+    AS
+    $$
+    BEGIN
+        IF hex_value IS NULL THEN
+            RETURN NULL;
+        END IF;
+        IF left(hex_value, 2) = '0x' THEN
+            hex_value := substring(hex_value FROM 3);
+        END IF;
+        IF length(hex_value) % 2 = 1 THEN
+            hex_value := '0' || hex_value;
+        END IF;
+        RETURN decode(hex_value, 'hex');
+    END;
+    $$;
+
+    CREATE OR REPLACE FUNCTION hex_to_numeric(hex_value TEXT)
+        RETURNS NUMERIC
+        LANGUAGE plpgsql
+        IMMUTABLE
+    AS
+    $$
+    DECLARE
+        result NUMERIC := 0;
+        idx INT;
+    BEGIN
+        IF (hex_value IS NULL) OR (hex_value = '') THEN
+            RETURN NULL;
+        END IF;
+        hex_value := lower(hex_value);
+        IF left(hex_value, 2) = '0x' THEN
+            hex_value := substring(hex_value FROM 3);
+        END IF;
+        FOR idx IN 1..length(hex_value) LOOP
+            result := result * 16 + strpos('0123456789abcdef', substring(hex_value FROM idx FOR 1)) - 1;
+        END LOOP;
+        RETURN result;
+    END;
+    $$;
+
+    CREATE OR REPLACE FUNCTION topic_list_to_array(topic_list BYTEA)
+        RETURNS TEXT[]
+        LANGUAGE sql
+        IMMUTABLE
+    AS
+    $$
+        -- topic_list is a pickled or a JSON list of hex strings, both keep the strings as is
+        SELECT array_agg(lower(m.match[1]) ORDER BY m.idx)
+          FROM regexp_matches(encode(topic_list, 'escape'), '(0x[0-9a-fA-F]{64})', 'g') WITH ORDINALITY AS m(match, idx);
+    $$;
+
     DO $$
     DECLARE
         ----------
@@ -54,6 +125,61 @@
         IF does_table_have_column('solana_transaction_signatures', 'slot') THEN
             DROP TABLE solana_transaction_signatures;
         END IF;
+
+        -- hashes, addresses and data are stored in the binary form, numbers as NUMERIC
+        IF does_table_have_column_type('solana_blocks', 'block_hash', 'text') THEN
+            ALTER TABLE solana_blocks
+                ALTER COLUMN block_hash TYPE BYTEA USING hex_to_bytea(block_hash);
+        END IF;
+
+        IF does_table_have_column_type('neon_transaction_logs', 'address', 'text') THEN
+            ALTER TABLE neon_transaction_logs
+                ALTER COLUMN address TYPE BYTEA USING hex_to_bytea(address),
+                ALTER COLUMN tx_hash TYPE BYTEA USING hex_to_bytea(tx_hash),
+                ALTER COLUMN topic TYPE BYTEA USING hex_to_bytea(topic),
+                ALTER COLUMN log_data TYPE BYTEA USING hex_to_bytea(log_data);
+        END IF;
+
+        IF does_table_have_column_type('neon_transactions', 'neon_sig', 'text') THEN
+            ALTER TABLE neon_transactions
+                ALTER COLUMN neon_sig TYPE BYTEA USING hex_to_bytea(neon_sig),
+                ALTER COLUMN from_addr TYPE BYTEA USING hex_to_bytea(from_addr),
+                ALTER COLUMN nonce TYPE NUMERIC USING hex_to_numeric(nonce),
+                ALTER COLUMN gas_price TYPE NUMERIC USING hex_to_numeric(gas_price),
+                ALTER COLUMN gas_limit TYPE NUMERIC USING hex_to_numeric(gas_limit),
+                ALTER COLUMN value TYPE NUMERIC USING hex_to_numeric(value),
+                ALTER COLUMN gas_used TYPE NUMERIC USING hex_to_numeric(gas_used),
+                ALTER COLUMN to_addr TYPE BYTEA USING hex_to_bytea(to_addr),
+                ALTER COLUMN contract TYPE BYTEA USING hex_to_bytea(contract),
+                ALTER COLUMN status TYPE SMALLINT USING hex_to_numeric(status),
+                ALTER COLUMN return_value TYPE BYTEA USING hex_to_bytea(return_value),
+                ALTER COLUMN v TYPE NUMERIC USING hex_to_numeric(v),
+                ALTER COLUMN r TYPE NUMERIC USING hex_to_numeric(r),
+                ALTER COLUMN s TYPE NUMERIC USING hex_to_numeric(s),
+                ALTER COLUMN calldata TYPE BYTEA USING hex_to_bytea(calldata);
+        END IF;
+
+        -- a log is stored as one row with up to 4 topics instead of a row per topic
+        IF does_table_have_column('neon_transaction_logs', 'topic_list') THEN
+            ALTER TABLE neon_transaction_logs
+                ADD COLUMN topic0 BYTEA,
+                ADD COLUMN topic1 BYTEA,
+                ADD COLUMN topic2 BYTEA,
+                ADD COLUMN topic3 BYTEA;
+
+            UPDATE neon_transaction_logs
+               SET (topic0, topic1, topic2, topic3) = (
+                       SELECT COALESCE(hex_to_bytea(t.arr[1]), topic), hex_to_bytea(t.arr[2]),
+                              hex_to_bytea(t.arr[3]), hex_to_bytea(t.arr[4])
+                         FROM (SELECT topic_list_to_array(topic_list) AS arr) AS t
+                   );
+
+            DROP INDEX IF EXISTS idx_neon_transaction_logs_address;
+            DROP INDEX IF EXISTS idx_neon_transaction_logs_topic;
+            ALTER TABLE neon_transaction_logs
+                DROP COLUMN topic,
+                DROP COLUMN topic_list;
+        END IF;
     END $$;
 
     DROP TABLE IF EXISTS neon_accounts;
@@ -90,33 +216,39 @@
 
     CREATE TABLE IF NOT EXISTS solana_blocks (
         block_slot BIGINT,
-        block_hash TEXT,
+        block_hash BYTEA,
         block_time BIGINT,
         parent_block_slot BIGINT,
         is_finalized BOOL,
-        is_active BOOL
+        is_active BOOL,
+        logs_bloom BYTEA
     );
     CREATE UNIQUE INDEX IF NOT EXISTS idx_solana_blocks_slot ON solana_blocks(block_slot);
     CREATE INDEX IF NOT EXISTS idx_solana_blocks_hash ON solana_blocks(block_hash);
     CREATE INDEX IF NOT EXISTS idx_solana_blocks_slot_active ON solana_blocks(block_slot, is_active);
 
     CREATE TABLE IF NOT EXISTS neon_transaction_logs (
-        address TEXT,
+        address BYTEA,
         block_slot BIGINT,
 
-        tx_hash TEXT,
+        tx_hash BYTEA,
         tx_idx INT,
         tx_log_idx INT,
         log_idx INT,
 
-        topic TEXT,
-        log_data TEXT,
+        log_data BYTEA,
 
-        topic_list BYTEA
+        topic0 BYTEA,
+        topic1 BYTEA,
+        topic2 BYTEA,
+        topic3 BYTEA
     );
     CREATE UNIQUE INDEX IF NOT EXISTS idx_neon_transaction_logs_block_tx_log ON neon_transaction_logs(block_slot, tx_hash, tx_log_idx);
-    CREATE INDEX IF NOT EXISTS idx_neon_transaction_logs_address ON neon_transaction_logs(address);
-    CREATE INDEX IF NOT EXISTS idx_neon_transaction_logs_topic ON neon_transaction_logs(topic);
+    CREATE INDEX IF NOT EXISTS idx_neon_transaction_logs_address_block ON neon_transaction_logs(address, block_slot);
+    CREATE INDEX IF NOT EXISTS idx_neon_transaction_logs_topic0_block ON neon_transaction_logs(topic0, block_slot);
+    CREATE INDEX IF NOT EXISTS idx_neon_transaction_logs_topic1_block ON neon_transaction_logs(topic1, block_slot) WHERE topic1 IS NOT NULL;
+    CREATE INDEX IF NOT EXISTS idx_neon_transaction_logs_topic2_block ON neon_transaction_logs(topic2, block_slot) WHERE topic2 IS NOT NULL;
+    CREATE INDEX IF NOT EXISTS idx_neon_transaction_logs_topic3_block ON neon_transaction_logs(topic3, block_slot) WHERE topic3 IS NOT NULL;
     CREATE INDEX IF NOt EXISTS idx_neon_transaction_logs_block_slot ON neon_transaction_logs(block_slot);
 
     CREATE TABLE IF NOT EXISTS solana_neon_transactions (
@@ -139,8 +271,8 @@
     CREATE INDEX IF NOT EXISTS idx_solana_neon_transactions_neon_block ON solana_neon_transactions(block_slot);
 
     CREATE TABLE IF NOT EXISTS neon_transactions (
-        neon_sig TEXT,
-        from_addr TEXT,
+        neon_sig BYTEA,
+        from_addr BYTEA,
 
         sol_sig TEXT,
         sol_ix_idx INT,
@@ -148,25 +280,26 @@
         block_slot BIGINT,
         tx_idx INT,
 
-        nonce TEXT,
-        gas_price TEXT,
-        gas_limit TEXT,
-        value TEXT,
-        gas_used TEXT,
+        nonce NUMERIC,
+        gas_price NUMERIC,
+        gas_limit NUMERIC,
+        value NUMERIC,
+        gas_used NUMERIC,
 
-        to_addr TEXT,
-        contract TEXT,
+        to_addr BYTEA,
+        contract BYTEA,
 
-        status TEXT,
+        status SMALLINT,
 
-        return_value TEXT,
+        return_value BYTEA,
 
-        v TEXT,
-        r TEXT,
-        s TEXT,
+        v NUMERIC,
+        r NUMERIC,
+        s NUMERIC,
 
-        calldata TEXT,
-        logs BYTEA
+        calldata BYTEA,
+        logs BYTEA,
+        logs_bloom BYTEA
     );
     CREATE INDEX IF NOT EXISTS idx_neon_transactions_sol_sig_block ON neon_transactions(sol_sig, block_slot);
     CREATE UNIQUE INDEX IF NOT EXISTS idx_neon_transactions_neon_sig_block ON neon_transactions(neon_sig, block_slot);
@@ -190,6 +323,9 @@
     CREATE UNIQUE INDEX IF NOT EXISTS idx_solana_transaction_signatures_sig ON solana_transaction_signatures(block_slot);
 
     ---- Upgrade stage
+    ALTER TABLE solana_blocks ADD COLUMN IF NOT EXISTS logs_bloom BYTEA;
+    ALTER TABLE neon_transactions ADD COLUMN IF NOT EXISTS logs_bloom BYTEA;
+
     DO $$
     DECLARE
         ----------
@@ -199,7 +335,7 @@
                 block_slot, block_hash, block_time,
                 parent_block_slot, is_finalized, is_active)
             SELECT
-                slot, hash, blocktime,
+                slot, hex_to_bytea(hash), blocktime,
                 0, TRUE, TRUE
             FROM oldv1_solana_blocks;
 
@@ -216,12 +352,13 @@
                 v, r, s
             )
             SELECT
-                neon_sign, from_addr,
+                hex_to_bytea(neon_sign), hex_to_bytea(from_addr),
                 sol_sign, idx, 0,
                 slot, 0,
-                nonce, gas_price, gas_limit, value, to_addr, contract, calldata,
-                gas_used, status, return_value, logs,
-                v, r, s
+                hex_to_numeric(nonce), hex_to_numeric(gas_price), hex_to_numeric(gas_limit), hex_to_numeric(value),
+                hex_to_bytea(to_addr), hex_to_bytea(contract), hex_to_bytea(calldata),
+                hex_to_numeric(gas_used), hex_to_numeric(status), hex_to_bytea(return_value), logs,
+                hex_to_numeric(v), hex_to_numeric(r), hex_to_numeric(s)
             FROM oldv1_neon_transactions;
 
             DROP TABLE oldv1_neon_transactions;
@@ -231,12 +368,12 @@
             INSERT INTO neon_transaction_logs(
                 address,
                 block_slot, tx_hash, tx_idx, tx_log_idx, log_idx,
-                topic, log_data, topic_list
+                topic0, log_data
             )
             SELECT
-                address,
-                blockNumber, transactionHash, 0, transactionLogIndex, 0,
-                topic, '', ''
+                hex_to_bytea(address),
+                blockNumber, hex_to_bytea(transactionHash), 0, transactionLogIndex, 0,
+                hex_to_bytea(topic), ''
             FROM oldv1_neon_transaction_logs;
 
             DROP TABLE oldv1_neon_transaction_logs;
@@ -0,0 +1,13 @@
+    ---- Sizes of the tables and their indexes, run it before and after an upgrade of the scheme
+    SELECT c.relname AS table_name,
+           c.reltuples::BIGINT AS row_count,
+           pg_size_pretty(pg_relation_size(c.oid)) AS table_size,
+           pg_size_pretty(pg_total_relation_size(c.oid) - pg_relation_size(c.oid) - pg_indexes_size(c.oid)) AS toast_size,
+           pg_size_pretty(pg_indexes_size(c.oid)) AS index_size,
+           pg_size_pretty(pg_total_relation_size(c.oid)) AS total_size
+      FROM pg_class AS c
+INNER JOIN pg_namespace AS n
+        ON n.oid = c.relnamespace
+     WHERE c.relkind = 'r'
+       AND n.nspname = 'public'
+  ORDER BY pg_total_relation_size(c.oid) DESC;
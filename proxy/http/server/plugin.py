@@ -8,13 +8,16 @@
     :copyright: (c) 2013-present by Abhinav Singh and contributors.
     :license: BSD, see LICENSE for more details.
 """
+import socket
+
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import List, Tuple, Union
 from uuid import UUID
 from ..websocket import WebsocketFrame
 from ..parser import HttpParser
 
 from ...common.flags import Flags
+from ...common.types import HasFileno
 from ...core.connection import TcpClientConnection
 from ...core.event import EventQueue
 
@@ -57,3 +60,11 @@ class HttpWebServerBasePlugin(ABC):
     def on_websocket_close(self) -> None:
         """Called when websocket connection has been closed."""
         raise NotImplementedError()     # pragma: no cover
+
+    def get_descriptors(self) -> Tuple[List[socket.socket], List[socket.socket]]:
+        """Sockets of the switched protocol, the handler waits for them together with the client socket."""
+        return [], []
+
+    def read_from_descriptors(self, r: List[Union[int, HasFileno]]) -> bool:
+        """Returns True to teardown the connection."""
+        return False
@@ -170,7 +170,10 @@ class HttpWebServerPlugin(HttpProtocolHandlerPlugin):
         pass
 
     def read_from_descriptors(self, r: List[Union[int, HasFileno]]) -> bool:
-        pass
+        if self.switched_protocol == httpProtocolTypes.WEBSOCKET:
+            assert self.route
+            return self.route.read_from_descriptors(r)
+        return False
 
     def on_client_data(self, raw: memoryview) -> Optional[memoryview]:
         if self.switched_protocol == httpProtocolTypes.WEBSOCKET:
@@ -233,4 +236,7 @@ class HttpWebServerPlugin(HttpProtocolHandlerPlugin):
 
     def get_descriptors(
             self) -> Tuple[List[socket.socket], List[socket.socket]]:
+        if self.switched_protocol == httpProtocolTypes.WEBSOCKET:
+            assert self.route
+            return self.route.get_descriptors()
         return [], []
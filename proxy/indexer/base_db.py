@@ -1,14 +1,62 @@
 from __future__ import annotations
 
+import io
+import os
+import threading
 import psycopg2
 import psycopg2.extras
 import psycopg2.extensions
+import psycopg2.pool
 
-from typing import List, Any, Optional, Dict
+from contextlib import contextmanager
+from typing import List, Any, Optional, Dict, Iterator
 from logged_groups import logged_group
 
-from .pg_common import POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST
-from .pg_common import encode, decode
+from .pg_common import POSTGRES_DB, POSTGRES_USER, POSTGRES_PASSWORD, POSTGRES_HOST, POSTGRES_INSERT_BY_COPY
+from .pg_common import POSTGRES_POOL_MIN_CONN, POSTGRES_POOL_MAX_CONN
+from .pg_common import decode
+from ..common_neon.logs_bloom import EMPTY_LOGS_BLOOM
+from ..common_neon.utils import json_dumps_bytes, json_loads_bytes
+
+
+class DBConnectionPool:
+    """
+    Thread-safe pool of autocommit connections.
+    psycopg2 pools raise PoolError when all connections are busy, here callers wait for a free connection.
+    """
+
+    def __init__(self, min_conn_cnt: int, max_conn_cnt: int):
+        self._max_conn_cnt = max_conn_cnt
+        self._semaphore = threading.BoundedSemaphore(max_conn_cnt)
+        self._pool = psycopg2.pool.ThreadedConnectionPool(
+            min(min_conn_cnt, max_conn_cnt), max_conn_cnt,
+            dbname=POSTGRES_DB,
+            user=POSTGRES_USER,
+            password=POSTGRES_PASSWORD,
+            host=POSTGRES_HOST
+        )
+
+    @property
+    def max_conn_cnt(self) -> int:
+        return self._max_conn_cnt
+
+    @contextmanager
+    def borrow_conn(self) -> Iterator[BaseDB.Connection]:
+        with self._semaphore:
+            conn = self._pool.getconn()
+            is_broken = False
+            try:
+                conn.autocommit = True
+                yield conn
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                # the connection can be lost, don't return it to other users
+                is_broken = True
+                raise
+            finally:
+                self._pool.putconn(conn, close=is_broken or bool(conn.closed))
+
+    def close(self) -> None:
+        self._pool.closeall()
 
 
 @logged_group("neon.Indexer")
@@ -16,21 +64,27 @@ class BaseDB:
     Connection = psycopg2.extensions.connection
     Cursor = psycopg2.extensions.cursor
 
+    _pool_lock = threading.Lock()
+    _pool: Optional[DBConnectionPool] = None
+    _pool_pid = 0
+
     def __init__(self, table_name: str, column_list: List[str]):
         self._table_name = table_name
         self._blocks_table_name = 'solana_blocks'
         self._column_list: List[str] = column_list
         self._column_dict: Dict[str, int] = {name: idx for idx, name in enumerate(column_list)}
-        self._conn = psycopg2.connect(
-            dbname=POSTGRES_DB,
-            user=POSTGRES_USER,
-            password=POSTGRES_PASSWORD,
-            host=POSTGRES_HOST
-        )
-        self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        self._insert_by_copy = POSTGRES_INSERT_BY_COPY
+        self._conn_pool = self.get_conn_pool()
 
-    def __del__(self):
-        self._conn.close()
+    @staticmethod
+    def get_conn_pool() -> DBConnectionPool:
+        """All DB objects of the process borrow connections from the same pool"""
+        with BaseDB._pool_lock:
+            # connections can't be shared with forked processes
+            if (BaseDB._pool is None) or (BaseDB._pool_pid != os.getpid()):
+                BaseDB._pool = DBConnectionPool(POSTGRES_POOL_MIN_CONN, POSTGRES_POOL_MAX_CONN)
+                BaseDB._pool_pid = os.getpid()
+            return BaseDB._pool
 
     def _get_column_value(self, column_name: str, value_list: List[Any]) -> Any:
         idx = self._column_dict.get(column_name, None)
@@ -42,17 +96,70 @@ class BaseDB:
 
     @staticmethod
     def _decode_list(v: Optional[bytes]) -> List[Any]:
-        return [] if not v else decode(v)
+        if not v:
+            return []
+        v = bytes(v)
+        if v[:1] == b'\x80':
+            # rows written before the JSON format have pickled lists
+            return decode(v)
+        return json_loads_bytes(v)
+
+    @staticmethod
+    def _encode_list(v: List[Any]) -> Optional[bytes]:
+        return None if (not v) or (len(v) == 0) else json_dumps_bytes(v)
 
     @staticmethod
-    def _encode_list(v: List[Any]) -> bytes:
-        return None if (not v) or (len(v) == 0) else encode(v)
+    def _encode_hex(v: Optional[str]) -> Optional[bytes]:
+        """Hex string with or without the 0x prefix to bytes for BYTEA columns"""
+        if v is None:
+            return None
+        if v[:2] == '0x':
+            v = v[2:]
+        if len(v) % 2:
+            v = '0' + v
+        return bytes.fromhex(v)
+
+    @staticmethod
+    def _decode_hex(v: Optional[bytes]) -> Optional[str]:
+        return None if v is None else '0x' + bytes(v).hex()
+
+    @staticmethod
+    def _encode_logs_bloom(v: Optional[str]) -> Optional[bytes]:
+        """The empty bloom is stored as NULL"""
+        if (not v) or (v == EMPTY_LOGS_BLOOM):
+            return None
+        return BaseDB._encode_hex(v)
+
+    @staticmethod
+    def _encode_hex_int(v: Optional[str]) -> Optional[int]:
+        """Hex number to integer for NUMERIC columns"""
+        return int(v, 16) if v else None
+
+    @staticmethod
+    def _decode_hex_int(v: Any) -> str:
+        return '' if v is None else hex(int(v))
+
+    def _encode_hex_list(self, v_list: List[str]) -> List[bytes]:
+        """Encodes user values for a filter, invalid values can't be found in the table, so they are skipped"""
+        bin_list: List[bytes] = []
+        for v in v_list:
+            try:
+                bin_list.append(self._encode_hex(v))
+            except ValueError:
+                pass
+        return bin_list
 
     def _insert_batch(self, cursor: BaseDB.Cursor, value_list_list: List[List[Any]]) -> None:
         assert len(self._column_list) > 0
         if len(value_list_list) == 0:
             return
 
+        if self._insert_by_copy:
+            self._insert_batch_by_copy(cursor, value_list_list)
+        else:
+            self._insert_batch_by_values(cursor, value_list_list)
+
+    def _insert_batch_by_values(self, cursor: BaseDB.Cursor, value_list_list: List[List[Any]]) -> None:
         request = f'''
             INSERT INTO {self._table_name}
                 ({','.join(self._column_list)})
@@ -68,13 +175,79 @@ class BaseDB:
             page_size=1000
         )
 
-    def conn(self) -> BaseDB.Connnection:
-        return self._conn
+    @staticmethod
+    def _encode_csv_value(value: Any) -> str:
+        # CSV: an unquoted empty value is NULL, a quoted one is an empty string
+        if value is None:
+            return ''
+        elif isinstance(value, (bool, int, float)):
+            return str(value)
+        elif isinstance(value, psycopg2.extensions.Binary):
+            value = '\\x' + bytes(value.adapted).hex()
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            value = '\\x' + bytes(value).hex()
+        return '"' + str(value).replace('"', '""') + '"'
+
+    def _insert_batch_by_copy(self, cursor: BaseDB.Cursor, value_list_list: List[List[Any]]) -> None:
+        """
+        Streams rows into a temporary table and moves them into the table with one INSERT.
+        COPY doesn't support ON CONFLICT, that is why the temporary table is required.
+        """
+        tmp_table_name = f'tmp_{self._table_name}'
+        column_list = ','.join(self._column_list)
+
+        data = io.StringIO(''.join(
+            ','.join([self._encode_csv_value(value) for value in value_list]) + '\n'
+            for value_list in value_list_list
+        ))
+
+        cursor.execute(f'''
+            CREATE TEMPORARY TABLE IF NOT EXISTS {tmp_table_name}
+                (LIKE {self._table_name} INCLUDING DEFAULTS);
+            TRUNCATE {tmp_table_name};
+        ''')
+        cursor.copy_expert(f'COPY {tmp_table_name} ({column_list}) FROM STDIN WITH (FORMAT csv)', data)
+        cursor.execute(f'''
+            INSERT INTO {self._table_name}
+                ({column_list})
+            SELECT {column_list}
+              FROM {tmp_table_name}
+            ON CONFLICT DO NOTHING;
+            TRUNCATE {tmp_table_name};
+        ''')
+
+    @contextmanager
+    def conn(self) -> Iterator[BaseDB.Connection]:
+        """Borrows a connection for a group of statements, which are committed together"""
+        with self._conn_pool.borrow_conn() as conn:
+            with conn:
+                yield conn
+
+    @contextmanager
+    def _cursor(self) -> Iterator[BaseDB.Cursor]:
+        with self._conn_pool.borrow_conn() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+
+    @contextmanager
+    def _server_cursor(self, fetch_size: int) -> Iterator[BaseDB.Cursor]:
+        """Rows are fetched by parts of fetch_size from a cursor on the server side"""
+        with self._conn_pool.borrow_conn() as conn:
+            # named cursors exist only inside of a transaction
+            conn.autocommit = False
+            try:
+                with conn:
+                    with conn.cursor(name=f'{self._table_name}_cursor') as cursor:
+                        cursor.itersize = fetch_size
+                        yield cursor
+            finally:
+                if not conn.closed:
+                    conn.autocommit = True
 
     def is_connected(self) -> bool:
         try:
-            with self._conn.cursor() as cursor:
+            with self._cursor() as cursor:
                 cursor.execute('SELECT 1')
             return True
-        except psycopg2.OperationalError:
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
             return False
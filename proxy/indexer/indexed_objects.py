@@ -2,16 +2,18 @@ from __future__ import annotations
 
 import hashlib
 import copy
+import math
 import time
 
 from enum import Enum
-from typing import Iterator, List, Optional, Dict, NamedTuple, Set, Deque, Tuple, cast
+from typing import Iterator, List, Optional, Dict, NamedTuple, Set, Deque, Tuple, Generic, TypeVar, Any, cast
 from collections import deque
 from logged_groups import logged_group
 
 from ..common_neon.utils import NeonTxResultInfo, NeonTxInfo, NeonTxReceiptInfo, SolanaBlockInfo, str_fmt_object
 from ..common_neon.solana_neon_tx_receipt import SolTxMetaInfo, SolNeonIxReceiptInfo, SolTxCostInfo, SolTxReceiptInfo
 from ..common_neon.environment_data import SKIP_CANCEL_TIMEOUT, HOLDER_TIMEOUT
+from ..common_neon.logs_bloom import calc_logs_bloom, logs_bloom_to_hex
 
 from ..indexer.solana_tx_meta_collector import SolTxMetaCollector
 
@@ -91,7 +93,8 @@ class NeonIndexedHolderInfo(BaseNeonIndexedObjInfo):
         super().__init__()
         self._account = account
         self._data_size = 0
-        self._data = bytes()
+        self._data = bytearray()
+        self._data_bytes: Optional[bytes] = bytes()
 
     @property
     def account(self) -> str:
@@ -99,7 +102,9 @@ class NeonIndexedHolderInfo(BaseNeonIndexedObjInfo):
 
     @property
     def data(self) -> bytes:
-        return self._data
+        if self._data_bytes is None:
+            self._data_bytes = bytes(self._data)
+        return self._data_bytes
 
     @property
     def data_size(self) -> int:
@@ -109,10 +114,12 @@ class NeonIndexedHolderInfo(BaseNeonIndexedObjInfo):
         end_pos = chunk.offset + chunk.length
         data_len = len(self._data)
         if end_pos > data_len:
-            self._data += bytes(end_pos - data_len)
+            self._data.extend(bytes(end_pos - data_len))
 
-        self._data = self._data[:chunk.offset] + chunk.data + self._data[end_pos:]
+        # in-place write, the gaps stay zero-filled, the overlaps are overwritten by the last chunk
+        self._data[chunk.offset:end_pos] = chunk.data
         self._data_size += chunk.length
+        self._data_bytes = None
 
 
 class NeonIndexedTxInfo(BaseNeonIndexedObjInfo):
@@ -228,6 +235,110 @@ class NeonIndexedTxInfo(BaseNeonIndexedObjInfo):
         self._neon_receipt = self._neon_receipt.replace(neon_tx=neon_tx)
 
 
+CopyOnWriteKey = TypeVar('CopyOnWriteKey')
+CopyOnWriteValue = TypeVar('CopyOnWriteValue')
+
+
+class CopyOnWriteDict(Generic[CopyOnWriteKey, CopyOnWriteValue]):
+    """
+    The dictionary shares the base with its clones, own changes are kept in the overlay.
+    The base is never changed: when the overlay becomes too big, it is merged into a new base.
+
+    A value is copied on the first access for an update, if it was added before the last clone,
+    so the changes of a clone are invisible for the source dictionary and vice versa.
+    """
+
+    _min_overlay_size = 64
+    _deleted = object()
+
+    def __init__(self):
+        self._base: Dict[CopyOnWriteKey, CopyOnWriteValue] = {}
+        self._overlay: Dict[CopyOnWriteKey, Any] = {}
+        self._own_key_set: Set[CopyOnWriteKey] = set()
+        self._len = 0
+
+    def _merge_overlay(self) -> None:
+        base = dict(self._base)
+        for key, value in self._overlay.items():
+            if value is self._deleted:
+                base.pop(key, None)
+            else:
+                base[key] = value
+        self._base = base
+        self._overlay = {}
+
+    def clone(self) -> CopyOnWriteDict[CopyOnWriteKey, CopyOnWriteValue]:
+        if len(self._overlay) > max(self._min_overlay_size, math.isqrt(len(self._base)) * 4):
+            self._merge_overlay()
+
+        # all values are shared now
+        self._own_key_set = set()
+
+        new_dict: CopyOnWriteDict[CopyOnWriteKey, CopyOnWriteValue] = CopyOnWriteDict()
+        new_dict._base = self._base
+        new_dict._overlay = dict(self._overlay)
+        new_dict._len = self._len
+        return new_dict
+
+    def get(self, key: CopyOnWriteKey, default: Any = None) -> Any:
+        value = self._overlay.get(key, self._base.get(key, default))
+        return default if value is self._deleted else value
+
+    def get_for_update(self, key: CopyOnWriteKey) -> Optional[CopyOnWriteValue]:
+        value = self.get(key)
+        if (value is None) or (key in self._own_key_set):
+            return value
+
+        value = copy.deepcopy(value)
+        self._overlay[key] = value
+        self._own_key_set.add(key)
+        return value
+
+    def __contains__(self, key: CopyOnWriteKey) -> bool:
+        return self.get(key, self._deleted) is not self._deleted
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __setitem__(self, key: CopyOnWriteKey, value: CopyOnWriteValue) -> None:
+        if key not in self:
+            self._len += 1
+        self._overlay[key] = value
+        self._own_key_set.add(key)
+
+    def pop(self, key: CopyOnWriteKey, default: Any = None) -> Any:
+        value = self.get(key, self._deleted)
+        if value is self._deleted:
+            return default
+
+        self._len -= 1
+        self._own_key_set.discard(key)
+        if key in self._base:
+            self._overlay[key] = self._deleted
+        else:
+            self._overlay.pop(key)
+        return value
+
+    def __delitem__(self, key: CopyOnWriteKey) -> None:
+        if self.pop(key, self._deleted) is self._deleted:
+            raise KeyError(key)
+
+    def items(self) -> Iterator[Tuple[CopyOnWriteKey, CopyOnWriteValue]]:
+        for key, value in self._base.items():
+            value = self._overlay.get(key, value)
+            if value is not self._deleted:
+                yield key, value
+        for key, value in self._overlay.items():
+            if (value is not self._deleted) and (key not in self._base):
+                yield key, value
+
+    def keys(self) -> Iterator[CopyOnWriteKey]:
+        return (key for key, _ in self.items())
+
+    def values(self) -> Iterator[CopyOnWriteValue]:
+        return (value for _, value in self.items())
+
+
 @logged_group("neon.Indexer")
 class NeonIndexedBlockInfo:
     def __init__(self, history_block_deque: Deque[SolanaBlockInfo]):
@@ -235,9 +346,9 @@ class NeonIndexedBlockInfo:
         self._history_block_deque = history_block_deque
         self._is_completed = False
 
-        self._neon_holder_dict: Dict[str, NeonIndexedHolderInfo] = {}
-        self._neon_tx_dict: Dict[str, NeonIndexedTxInfo] = {}
-        self._sol_neon_ix_dict: Dict[SolNeonIxReceiptInfo, int] = {}
+        self._neon_holder_dict: CopyOnWriteDict[str, NeonIndexedHolderInfo] = CopyOnWriteDict()
+        self._neon_tx_dict: CopyOnWriteDict[str, NeonIndexedTxInfo] = CopyOnWriteDict()
+        self._sol_neon_ix_dict: CopyOnWriteDict[SolNeonIxReceiptInfo, int] = CopyOnWriteDict()
 
         self._done_neon_tx_list: List[NeonIndexedTxInfo] = []
 
@@ -252,10 +363,11 @@ class NeonIndexedBlockInfo:
         sol_block = history_block_deque[-1]
         assert sol_block.block_slot > self.block_slot
 
+        # holders and txs are shared with the source block, and they are copied only on the first update
         new_block = NeonIndexedBlockInfo(history_block_deque)
-        new_block._neon_holder_dict = copy.deepcopy(self._neon_holder_dict)
-        new_block._neon_tx_dict = copy.deepcopy(self._neon_tx_dict)
-        new_block._sol_neon_ix_dict = copy.deepcopy(self._sol_neon_ix_dict)
+        new_block._neon_holder_dict = self._neon_holder_dict.clone()
+        new_block._neon_tx_dict = self._neon_tx_dict.clone()
+        new_block._sol_neon_ix_dict = self._sol_neon_ix_dict.clone()
         return new_block
 
     @property
@@ -270,6 +382,10 @@ class NeonIndexedBlockInfo:
     def is_finalized(self) -> bool:
         return self._sol_block.is_finalized
 
+    @property
+    def logs_bloom(self) -> Optional[str]:
+        return self._history_block_deque[-1].logs_bloom
+
     @property
     def is_completed(self) -> bool:
         return self._is_completed
@@ -307,7 +423,7 @@ class NeonIndexedBlockInfo:
         self._sol_tx_cost_list.append(sol_tx_cost)
 
     def find_neon_holder(self, account: str, sol_neon_ix: SolNeonIxReceiptInfo) -> Optional[NeonIndexedHolderInfo]:
-        holder = self._neon_holder_dict.get(account)
+        holder = self._neon_holder_dict.get_for_update(account)
         if holder:
             self._add_sol_neon_ix(holder, sol_neon_ix)
         return holder
@@ -317,7 +433,7 @@ class NeonIndexedBlockInfo:
         if neon_tx_sig[:2] == '0x':
             neon_tx_sig = neon_tx_sig[2:]
         key = f'{account}:{neon_tx_sig}'
-        holder = self._neon_holder_dict.get(key)
+        holder = self._neon_holder_dict.get_for_update(key)
         if holder:
             self._add_sol_neon_ix(holder, sol_neon_ix)
         return holder
@@ -356,7 +472,7 @@ class NeonIndexedBlockInfo:
 
     def find_neon_tx(self, key: NeonIndexedTxInfo.Key,
                      sol_neon_ix: SolNeonIxReceiptInfo) -> Optional[NeonIndexedTxInfo]:
-        tx = self._neon_tx_dict.get(key.value, None)
+        tx = self._neon_tx_dict.get_for_update(key.value)
         if tx is not None:
             self._add_sol_neon_ix(tx, sol_neon_ix)
         return tx
@@ -387,6 +503,12 @@ class NeonIndexedBlockInfo:
 
         self._del_neon_tx(tx)
 
+    def cancel_neon_tx(self, tx: NeonIndexedTxInfo, sol_neon_ix: SolNeonIxReceiptInfo) -> NeonIndexedTxInfo:
+        tx = self._neon_tx_dict.get_for_update(tx.key.value)
+        assert tx is not None, 'attempt to cancel the not-existent tx'
+        tx.set_status(NeonIndexedTxInfo.Status.CANCELED, sol_neon_ix)
+        return tx
+
     def done_neon_tx(self, tx: NeonIndexedTxInfo, sol_neon_ix: SolNeonIxReceiptInfo) -> None:
         if tx.status not in (NeonIndexedTxInfo.Status.IN_PROGRESS, NeonIndexedTxInfo.Status.CANCELED):
             self.warning(f'attempt to done the completed tx {tx}')
@@ -396,11 +518,24 @@ class NeonIndexedBlockInfo:
 
         tx.set_status(NeonIndexedTxInfo.Status.DONE, sol_neon_ix)
         tx.neon_tx_res.fill_block_info(self._sol_block, tx_idx, self._log_idx)
+        self._add_logs_bloom(tx)
 
         self._log_idx += len(tx.neon_tx_res.log_list)
 
         self._done_neon_tx_list.append(tx)
 
+    def _add_logs_bloom(self, tx: NeonIndexedTxInfo) -> None:
+        logs_bloom = calc_logs_bloom(tx.neon_tx_res.log_list)
+        tx.neon_tx_res.fill_logs_bloom(logs_bloom_to_hex(logs_bloom))
+        if logs_bloom == 0:
+            return
+
+        # the block is stored from the history deque, the txs are always in the last block
+        sol_block = self._history_block_deque[-1]
+        if sol_block.logs_bloom is not None:
+            logs_bloom |= int(sol_block.logs_bloom, 16)
+        self._history_block_deque[-1] = sol_block.replace(logs_bloom=logs_bloom_to_hex(logs_bloom))
+
     def add_neon_account(self, _: NeonAccountInfo, __: SolNeonIxReceiptInfo) -> None:
         pass
 
@@ -426,7 +561,7 @@ class NeonIndexedBlockInfo:
         return len(self._neon_holder_dict)
 
     def iter_sol_neon_ix(self) -> Iterator[SolNeonIxReceiptInfo]:
-        return iter(self._sol_neon_ix_dict.keys())
+        return self._sol_neon_ix_dict.keys()
 
     @property
     def sol_neon_ix_cnt(self) -> int:
@@ -35,7 +35,7 @@ from ..indexer.neon_ix_decoder_deprecate import get_neon_ix_decoder_deprecated_l
 class Indexer(IndexerBase):
     def __init__(self, config: Config, indexer_stat_exporter: IIndexerStatExporter):
         solana = SolInteractor(config, config.solana_url)
-        self._db = IndexerDB()
+        self._db = IndexerDB(is_writer=True)
         last_known_slot = self._db.get_min_receipt_block_slot()
         super().__init__(config, solana, last_known_slot)
         self._cancel_tx_executor = CancelTxExecutor(config, solana, get_solana_accounts()[0])
@@ -61,9 +61,10 @@ class Indexer(IndexerBase):
             self._sol_neon_ix_decoder_dict[ix_code] = decoder
 
     def _cancel_old_neon_txs(self, state: SolNeonTxDecoderState, sol_tx_meta: SolTxMetaInfo) -> None:
-        for tx in state.neon_block.iter_neon_tx():
+        neon_block = state.neon_block
+        for tx in list(neon_block.iter_neon_tx()):
             if (tx.storage_account != '') and (state.stop_block_slot - tx.block_slot > CANCEL_TIMEOUT):
-                self._cancel_neon_tx(tx, sol_tx_meta)
+                self._cancel_neon_tx(neon_block, tx, sol_tx_meta)
 
         try:
             self._cancel_tx_executor.execute_tx_list()
@@ -72,7 +73,8 @@ class Indexer(IndexerBase):
         finally:
             self._cancel_tx_executor.clear()
 
-    def _cancel_neon_tx(self, tx: NeonIndexedTxInfo, sol_tx_meta: SolTxMetaInfo) -> bool:
+    def _cancel_neon_tx(self, neon_block: NeonIndexedBlockInfo, tx: NeonIndexedTxInfo,
+                        sol_tx_meta: SolTxMetaInfo) -> bool:
         # We've already indexed the transaction
         if tx.neon_tx_res.is_valid():
             return True
@@ -111,7 +113,7 @@ class Indexer(IndexerBase):
             return False
 
         self.debug(f'Neon tx is blocked: storage {holder_account}, {tx.neon_tx}, {holder_info.account_list}')
-        tx.set_status(NeonIndexedTxInfo.Status.CANCELED, SolNeonIxReceiptInfo.from_tx(sol_tx_meta))
+        neon_block.cancel_neon_tx(tx, SolNeonIxReceiptInfo.from_tx(sol_tx_meta))
         return True
 
     def _save_checkpoint(self) -> None:
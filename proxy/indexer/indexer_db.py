@@ -1,5 +1,7 @@
+import math
+
 from logged_groups import logged_group
-from typing import Optional, List, Iterator
+from typing import Optional, List, Iterator, Dict, Any
 
 from ..indexer.solana_blocks_db import SolBlocksDB, SolanaBlockInfo
 from ..indexer.neon_txs_db import NeonTxsDB
@@ -7,6 +9,7 @@ from ..indexer.solana_neon_txs_db import SolNeonTxsDB
 from ..indexer.neon_tx_logs_db import NeonTxLogsDB
 from ..indexer.solana_tx_costs_db import SolTxCostsDB
 from ..indexer.sql_dict import SQLDict
+from ..indexer.pg_common import POSTGRES_CONSTANTS_CACHE_TTL_MSEC
 from ..indexer.base_db import BaseDB
 from ..indexer.indexed_objects import NeonIndexedBlockInfo
 
@@ -15,7 +18,7 @@ from ..common_neon.utils import NeonTxReceiptInfo
 
 @logged_group("neon.Indexer")
 class IndexerDB:
-    def __init__(self):
+    def __init__(self, is_writer: bool = False):
         self._sol_blocks_db = SolBlocksDB()
         self._sol_tx_costs_db = SolTxCostsDB()
         self._neon_txs_db = NeonTxsDB()
@@ -30,7 +33,9 @@ class IndexerDB:
             self._neon_tx_logs_db
         ]
 
-        self._constants_db = SQLDict(tablename="constants")
+        # the indexer is the only writer of constants, other processes see its changes with a delay of TTL
+        cache_ttl_sec = math.inf if is_writer else POSTGRES_CONSTANTS_CACHE_TTL_MSEC / 1000
+        self._constants_db = SQLDict(tablename="constants", cache_ttl_sec=cache_ttl_sec)
         for k in ['min_receipt_block_slot', 'latest_block_slot', 'starting_block_slot', 'finalized_block_slot']:
             if k not in self._constants_db:
                 self._constants_db[k] = 0
@@ -96,6 +101,9 @@ class IndexerDB:
     def get_block_by_slot(self, block_slot: int) -> SolanaBlockInfo:
         return self._sol_blocks_db.get_block_by_slot(block_slot, self.get_latest_block_slot())
 
+    def get_block_list_by_slot_range(self, from_block_slot: int, to_block_slot: int) -> List[SolanaBlockInfo]:
+        return self._sol_blocks_db.get_block_list_by_slot_range(from_block_slot, to_block_slot)
+
     def get_block_by_hash(self, block_hash: str) -> SolanaBlockInfo:
         return self._sol_blocks_db.get_block_by_hash(block_hash, self.get_latest_block_slot())
 
@@ -134,8 +142,13 @@ class IndexerDB:
         self._min_receipt_block_slot = block_slot
         self._constants_db['min_receipt_block_slot'] = block_slot
 
-    def get_logs(self, from_block, to_block, addresses, topics, block_hash):
-        return self._neon_tx_logs_db.get_logs(from_block, to_block, addresses, topics, block_hash)
+    def get_logs(self, from_block: Optional[int], to_block: Optional[int],
+                 address_list: List[str], topic_list: List[Optional[List[str]]],
+                 block_hash: Optional[str], max_log_cnt: int) -> List[Dict[str, Any]]:
+        return self._neon_tx_logs_db.get_logs(from_block, to_block, address_list, topic_list, block_hash, max_log_cnt)
+
+    def get_log_list_by_slot_range(self, from_block_slot: int, to_block_slot: int) -> List[Dict[str, Any]]:
+        return self._neon_tx_logs_db.get_log_list_by_slot_range(from_block_slot, to_block_slot)
 
     def get_tx_list_by_block_slot(self, block_slot: int) -> List[NeonTxReceiptInfo]:
         return self._neon_txs_db.get_tx_list_by_block_slot(block_slot)
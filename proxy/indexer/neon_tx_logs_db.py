@@ -1,17 +1,22 @@
-from typing import List, Any, Optional, Dict, Iterator, Set
+from typing import List, Any, Optional, Dict, Iterator
 
+from ..common_neon.errors import LimitExceededError
 from ..indexer.base_db import BaseDB
 from ..indexer.indexed_objects import NeonIndexedTxInfo
 
 
 class NeonTxLogsDB(BaseDB):
+    # the EVM emits logs with up to 4 topics: LOG0..LOG4
+    _topic_column_list = ['topic0', 'topic1', 'topic2', 'topic3']
+    _fetch_size = 1000
+
     def __init__(self):
         super().__init__(
             table_name='neon_transaction_logs',
             column_list=[
                 'block_slot', 'tx_idx', 'tx_log_idx', 'log_idx',
-                'address', 'log_data', 'tx_hash', 'topic', 'topic_list'
-            ]
+                'address', 'log_data', 'tx_hash'
+            ] + self._topic_column_list
         )
 
         self._column2field_dict = {
@@ -25,55 +30,61 @@ class NeonTxLogsDB(BaseDB):
         }
 
         self._hex_field_dict = ['blockNumber', 'transactionIndex', 'transactionLogIndex', 'logIndex']
+        self._bin_field_set = {'address', 'data', 'transactionHash'}
 
     def set_tx_list(self, cursor: BaseDB.Cursor, iter_neon_tx: Iterator[NeonIndexedTxInfo]) -> None:
+        topic_cnt = len(self._topic_column_list)
         value_list_list: List[List[Any]] = []
         for tx in iter_neon_tx:
             for log in tx.neon_tx_res.log_list:
-                topic_list = self._encode_list(log['topics'])
-                for topic in log['topics']:
-                    value_list: List[Any] = []
-                    for idx, column in enumerate(self._column_list):
-                        if column == 'topic':
-                            value_list.append(topic)
-                        elif column == 'topic_list':
-                            value_list.append(topic_list)
-                        else:
-                            key = self._column2field_dict.get(column, None)
-                            if key in log:
-                                value = log[key]
-                                if key in self._hex_field_dict:
-                                    value = int(value[2:], 16)
-                                value_list.append(value)
-                            else:
-                                raise RuntimeError(f'Wrong usage {self._table_name}: {idx} -> {column}!')
-                    value_list_list.append(value_list)
+                topic_list = [self._encode_hex(topic) for topic in log['topics'][:topic_cnt]]
+                topic_list += [None] * (topic_cnt - len(topic_list))
+
+                value_list: List[Any] = []
+                for idx, column in enumerate(self._column_list[:-topic_cnt]):
+                    key = self._column2field_dict.get(column, None)
+                    if key in log:
+                        value = log[key]
+                        if key in self._hex_field_dict:
+                            value = int(value[2:], 16)
+                        elif key in self._bin_field_set:
+                            value = self._encode_hex(value)
+                        value_list.append(value)
+                    else:
+                        raise RuntimeError(f'Wrong usage {self._table_name}: {idx} -> {column}!')
+                value_list_list.append(value_list + topic_list)
 
         self._insert_batch(cursor, value_list_list)
 
     def _log_from_value(self, value_list: List[Any]) -> Dict[str, Any]:
+        topic_cnt = len(self._topic_column_list)
         log: Dict[str, Any] = {}
-        for idx, column in enumerate(self._column_list):
-            if column == 'topic':
-                pass
-            elif column == 'topic_list':
-                log['topics'] = self._decode_list(value_list[idx])
-            else:
-                key = self._column2field_dict.get(column, None)
-                if key is None:
-                    raise RuntimeError(f'Wrong usage {self._table_name}: {idx} -> {column}!')
-                value = value_list[idx]
-                if key in self._hex_field_dict:
-                    value = hex(value)
-                log[key] = value
-        log['blockHash'] = value_list[-1]
+        for idx, column in enumerate(self._column_list[:-topic_cnt]):
+            key = self._column2field_dict.get(column, None)
+            if key is None:
+                raise RuntimeError(f'Wrong usage {self._table_name}: {idx} -> {column}!')
+            value = value_list[idx]
+            if key in self._hex_field_dict:
+                value = hex(value)
+            elif key in self._bin_field_set:
+                value = self._decode_hex(value)
+            log[key] = value
+
+        topic_idx = len(self._column_list) - topic_cnt
+        log['topics'] = [self._decode_hex(topic) for topic in value_list[topic_idx:-1] if topic is not None]
+        log['blockHash'] = self._decode_hex(value_list[-1])
         return log
 
     def get_logs(self, from_block: Optional[int],
                  to_block: Optional[int],
                  address_list: List[str],
-                 topic_list: List[str],
-                 block_hash: Optional[str]) -> List[Dict[str, Any]]:
+                 topic_list: List[Optional[List[str]]],
+                 block_hash: Optional[str],
+                 max_log_cnt: int) -> List[Dict[str, Any]]:
+        """
+        topic_list is positional: the item N filters topicN by any of the values, None matches any topic.
+        Raises LimitExceededError if more than max_log_cnt logs match the filter.
+        """
         query_list: List[str] = ['1 = 1']
         param_list: List[Any] = []
 
@@ -86,23 +97,38 @@ class NeonTxLogsDB(BaseDB):
             param_list.append(to_block)
 
         if block_hash is not None:
-            block_hash = block_hash.lower()
+            bin_block_hash_list = self._encode_hex_list([block_hash])
+            if len(bin_block_hash_list) == 0:
+                return []
             query_list.append('b.block_hash = %s')
-            param_list.append(block_hash)
+            param_list += bin_block_hash_list
+
+        if len(topic_list) > len(self._topic_column_list):
+            return []
 
-        if len(topic_list) > 0:
-            query_placeholder = ', '.join(['%s' for _ in range(len(topic_list))])
-            topics_query = f'a.topic IN ({query_placeholder})'
+        for idx, (topic_column, position_topic_list) in enumerate(zip(self._topic_column_list, topic_list)):
+            if position_topic_list is None:
+                # the log should have a topic at the last position of the filter
+                if idx + 1 == len(topic_list):
+                    query_list.append(f'a.{topic_column} IS NOT NULL')
+                continue
 
-            query_list.append(topics_query)
-            param_list += topic_list
+            bin_topic_list = self._encode_hex_list(position_topic_list)
+            if len(bin_topic_list) == 0:
+                return []
+            query_placeholder = ', '.join(['%s' for _ in range(len(bin_topic_list))])
+            query_list.append(f'a.{topic_column} IN ({query_placeholder})')
+            param_list += bin_topic_list
 
         if len(address_list) > 0:
-            query_placeholder = ', '.join(['%s' for _ in range(len(address_list))])
+            bin_address_list = self._encode_hex_list(address_list)
+            if len(bin_address_list) == 0:
+                return []
+            query_placeholder = ', '.join(['%s' for _ in range(len(bin_address_list))])
             address_query = f'a.address IN ({query_placeholder})'
 
             query_list.append(address_query)
-            param_list += address_list
+            param_list += bin_address_list
 
         query_string = f'''
             SELECT {",".join(['a.' + c for c in self._column_list])},
@@ -112,23 +138,40 @@ class NeonTxLogsDB(BaseDB):
                 ON b.block_slot = a.block_slot
                AND b.is_active = True
              WHERE {' AND '.join(query_list)}
-          ORDER BY a.block_slot DESC
-             LIMIT 1000
+          ORDER BY a.block_slot, a.tx_idx, a.tx_log_idx
+             LIMIT %s
          '''
+        param_list.append(max_log_cnt + 1)
 
-        with self._conn.cursor() as cursor:
+        log_list: List[Dict[str, Any]] = []
+        with self._server_cursor(self._fetch_size) as cursor:
             cursor.execute(query_string, tuple(param_list))
+            for value_list in cursor:
+                if len(log_list) == max_log_cnt:
+                    raise LimitExceededError(
+                        message=f'query returned more than {max_log_cnt} results, narrow the block range or the filter'
+                    )
+                log_list.append(self._log_from_value(value_list))
+        return log_list
+
+    def get_log_list_by_slot_range(self, from_block_slot: int, to_block_slot: int) -> List[Dict[str, Any]]:
+        query_string = f'''
+            SELECT {",".join(['a.' + c for c in self._column_list])},
+                   b.block_hash
+              FROM {self._table_name} AS a
+        INNER JOIN {self._blocks_table_name} AS b
+                ON b.block_slot = a.block_slot
+               AND b.is_active = True
+             WHERE a.block_slot > %s
+               AND a.block_slot <= %s
+          ORDER BY a.block_slot, a.tx_idx, a.tx_log_idx
+         '''
+
+        with self._cursor() as cursor:
+            cursor.execute(query_string, (from_block_slot, to_block_slot))
             row_list = cursor.fetchall()
 
-        unique_log_set: Set[str] = set()
-        log_list: List[Dict[str, Any]] = []
-        for value_list in row_list:
-            ident = ':'.join([str(v) for v in value_list[:3]])  # block_slot:tx_idx:tx_log_idx
-            if ident in unique_log_set:
-                continue
-            unique_log_set.add(ident)
-            log_list.append(self._log_from_value(value_list))
-        return log_list
+        return [self._log_from_value(value_list) for value_list in row_list]
 
     def finalize_block_list(self, cursor: BaseDB.Cursor, base_block_slot: int, block_slot_list: List[int]) -> None:
         cursor.execute(f'''
@@ -1,5 +1,6 @@
-from typing import Optional, List, Any, Iterator
+from typing import Optional, List, Any, Iterator, Dict, Callable
 
+from ..common_neon.logs_bloom import calc_logs_bloom, logs_bloom_to_hex
 from ..common_neon.utils import NeonTxResultInfo, NeonTxInfo, NeonTxReceiptInfo
 
 from ..indexer.indexed_objects import NeonIndexedTxInfo
@@ -13,41 +14,77 @@ class NeonTxsDB(BaseDB):
             column_list=[
                 'neon_sig', 'from_addr', 'sol_sig', 'sol_ix_idx', 'sol_ix_inner_idx', 'block_slot',
                 'tx_idx', 'nonce', 'gas_price', 'gas_limit', 'to_addr', 'contract', 'value',
-                'calldata', 'v', 'r', 's', 'status', 'gas_used', 'return_value', 'logs'
+                'calldata', 'v', 'r', 's', 'status', 'gas_used', 'return_value', 'logs', 'logs_bloom'
             ]
         )
 
+        hex_column_list = ['neon_sig', 'from_addr', 'to_addr', 'contract', 'calldata']
+        hex_int_column_list = ['nonce', 'gas_price', 'gas_limit', 'value', 'gas_used', 'status', 'v', 'r', 's']
+
+        self._encoder_dict: Dict[str, Callable[[Any], Any]] = {
+            'return_value': self._encode_hex,
+            'logs': self._encode_list,
+            'logs_bloom': self._encode_logs_bloom
+        }
+        self._encoder_dict.update({column: self._encode_hex for column in hex_column_list})
+        self._encoder_dict.update({column: self._encode_hex_int for column in hex_int_column_list})
+
+        self._decoder_dict: Dict[str, Callable[[Any], Any]] = {
+            # the return value is stored without the 0x prefix
+            'return_value': lambda v: '' if v is None else bytes(v).hex(),
+            'logs': self._decode_list,
+            'logs_bloom': self._decode_hex
+        }
+        self._decoder_dict.update({column: self._decode_hex for column in hex_column_list})
+        self._decoder_dict.update({column: self._decode_hex_int for column in hex_int_column_list})
+
+    def _encode_value(self, column: str, value: Any) -> Any:
+        encoder = self._encoder_dict.get(column, None)
+        return value if encoder is None else encoder(value)
+
+    def _decode_value(self, column: str, value: Any) -> Any:
+        decoder = self._decoder_dict.get(column, None)
+        return value if decoder is None else decoder(value)
+
     def _tx_from_value(self, value_list: Optional[List[Any]]) -> Optional[NeonTxReceiptInfo]:
         if not value_list:
             return None
 
+        value_dict = {
+            column: self._decode_value(column, value)
+            for column, value in zip(self._column_list, value_list)
+        }
+
         neon_tx = NeonTxInfo(
-            addr=self._get_column_value('from_addr', value_list),
-            sig=self._get_column_value('neon_sig', value_list),
-            nonce=self._get_column_value('nonce', value_list),
-            gas_price=self._get_column_value('gas_price', value_list),
-            gas_limit=self._get_column_value('gas_limit', value_list),
-            to_addr=self._get_column_value('to_addr', value_list),
-            contract=self._get_column_value('contract', value_list),
-            value=self._get_column_value('value', value_list),
-            calldata=self._get_column_value('calldata', value_list),
-            v=self._get_column_value('v', value_list),
-            r=self._get_column_value('r', value_list),
-            s=self._get_column_value('s', value_list)
+            addr=value_dict['from_addr'],
+            sig=value_dict['neon_sig'],
+            nonce=value_dict['nonce'],
+            gas_price=value_dict['gas_price'],
+            gas_limit=value_dict['gas_limit'],
+            to_addr=value_dict['to_addr'],
+            contract=value_dict['contract'],
+            value=value_dict['value'],
+            calldata=value_dict['calldata'],
+            v=value_dict['v'],
+            r=value_dict['r'],
+            s=value_dict['s']
         )
         neon_tx_res = NeonTxResultInfo()
 
-        for idx, column in enumerate(self._column_list):
+        for column, value in value_dict.items():
             if column == 'logs':
-                neon_tx_res.log_list = self._decode_list(value_list[idx])
+                neon_tx_res.log_list = value
             elif column == 'block_slot':
-                neon_tx_res._block_slot = value_list[idx]
+                neon_tx_res._block_slot = value
             elif hasattr(neon_tx_res, column):
-                setattr(neon_tx_res, '_' + column, value_list[idx])
+                setattr(neon_tx_res, '_' + column, value)
             else:
                 pass
 
-        neon_tx_res._block_hash = value_list[-1]
+        if neon_tx_res.logs_bloom is None:
+            # the empty bloom isn't stored, and the txs indexed before blooms don't have it
+            neon_tx_res.fill_logs_bloom(logs_bloom_to_hex(calc_logs_bloom(neon_tx_res.log_list)))
+        neon_tx_res._block_hash = self._decode_hex(value_list[-1])
         return NeonTxReceiptInfo(neon_tx=neon_tx, neon_tx_res=neon_tx_res)
 
     def set_tx_list(self, cursor: BaseDB.Cursor, iter_neon_tx: Iterator[NeonIndexedTxInfo]) -> None:
@@ -56,19 +93,20 @@ class NeonTxsDB(BaseDB):
             value_list: List[Any] = []
             for idx, column in enumerate(self._column_list):
                 if column == 'neon_sig':
-                    value_list.append(tx.neon_tx.sig)
+                    value = tx.neon_tx.sig
                 elif column == 'from_addr':
-                    value_list.append(tx.neon_tx.addr)
+                    value = tx.neon_tx.addr
                 elif column == 'logs':
-                    value_list.append(self._encode_list(tx.neon_tx_res.log_list))
+                    value = tx.neon_tx_res.log_list
                 elif column == 'block_slot':
-                    value_list.append(tx.neon_tx_res.block_slot)
+                    value = tx.neon_tx_res.block_slot
                 elif hasattr(tx.neon_tx, column):
-                    value_list.append(getattr(tx.neon_tx, column))
+                    value = getattr(tx.neon_tx, column)
                 elif hasattr(tx.neon_tx_res, column):
-                    value_list.append(getattr(tx.neon_tx_res, column))
+                    value = getattr(tx.neon_tx_res, column)
                 else:
                     raise RuntimeError(f'Wrong usage {self._table_name}: {idx} -> {column}!')
+                value_list.append(self._encode_value(column, value))
             value_list_list.append(value_list)
 
         self._insert_batch(cursor, value_list_list)
@@ -83,12 +121,16 @@ class NeonTxsDB(BaseDB):
         '''
 
     def get_tx_by_neon_sig(self, neon_sig: str) -> Optional[NeonTxReceiptInfo]:
+        bin_neon_sig_list = self._encode_hex_list([neon_sig])
+        if len(bin_neon_sig_list) == 0:
+            return None
+
         request = self._build_request() + '''
                AND b.is_active = True
              WHERE a.neon_sig = %s
         '''
-        with self._conn.cursor() as cursor:
-            cursor.execute(request, (neon_sig,))
+        with self._cursor() as cursor:
+            cursor.execute(request, (bin_neon_sig_list[0],))
             return self._tx_from_value(cursor.fetchone())
 
     def get_tx_list_by_block_slot(self, block_slot: int) -> List[NeonTxReceiptInfo]:
@@ -96,7 +138,7 @@ class NeonTxsDB(BaseDB):
              WHERE a.block_slot = %s
           ORDER BY a.tx_idx ASC
         '''
-        with self._conn.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(request, (block_slot,))
             row_list = cursor.fetchall()
 
@@ -110,7 +152,7 @@ class NeonTxsDB(BaseDB):
              WHERE a.block_slot = %s
                AND a.tx_idx = %s
         '''
-        with self._conn.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(request, (block_slot, tx_idx))
             return self._tx_from_value(cursor.fetchone())
 
@@ -7,6 +7,10 @@ POSTGRES_DB = os.environ["POSTGRES_DB"]
 POSTGRES_USER = os.environ["POSTGRES_USER"]
 POSTGRES_PASSWORD = os.environ["POSTGRES_PASSWORD"]
 POSTGRES_HOST = os.environ["POSTGRES_HOST"]
+POSTGRES_INSERT_BY_COPY = os.environ.get("POSTGRES_INSERT_BY_COPY", "NO") == "YES"
+POSTGRES_POOL_MIN_CONN = max(int(os.environ.get("POSTGRES_POOL_MIN_CONN", "2")), 0)
+POSTGRES_POOL_MAX_CONN = max(int(os.environ.get("POSTGRES_POOL_MAX_CONN", "8")), 1)
+POSTGRES_CONSTANTS_CACHE_TTL_MSEC = max(int(os.environ.get("POSTGRES_CONSTANTS_CACHE_TTL_MSEC", "100")), 0)
 
 try:
     from cPickle import dumps, loads, HIGHEST_PROTOCOL as PICKLE_PROTOCOL
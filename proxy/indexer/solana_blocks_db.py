@@ -11,7 +11,8 @@ class SolBlocksDB(BaseDB):
         super().__init__(
             table_name='solana_blocks',
             column_list=[
-                'block_slot', 'block_hash', 'block_time', 'parent_block_slot', 'is_finalized', 'is_active'
+                'block_slot', 'block_hash', 'block_time', 'parent_block_slot', 'is_finalized', 'is_active',
+                'logs_bloom'
             ]
         )
 
@@ -60,10 +61,13 @@ class SolBlocksDB(BaseDB):
             block_slot = self._get_column_value('block_slot', value_list)
         return SolanaBlockInfo(
             block_slot=block_slot,
-            block_hash=self._check_block_hash(block_slot, self._get_column_value('block_hash', value_list)),
+            block_hash=self._check_block_hash(
+                block_slot, self._decode_hex(self._get_column_value('block_hash', value_list))
+            ),
             block_time=self._check_block_time(block_slot, self._get_column_value('block_time', value_list)),
             is_finalized=self._get_column_value('is_finalized', value_list),
-            parent_block_hash=self._check_block_hash(block_slot - 1, value_list[6])
+            parent_block_hash=self._check_block_hash(block_slot - 1, self._decode_hex(value_list[-1])),
+            logs_bloom=self._decode_hex(self._get_column_value('logs_bloom', value_list))
         )
 
     def _build_request(self) -> str:
@@ -104,16 +108,37 @@ class SolBlocksDB(BaseDB):
                     AND b.is_active = True
                   LIMIT 1)
                 '''
-        with self._conn.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(request, (block_slot - 1, block_slot, block_slot, block_slot - 1))
             return self._block_from_value(block_slot, cursor.fetchone())
 
+    def get_block_list_by_slot_range(self, from_block_slot: int, to_block_slot: int) -> List[SolanaBlockInfo]:
+        request = f'''
+                 SELECT {",".join(['a.' + c for c in self._column_list])},
+                        b.block_hash AS parent_block_hash
+                   FROM {self._table_name} AS a
+        LEFT OUTER JOIN {self._table_name} AS b
+                     ON b.block_slot = a.block_slot - 1
+                    AND b.is_active = True
+                  WHERE a.block_slot > %s
+                    AND a.block_slot <= %s
+                    AND a.is_active = True
+               ORDER BY a.block_slot
+        '''
+        with self._cursor() as cursor:
+            cursor.execute(request, (from_block_slot, to_block_slot))
+            return [self._block_from_value(None, value_list) for value_list in cursor.fetchall()]
+
     def get_block_by_hash(self, block_hash: str, latest_block_slot: int) -> SolanaBlockInfo:
         fake_block_slot = self._get_fake_block_slot(block_hash)
         if fake_block_slot is not None:
             block = self.get_block_by_slot(fake_block_slot, latest_block_slot)
             return block.replace(block_hash=block_hash)  # it can be a request from an uncle history branch
 
+        bin_block_hash_list = self._encode_hex_list([block_hash])
+        if len(bin_block_hash_list) == 0:
+            return SolanaBlockInfo(block_slot=0)
+
         request = f'''
                  SELECT {",".join(['a.' + c for c in self._column_list])},
                         b.block_hash AS parent_block_hash
@@ -125,16 +150,16 @@ class SolBlocksDB(BaseDB):
                     AND b.is_active = True
                   WHERE a.block_hash = %s
         '''
-        with self._conn.cursor() as cursor:
-            cursor.execute(request, (block_hash,))
+        with self._cursor() as cursor:
+            cursor.execute(request, (bin_block_hash_list[0],))
             return self._block_from_value(None, cursor.fetchone())
 
     def set_block_list(self, cursor: BaseDB.Cursor, iter_block: Iterator[SolanaBlockInfo]) -> None:
         value_list_list: List[List[Any]] = []
         for block in iter_block:
             value_list_list.append([
-                block.block_slot, block.block_hash, block.block_time, block.parent_block_slot,
-                block.is_finalized, block.is_finalized
+                block.block_slot, self._encode_hex(block.block_hash), block.block_time, block.parent_block_slot,
+                block.is_finalized, block.is_finalized, self._encode_logs_bloom(block.logs_bloom)
             ])
 
         self._insert_batch(cursor, value_list_list)
@@ -38,7 +38,7 @@ class SolNeonTxsDB(BaseDB):
                       WHERE neon_sig = %s
         '''
 
-        with self._conn.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(request, [neon_sig])
             row_list = cursor.fetchall()
 
@@ -1,7 +1,5 @@
 from typing import Optional
 
-import psycopg2.extensions
-
 from ..common_neon.solana_neon_tx_receipt import SolTxSigSlotInfo
 from ..indexer.base_db import BaseDB
 
@@ -9,10 +7,9 @@ from ..indexer.base_db import BaseDB
 class SolSigsDB(BaseDB):
     def __init__(self):
         super().__init__('solana_transaction_signatures', [])
-        self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
 
     def add_sig(self, info: SolTxSigSlotInfo) -> None:
-        with self._conn.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(f'''
                 INSERT INTO {self._table_name}
                     (block_slot, signature)
@@ -24,7 +21,7 @@ class SolSigsDB(BaseDB):
             )
 
     def get_next_sig(self, block_slot: int) -> Optional[SolTxSigSlotInfo]:
-        with self._conn.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(f'''
                 SELECT signature,
                        block_slot
@@ -39,7 +36,7 @@ class SolSigsDB(BaseDB):
             return None
 
     def get_max_sig(self) -> Optional[SolTxSigSlotInfo]:
-        with self._conn.cursor() as cursor:
+        with self._cursor() as cursor:
             cursor.execute(f'''
                 SELECT signature,
                        block_slot
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import queue
+import threading
+
 from multiprocessing.dummy import Pool as ThreadPool
 
 from logged_groups import logged_group
@@ -69,8 +72,61 @@ class SolTxMetaCollector(ABC):
     def is_finalized(self) -> bool:
         return self._is_finalized
 
-    @abstractmethod
     def iter_tx_meta(self, start_slot: int, stop_slot: int) -> Iterator[SolTxMetaInfo]:
+        """
+        Receipts are fetched in a separate thread into a bounded queue,
+        so requests to Solana for the next portion of history overlap with the processing of the current one.
+        """
+        prefetch_tx_cnt = self._config.indexer_prefetch_tx_cnt
+        if prefetch_tx_cnt == 0:
+            return self._iter_tx_meta_range(start_slot, stop_slot)
+        return self._iter_prefetched_tx_meta(start_slot, stop_slot, prefetch_tx_cnt)
+
+    def _iter_prefetched_tx_meta(self, start_slot: int, stop_slot: int, prefetch_tx_cnt: int) -> Iterator[SolTxMetaInfo]:
+        tx_meta_queue: queue.Queue[Union[SolTxMetaInfo, BaseException, None]] = queue.Queue(maxsize=prefetch_tx_cnt)
+        stop_event = threading.Event()
+        fetch_thread = threading.Thread(
+            target=self._fetch_tx_meta_range,
+            args=(start_slot, stop_slot, tx_meta_queue, stop_event),
+            name=f'fetch-{self._commitment}',
+            daemon=True
+        )
+        fetch_thread.start()
+
+        try:
+            while True:
+                tx_meta = tx_meta_queue.get()
+                if tx_meta is None:
+                    return
+                elif isinstance(tx_meta, BaseException):
+                    raise tx_meta
+                yield tx_meta
+        finally:
+            # the processing can be interrupted, the fetching should be stopped before the next iteration
+            stop_event.set()
+            fetch_thread.join()
+
+    def _fetch_tx_meta_range(self, start_slot: int, stop_slot: int,
+                             tx_meta_queue: queue.Queue, stop_event: threading.Event) -> None:
+        def _put(item: Union[SolTxMetaInfo, BaseException, None]) -> bool:
+            while not stop_event.is_set():
+                try:
+                    tx_meta_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            for tx_meta in self._iter_tx_meta_range(start_slot, stop_slot):
+                if not _put(tx_meta):
+                    return
+            _put(None)
+        except BaseException as exc:
+            _put(exc)
+
+    @abstractmethod
+    def _iter_tx_meta_range(self, start_slot: int, stop_slot: int) -> Iterator[SolTxMetaInfo]:
         pass
 
     def _iter_tx_meta(self, sig_slot_list: List[SolTxSigSlotInfo]) -> Iterator[SolTxMetaInfo]:
@@ -184,7 +240,7 @@ class FinalizedSolTxMetaCollector(SolTxMetaCollector):
             if sig_slot.block_slot < self._stop_slot:
                 self._tx_meta_dict.pop(sig_slot)
 
-    def iter_tx_meta(self, start_slot: int, stop_slot: int) -> Iterator[SolTxMetaInfo]:
+    def _iter_tx_meta_range(self, start_slot: int, stop_slot: int) -> Iterator[SolTxMetaInfo]:
         if start_slot < stop_slot:
             return
 
@@ -205,7 +261,7 @@ class ConfirmedSolTxMetaCollector(SolTxMetaCollector):
         super().__init__(config, solana, tx_meta_dict, commitment=config.confirmed_commitment, is_finalized=False)
         self.debug(f'Confirmed commitment: {self._commitment}')
 
-    def iter_tx_meta(self, start_slot: int, stop_slot: int) -> Iterator[SolTxMetaInfo]:
+    def _iter_tx_meta_range(self, start_slot: int, stop_slot: int) -> Iterator[SolTxMetaInfo]:
         assert start_slot >= stop_slot
 
         sig_slot_list = list(self._iter_sig_slot(None, start_slot, stop_slot))
@@ -1,47 +1,77 @@
-import psycopg2.extensions
+import math
+import time
 
 from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from ..indexer.pg_common import encode, decode, dummy
 from ..indexer.base_db import BaseDB
 
 
 class SQLDict(MutableMapping, BaseDB):
-    """Serialize an object using pickle to a binary format accepted by SQLite."""
+    """
+    Serialize an object using pickle to a binary format accepted by SQLite.
+
+    cache_ttl_sec enables the in-memory cache of values:
+    - None or 0 - each access reads the table;
+    - math.inf - write-through cache, it is valid only for the single writer of the table;
+    - other values - a value read from the table is returned for cache_ttl_sec seconds.
+    """
 
-    def __init__(self, tablename='table'):
+    def __init__(self, tablename='table', cache_ttl_sec: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
         self.encode = encode
         self.decode = decode
         self.key_encode = dummy
         self.key_decode = dummy
         super().__init__(tablename, [])
-        self._conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        self._cache_ttl_sec = cache_ttl_sec
+        self._clock = clock
+        self._cache_dict: Dict[Any, Tuple[Any, float]] = {}
+
+    @property
+    def has_cache(self) -> bool:
+        return bool(self._cache_ttl_sec)
+
+    def _get_cached_value(self, key) -> Tuple[bool, Any]:
+        if not self.has_cache:
+            return False, None
+
+        cached_value = self._cache_dict.get(key, None)
+        if cached_value is None:
+            return False, None
+
+        value, value_time = cached_value
+        if (self._cache_ttl_sec != math.inf) and (self._clock() - value_time >= self._cache_ttl_sec):
+            return False, None
+        return True, value
 
     def __len__(self):
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'SELECT COUNT(*) FROM {self._table_name}')
             rows = cur.fetchone()[0]
             return rows if rows is not None else 0
 
     def iterkeys(self):
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'SELECT key FROM {self._table_name}')
             rows = cur.fetchall()
-            for row in rows:
-                yield self.key_decode(row[0])
+        for row in rows:
+            yield self.key_decode(row[0])
 
     def itervalues(self):
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'SELECT value FROM {self._table_name}')
             rows = cur.fetchall()
-            for row in rows:
-                yield self.decode(row[0])
+        for row in rows:
+            yield self.decode(row[0])
 
     def iteritems(self):
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'SELECT key, value FROM {self._table_name}')
             rows = cur.fetchall()
-            for row in rows:
-                yield self.key_decode(row[0]), self.decode(row[1])
+        for row in rows:
+            yield self.key_decode(row[0]), self.decode(row[1])
 
     def keys(self):
         return list(self.iterkeys())
@@ -53,24 +83,38 @@ class SQLDict(MutableMapping, BaseDB):
         return list(self.iteritems())
 
     def __contains__(self, key):
+        is_found, _ = self._get_cached_value(key)
+        if is_found:
+            return True
+
         bin_key = self.key_encode(key)
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'SELECT 1 FROM {self._table_name} WHERE key = %s', (bin_key,))
             return cur.fetchone() is not None
 
     def __getitem__(self, key):
+        is_found, value = self._get_cached_value(key)
+        if is_found:
+            return value
+
+        # the time before the request, the cached value can't be older than TTL
+        value_time = self._clock()
         bin_key = self.key_encode(key)
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'SELECT value FROM {self._table_name} WHERE key = %s', (bin_key,))
             item = cur.fetchone()
-            if item is None:
-                raise KeyError(key)
-            return self.decode(item[0])
+        if item is None:
+            raise KeyError(key)
+
+        value = self.decode(item[0])
+        if self.has_cache:
+            self._cache_dict[key] = (value, value_time)
+        return value
 
     def __setitem__(self, key, value):
         bin_key = self.key_encode(key)
         bin_value = self.encode(value)
-        with self._conn.cursor() as cur:
+        with self._cursor() as cur:
             cur.execute(f'''
                 INSERT INTO {self._table_name}
                     (key, value)
@@ -82,12 +126,15 @@ class SQLDict(MutableMapping, BaseDB):
                 ''',
                 (bin_key, bin_value)
             )
+        if self.has_cache:
+            self._cache_dict[key] = (value, self._clock())
 
     def __delitem__(self, key):
         bin_key = self.key_encode(key)
-        with self._conn.cursor() as cur:
-            if bin_key not in self:
-                raise KeyError(key)
+        self._cache_dict.pop(key, None)
+        if bin_key not in self:
+            raise KeyError(key)
+        with self._cursor() as cur:
             cur.execute(f'DELETE FROM {self._table_name} WHERE key = %s', (bin_key,))
 
     def __iter__(self):
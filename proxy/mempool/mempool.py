@@ -1,6 +1,6 @@
 import asyncio
 import time
-from typing import List, Tuple, Optional, Any, Dict, cast, Iterator
+from typing import Tuple, Optional, Any, Dict, cast, Iterator
 
 from logged_groups import logged_group, logging_context
 from neon_py.data import Result
@@ -34,7 +34,6 @@ class MemPool:
         self.info(f"Init mempool schedule with capacity: {capacity}")
         self._tx_schedule = MPTxSchedule(capacity)
         self._schedule_cond = asyncio.Condition()
-        self._processing_task_list: List[MPTask] = []
         self._is_active: bool = True
         self._executor = executor
         self._op_res_mng = op_res_mng
@@ -45,7 +44,6 @@ class MemPool:
         self._op_res_init_task_loop = MPInitOpResTaskLoop(executor, self._op_res_mng)
         self._free_alt_queue_task_loop = MPFreeALTQueueTaskLoop(executor, self._op_res_mng)
 
-        self._process_tx_result_task_loop = asyncio.get_event_loop().create_task(self._process_tx_result_loop())
         self._process_tx_schedule_task_loop = asyncio.get_event_loop().create_task(self._process_tx_schedule_loop())
 
     @property
@@ -121,7 +119,8 @@ class MemPool:
                 tx = MPTxExecRequest.clone(tx, resource, ElfParams().elf_param_dict)
 
                 mp_task = self._executor.submit_mp_request(tx)
-                self._processing_task_list.append(mp_task)
+                # the result is processed right after the executor responds, without polling
+                mp_task.aio_task.add_done_callback(lambda _: self._on_complete_task(mp_task))
                 return True
             except BaseException as exc:
                 self.error(f'Failed to enqueue to execute {tx.sig}.', exc_info=exc)
@@ -140,30 +139,20 @@ class MemPool:
                     if not self._enqueue_tx_request():
                         break
 
-    async def _process_tx_result_loop(self):
-        while True:
-            not_finished_task_list: List[MPTask] = []
-            for mp_task in self._processing_task_list:
-                with logging_context(req_id=mp_task.mp_request.req_id):
-                    if not self._complete_task(mp_task):
-                        not_finished_task_list.append(mp_task)
-            self._processing_task_list = not_finished_task_list
-
-            await asyncio.sleep(self.CHECK_TASK_TIMEOUT_SEC)
+    def _on_complete_task(self, mp_task: MPTask) -> None:
+        with logging_context(req_id=mp_task.mp_request.req_id):
+            self._complete_task(mp_task)
 
-    def _complete_task(self, mp_task: MPTask) -> bool:
+    def _complete_task(self, mp_task: MPTask) -> None:
         try:
-            if not mp_task.aio_task.done():
-                return False
-
             self._executor.release_executor(mp_task.executor_id)
 
             if mp_task.mp_request.type != MPRequestType.SendTransaction:
                 self.error(f"Got unexpected request: {mp_task.mp_request}")
-                return True  # skip task
+                return  # skip task
         except BaseException as exc:
             self.error('Exception on checking type of request.', exc_info=exc)
-            return True
+            return
 
         tx = cast(MPTxRequest, mp_task.mp_request)
         try:
@@ -171,13 +160,12 @@ class MemPool:
             if exc is not None:
                 self.error(f'Exception during processing tx {tx.sig} on executor.', exc_info=exc)
                 self._on_fail_tx(tx)
-                return True
+                return
 
             mp_result = mp_task.aio_task.result()
             self._process_mp_tx_result(tx, mp_result)
         except BaseException as exc:
             self.error(f'Exception on the result processing of tx {tx.sig}.', exc_info=exc)
-        return True
 
     def _process_mp_tx_result(self, tx: MPTxRequest, mp_result: Any):
         assert isinstance(mp_result, MPTxExecResult), f'Wrong type of tx result processing {tx.sig}: {mp_result}'
@@ -7,6 +7,7 @@ from typing import Optional, Any, cast
 from neon_py.network import PipePickableDataSrv, IPickableDataServerUser
 
 from ..common_neon.solana_interactor import SolInteractor
+from ..common_neon.solana_async_interactor import AsyncSolInteractor
 from ..common_neon.config import Config
 
 from ..mempool.mempool_api import MPRequestType, MPRequest, MPTxExecRequest, MPSenderTxCntRequest, MPOpResInitRequest
@@ -30,6 +31,7 @@ class MPExecutor(mp.Process, IPickableDataServerUser):
         self._event_loop: asyncio.BaseEventLoop
 
         self._solana: Optional[SolInteractor] = None
+        self._async_solana: Optional[AsyncSolInteractor] = None
         self._pickable_data_srv: Optional[PipePickableDataSrv] = None
 
         self._gas_price_task: Optional[MPExecutorGasPriceTask] = None
@@ -48,24 +50,28 @@ class MPExecutor(mp.Process, IPickableDataServerUser):
 
         self._pickable_data_srv = PipePickableDataSrv(user=self, srv_sock=self._srv_sock)
         self._solana = SolInteractor(self._config, self._config.solana_url)
+        self._solana.start_blockhash_provider()
+        # the account cache is shared, so accounts invalidated by sent transactions aren't read from the cache
+        self._async_solana = AsyncSolInteractor(self._config, self._config.solana_url, self._solana.account_cache)
 
-        self._gas_price_task = MPExecutorGasPriceTask(self._config, self._solana)
-        self._op_res_task = MPExecutorOpResTask(self._config, self._solana)
-        self._elf_params_task = MPExecutorElfParamsTask(self._config, self._solana)
-        self._state_tx_cnt_task = MPExecutorStateTxCntTask(self._config, self._solana)
-        self._exec_neon_tx_task = MPExecutorExecNeonTxTask(self._config, self._solana)
-        self._free_alt_task = MPExecutorFreeALTQueueTask(self._config, self._solana)
+        task_args = (self._config, self._solana, self._async_solana)
+        self._gas_price_task = MPExecutorGasPriceTask(*task_args)
+        self._op_res_task = MPExecutorOpResTask(*task_args)
+        self._elf_params_task = MPExecutorElfParamsTask(*task_args)
+        self._state_tx_cnt_task = MPExecutorStateTxCntTask(*task_args)
+        self._exec_neon_tx_task = MPExecutorExecNeonTxTask(*task_args)
+        self._free_alt_task = MPExecutorFreeALTQueueTask(*task_args)
 
     async def on_data_received(self, data: Any) -> Any:
         mp_req = cast(MPRequest, data)
         with logging_context(req_id=mp_req.req_id, exectr=self._id):
             try:
-                return self._handle_request(mp_req)
+                return await self._handle_request(mp_req)
             except BaseException as exc:
                 self.error('Exception during handle request', exc_info=exc)
         return None
 
-    def _handle_request(self, mp_req: MPRequest) -> Any:
+    async def _handle_request(self, mp_req: MPRequest) -> Any:
         if mp_req.type == MPRequestType.SendTransaction:
             mp_tx_req = cast(MPTxExecRequest, mp_req)
             return self._exec_neon_tx_task.execute_neon_tx(mp_tx_req)
@@ -75,13 +81,13 @@ class MPExecutor(mp.Process, IPickableDataServerUser):
             return self._elf_params_task.read_elf_param_dict()
         elif mp_req.type == MPRequestType.GetStateTxCnt:
             mp_state_req = cast(MPSenderTxCntRequest, mp_req)
-            return self._state_tx_cnt_task.read_state_tx_cnt(mp_state_req)
+            return await self._state_tx_cnt_task.read_state_tx_cnt(mp_state_req)
         elif mp_req.type == MPRequestType.InitOperatorResource:
             mp_op_res_req = cast(MPOpResInitRequest, mp_req)
             return self._op_res_task.init_op_res(mp_op_res_req)
         elif mp_req.type == MPRequestType.GetALTList:
             mp_get_req = cast(MPGetALTList, mp_req)
-            return self._free_alt_task.get_alt_list(mp_get_req)
+            return await self._free_alt_task.get_alt_list(mp_get_req)
         elif mp_req.type == MPRequestType.DeactivateALTList:
             mp_deactivate_req = cast(MPDeactivateALTListRequest, mp_req)
             return self._free_alt_task.deactivate_alt_list(mp_deactivate_req)
@@ -1,11 +1,17 @@
 from logged_groups import logged_group
 
+from typing import Optional
+
 from ..common_neon.config import Config
 from ..common_neon.solana_interactor import SolInteractor
+from ..common_neon.solana_async_interactor import AsyncSolInteractor
 
 
 @logged_group("neon.MemPool")
 class MPExecutorBaseTask:
-    def __init__(self, config: Config, solana: SolInteractor):
+    def __init__(self, config: Config, solana: SolInteractor, async_solana: Optional[AsyncSolInteractor] = None):
         self._config = config
         self._solana = solana
+        if async_solana is None:
+            async_solana = AsyncSolInteractor(config, config.solana_url, solana.account_cache)
+        self._async_solana = async_solana
@@ -1,3 +1,5 @@
+import asyncio
+
 from typing import List, Optional, Callable, cast
 
 from ..common_neon.neon_instruction import NeonIxBuilder
@@ -5,7 +7,7 @@ from ..common_neon.solana_transaction import SolAccount, SolPubKey, SolLegacyTx,
 from ..common_neon.solana_tx_list_sender import SolTxListSender
 from ..common_neon.constants import ADDRESS_LOOKUP_TABLE_ID
 from ..common_neon.layouts import ACCOUNT_LOOKUP_TABLE_LAYOUT
-from ..common_neon.solana_interactor import ALTAccountInfo
+from ..common_neon.solana_interactor import ALTAccountInfo, AccountInfo
 
 from ..mempool.mempool_api import MPGetALTList, MPALTInfo, MPDeactivateALTListRequest, MPCloseALTListRequest
 from ..mempool.mempool_api import MPALTListResult
@@ -24,45 +26,55 @@ class MPExecutorFreeALTQueueTask(MPExecutorBaseTask):
     def _get_block_height(self) -> int:
         return self._solana.get_block_height(commitment=self._config.finalized_commitment)
 
-    def get_alt_list(self, mp_req: MPGetALTList) -> MPALTListResult:
-        alt_info_list: List[MPALTInfo] = []
+    async def _get_operator_alt_list(self, operator_key: str) -> List[MPALTInfo]:
+        operator_account = SolAccount(bytes.fromhex(operator_key))
 
-        for operator_key in mp_req.operator_key_list:
-            operator_account = SolAccount(bytes.fromhex(operator_key))
+        account_info_list = await self._async_solana.get_program_account_info_list(
+            program=ADDRESS_LOOKUP_TABLE_ID,
+            offset=0,
+            length=ACCOUNT_LOOKUP_TABLE_LAYOUT.sizeof(),
+            data_offset=self._auth_offset,
+            data=bytes(operator_account.public_key())
+        )
 
-            account_info_list = self._solana.get_program_account_info_list(
-                program=ADDRESS_LOOKUP_TABLE_ID,
-                offset=0,
-                length=ACCOUNT_LOOKUP_TABLE_LAYOUT.sizeof(),
-                data_offset=self._auth_offset,
-                data=bytes(operator_account.public_key())
+        alt_info_list = await asyncio.gather(*[
+            self._get_alt_info(operator_key, account_info)
+            for account_info in account_info_list
+        ])
+        return [alt_info for alt_info in alt_info_list if alt_info is not None]
+
+    async def _get_alt_info(self, operator_key: str, account_info: AccountInfo) -> Optional[MPALTInfo]:
+        try:
+            alt_info = ALTAccountInfo.from_account_info(account_info)
+
+            block_height = await self._async_solana.get_block_height(
+                block_slot=(
+                    alt_info.last_extended_slot if alt_info.deactivation_slot is None else
+                    alt_info.deactivation_slot
+                ),
+                commitment=self._config.finalized_commitment
             )
 
-            for account_info in account_info_list:
-                try:
-                    alt_info = ALTAccountInfo.from_account_info(account_info)
-
-                    block_height = self._solana.get_block_height(
-                        block_slot=(
-                            alt_info.last_extended_slot if alt_info.deactivation_slot is None else
-                            alt_info.deactivation_slot
-                        ),
-                        commitment=self._config.finalized_commitment
-                    )
-
-                    mp_alt_info = MPALTInfo(
-                        last_extended_slot=alt_info.last_extended_slot,
-                        deactivation_slot=alt_info.deactivation_slot,
-                        block_height=block_height,
-                        table_account=str(account_info.address),
-                        operator_key=operator_key
-                    )
-
-                    alt_info_list.append(mp_alt_info)
-                except BaseException as exc:
-                    self.error('Cannot decode ALT.', exc_info=exc)
-
-        block_height = self._get_block_height()
+            return MPALTInfo(
+                last_extended_slot=alt_info.last_extended_slot,
+                deactivation_slot=alt_info.deactivation_slot,
+                block_height=block_height,
+                table_account=str(account_info.address),
+                operator_key=operator_key
+            )
+        except BaseException as exc:
+            self.error('Cannot decode ALT.', exc_info=exc)
+            return None
+
+    async def get_alt_list(self, mp_req: MPGetALTList) -> MPALTListResult:
+        # block heights of ALTs are requested in parallel
+        alt_info_list_list = await asyncio.gather(*[
+            self._get_operator_alt_list(operator_key)
+            for operator_key in mp_req.operator_key_list
+        ])
+        alt_info_list: List[MPALTInfo] = [alt_info for alt_list in alt_info_list_list for alt_info in alt_list]
+
+        block_height = await self._async_solana.get_block_height(commitment=self._config.finalized_commitment)
         return MPALTListResult(block_height=block_height, alt_info_list=alt_info_list)
 
     def _free_alt_list(self, alt_info_list: List[MPALTInfo], name: str,
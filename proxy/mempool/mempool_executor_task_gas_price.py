@@ -2,6 +2,7 @@ from typing import Optional
 
 from ..common_neon.gas_price_calculator import GasPriceCalculator
 from ..common_neon.solana_interactor import SolInteractor
+from ..common_neon.solana_async_interactor import AsyncSolInteractor
 from ..common_neon.config import Config
 
 from ..mempool.mempool_api import MPGasPriceResult
@@ -9,8 +10,8 @@ from ..mempool.mempool_executor_task_base import MPExecutorBaseTask
 
 
 class MPExecutorGasPriceTask(MPExecutorBaseTask):
-    def __init__(self, config: Config, solana: SolInteractor):
-        super().__init__(config, solana)
+    def __init__(self, config: Config, solana: SolInteractor, async_solana: Optional[AsyncSolInteractor] = None):
+        super().__init__(config, solana, async_solana)
         self._gas_price_calculator = GasPriceCalculator(config, SolInteractor(config, config.pyth_solana_url))
         self._update_gas_price_calculator()
 
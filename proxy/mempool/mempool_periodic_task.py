@@ -91,7 +91,7 @@ class MPPeriodicTaskLoop(Generic[MPPeriodicTaskRequest, MPPeriodicTaskResult], a
         self._try_to_submit_request()  # first request
         while True:
             if self._task is not None:
-                await asyncio.sleep(self._check_sleep_time)
+                await asyncio.wait([self._task.aio_task])
                 self._check_request_status()
             else:
                 await asyncio.sleep(self._sleep_time)
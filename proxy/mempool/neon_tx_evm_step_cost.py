@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import threading
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sha3 import keccak_256
+
+from ..common_neon.eth_proto import NeonTx
+
+
+class EvmStepCostEstimator:
+    """
+    Moving estimate of compute units per EVM step, keyed by (contract address, method selector).
+    Deployments are keyed by the hash of the init code, because they have neither the address nor the method.
+    Successful iterations update the exponential moving average,
+    an exceeded budget raises the estimate to the lower bound of the real cost.
+    """
+
+    _CostKey = Tuple[str, str]
+
+    # weight of a new sample in the moving average
+    _smoothing = 0.3
+
+    def __init__(self, max_size: int = 4096):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._cost_dict: OrderedDict[EvmStepCostEstimator._CostKey, float] = OrderedDict()
+
+    @staticmethod
+    def get_key(neon_tx: NeonTx) -> _CostKey:
+        if not neon_tx.toAddress:
+            return '', keccak_256(neon_tx.callData).hexdigest()
+        return neon_tx.toAddress.hex(), neon_tx.callData[:4].hex()
+
+    def __len__(self) -> int:
+        return len(self._cost_dict)
+
+    def get_cu_per_evm_step(self, key: _CostKey) -> Optional[float]:
+        with self._lock:
+            cu_per_evm_step = self._cost_dict.get(key, None)
+            if cu_per_evm_step is not None:
+                self._cost_dict.move_to_end(key)
+            return cu_per_evm_step
+
+    def _put(self, key: _CostKey, cu_per_evm_step: float) -> None:
+        self._cost_dict[key] = cu_per_evm_step
+        self._cost_dict.move_to_end(key)
+        while len(self._cost_dict) > self._max_size:
+            self._cost_dict.popitem(last=False)
+
+    def add_used_cu(self, key: _CostKey, evm_step_cnt: int, used_cu_cnt: int) -> None:
+        """Adds a sample from the receipt of the iteration, which executed all evm_step_cnt steps"""
+        if (evm_step_cnt <= 0) or (used_cu_cnt <= 0):
+            return
+
+        sample = used_cu_cnt / evm_step_cnt
+        with self._lock:
+            cu_per_evm_step = self._cost_dict.get(key, None)
+            if cu_per_evm_step is not None:
+                sample = cu_per_evm_step + self._smoothing * (sample - cu_per_evm_step)
+            self._put(key, sample)
+
+    def add_budget_exceeded(self, key: _CostKey, evm_step_cnt: int, cu_limit: int) -> None:
+        """evm_step_cnt steps didn't fit into cu_limit compute units"""
+        if evm_step_cnt <= 0:
+            return
+
+        lower_bound = cu_limit / evm_step_cnt
+        with self._lock:
+            self._put(key, max(self._cost_dict.get(key, 0.0), lower_bound))
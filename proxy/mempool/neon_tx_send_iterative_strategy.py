@@ -1,23 +1,27 @@
 from __future__ import annotations
 
-from typing import List, cast
+from typing import List, Optional, cast
 from logged_groups import logged_group
 from dataclasses import dataclass
 
 from ..common_neon.solana_transaction import SolTx, SolLegacyTx, SolWrappedTx, SolTxReceipt
 from ..common_neon.solana_tx_list_sender import SolTxSendState
 from ..common_neon.errors import NoMoreRetriesError
+from ..common_neon.elf_params import ElfParams
 from ..common_neon.utils import NeonTxResultInfo
 
 from ..mempool.neon_tx_send_base_strategy import BaseNeonTxStrategy
 from ..mempool.neon_tx_send_simple_strategy import SimpleNeonTxSender
 from ..mempool.neon_tx_send_strategy_base_stages import alt_strategy
+from ..mempool.neon_tx_evm_step_cost import EvmStepCostEstimator
 from ..mempool.neon_tx_sender_ctx import NeonTxSendCtx
 
 
 @dataclass
 class SolIterativeTx(SolWrappedTx):
     evm_step_cnt: int
+    # additional iterations (account resizes, completion) don't execute a known count of EVM steps
+    is_add_iter: bool = False
 
 
 class IterativeNeonTxSender(SimpleNeonTxSender):
@@ -33,7 +37,13 @@ class IterativeNeonTxSender(SimpleNeonTxSender):
             self._neon_tx_res.fill_result(status="0x0", gas_used='0x0', return_value='')
             self.debug(f'Got Neon tx cancel: {self._neon_tx_res}')
         else:
-            super()._decode_neon_tx_result(tx, tx_receipt)
+            tx_receipt_info = self._get_tx_receipt_info(tx, tx_receipt)
+            self._decode_neon_tx_result_from_receipt_info(tx_receipt_info)
+
+            # the last iteration can execute fewer steps than requested, it isn't used for the estimate
+            if (not self._neon_tx_res.is_valid()) and isinstance(tx, SolIterativeTx) and (not tx.is_add_iter):
+                used_cu_cnt = sum([ix.used_bpf_cycle_cnt for ix in tx_receipt_info.iter_sol_neon_ix()])
+                self._strategy.add_used_cu(tx.evm_step_cnt, used_cu_cnt)
 
     def _convert_state_to_tx_list(self, tx_status: SolTxSendState.Status,
                                   tx_state_list: List[SolTxSendState]) -> List[SolTx]:
@@ -73,21 +83,29 @@ class IterativeNeonTxSender(SimpleNeonTxSender):
         return [SolWrappedTx(name='CancelWithHash', tx=self._strategy.build_cancel_tx())]
 
     def _decrease_evm_step_cnt(self, tx_state_list: List[SolTxSendState]) -> List[SolTx]:
-        if not self._strategy.decrease_evm_step_cnt():
+        evm_step_cnt_list = [cast(SolIterativeTx, tx_state.tx).evm_step_cnt for tx_state in tx_state_list]
+        if not self._strategy.decrease_evm_step_cnt(min(evm_step_cnt_list)):
             raise NoMoreRetriesError()
 
-        total_evm_step_cnt = sum([cast(SolIterativeTx, tx_state.tx).evm_step_cnt for tx_state in tx_state_list])
-        return self._strategy.build_tx_list(total_evm_step_cnt, 0)
+        return self._strategy.build_tx_list(sum(evm_step_cnt_list), 0)
 
 
 @logged_group("neon.MemPool")
 class IterativeNeonTxStrategy(BaseNeonTxStrategy):
     name = 'TransactionStepFromInstruction'
 
+    # the estimate is shared by all transactions of the executor
+    _evm_step_cost = EvmStepCostEstimator()
+    # the part of the compute budget available for EVM steps, the rest is the reserve for the estimate error
+    _cu_limit_pct = 0.9
+    # other limits of the iteration (heap, time) aren't estimated
+    _max_evm_step_cnt_mult = 4
+
     def __init__(self, ctx: NeonTxSendCtx) -> None:
         super().__init__(ctx)
         self._uniq_idx = 0
         self._evm_step_cnt = self._start_evm_step_cnt
+        self._evm_step_cost_key = EvmStepCostEstimator.get_key(ctx.neon_tx)
 
     def _validate(self) -> bool:
         return (
@@ -98,15 +116,39 @@ class IterativeNeonTxStrategy(BaseNeonTxStrategy):
     def build_cancel_tx(self) -> SolLegacyTx:
         return self._build_cancel_tx()
 
-    def decrease_evm_step_cnt(self) -> bool:
+    def _get_cu_limit(self) -> int:
+        return self._bpf_cycle_cnt if self._bpf_cycle_cnt is not None else ElfParams().neon_compute_units
+
+    def _estimate_evm_step_cnt(self) -> Optional[int]:
+        """Returns the largest count of EVM steps, which fits into the compute budget"""
+        cu_per_evm_step = self._evm_step_cost.get_cu_per_evm_step(self._evm_step_cost_key)
+        if cu_per_evm_step is None:
+            return None
+
+        evm_step_cnt = int(self._get_cu_limit() * self._cu_limit_pct / cu_per_evm_step)
+        return max(min(evm_step_cnt, self._start_evm_step_cnt * self._max_evm_step_cnt_mult), 10)
+
+    def add_used_cu(self, evm_step_cnt: int, used_cu_cnt: int) -> None:
+        self._evm_step_cost.add_used_cu(self._evm_step_cost_key, evm_step_cnt, used_cu_cnt)
+
+    def decrease_evm_step_cnt(self, failed_evm_step_cnt: Optional[int] = None) -> bool:
         if self._evm_step_cnt == 10:
             return False
 
+        if failed_evm_step_cnt is None:
+            failed_evm_step_cnt = self._evm_step_cnt
+        self._evm_step_cost.add_budget_exceeded(self._evm_step_cost_key, failed_evm_step_cnt, self._get_cu_limit())
+
         prev_evm_step_cnt = self._evm_step_cnt
         if self._evm_step_cnt > 170:
             self._evm_step_cnt -= 150
         else:
             self._evm_step_cnt = 10
+
+        # the exceeded budget gives only the lower bound of the cost, so the estimate doesn't replace the decrease
+        estimated_evm_step_cnt = self._estimate_evm_step_cnt()
+        if estimated_evm_step_cnt is not None:
+            self._evm_step_cnt = min(self._evm_step_cnt, estimated_evm_step_cnt)
         self.debug(f'Decrease EVM steps from {prev_evm_step_cnt} to {self._evm_step_cnt}')
 
         if (self._evm_step_cnt < self._base_evm_step_cnt) and (self._bpf_cycle_cnt is None):
@@ -122,14 +164,14 @@ class IterativeNeonTxStrategy(BaseNeonTxStrategy):
         )
 
     def build_tx_list(self, total_evm_step_cnt: int, add_iter_cnt: int) -> List[SolTx]:
-        def build_tx(step_cnt: int):
-            return SolIterativeTx(name=self.name, tx=self._build_tx(), evm_step_cnt=step_cnt)
+        def build_tx(step_cnt: int, is_add_iter: bool = False):
+            return SolIterativeTx(name=self.name, tx=self._build_tx(), evm_step_cnt=step_cnt, is_add_iter=is_add_iter)
 
         tx_list: List[SolTx] = []
         save_evm_step_cnt = total_evm_step_cnt
 
         for _ in range(add_iter_cnt):
-            tx_list.append(build_tx(self._evm_step_cnt))
+            tx_list.append(build_tx(self._evm_step_cnt, True))
 
         while total_evm_step_cnt > 0:
             evm_step_cnt = self._evm_step_cnt if total_evm_step_cnt > self._evm_step_cnt else total_evm_step_cnt
@@ -143,6 +185,11 @@ class IterativeNeonTxStrategy(BaseNeonTxStrategy):
     def execute(self) -> NeonTxResultInfo:
         assert self.is_valid()
 
+        estimated_evm_step_cnt = self._estimate_evm_step_cnt()
+        if estimated_evm_step_cnt is not None:
+            self.debug(f'Estimated EVM steps {estimated_evm_step_cnt} instead of {self._evm_step_cnt}')
+            self._evm_step_cnt = estimated_evm_step_cnt
+
         emulated_step_cnt = max(self._ctx.emulated_evm_step_cnt, self._start_evm_step_cnt)
         tx_list = self.build_tx_list(emulated_step_cnt, self._ctx.neon_tx_exec_cfg.resize_iter_cnt)
         tx_sender = IterativeNeonTxSender(self, self._ctx.solana, self._ctx.signer)
@@ -34,10 +34,15 @@ class SimpleNeonTxSender(SolTxListSender):
     def _decode_neon_tx_result(self, tx: SolTx, tx_receipt: SolTxReceipt) -> None:
         if self._neon_tx_res.is_valid():
             return
+        self._decode_neon_tx_result_from_receipt_info(self._get_tx_receipt_info(tx, tx_receipt))
 
+    @staticmethod
+    def _get_tx_receipt_info(tx: SolTx, tx_receipt: SolTxReceipt) -> SolTxReceiptInfo:
         block_slot = tx_receipt['slot']
         tx_sig = SolTxSendState.decode_tx_sig(tx)
-        tx_receipt_info = SolTxReceiptInfo(SolTxMetaInfo(block_slot, tx_sig, tx_receipt))
+        return SolTxReceiptInfo(SolTxMetaInfo(block_slot, tx_sig, tx_receipt))
+
+    def _decode_neon_tx_result_from_receipt_info(self, tx_receipt_info: SolTxReceiptInfo) -> None:
         for sol_neon_ix in tx_receipt_info.iter_sol_neon_ix():
             if decode_neon_tx_result(sol_neon_ix.iter_log(), self._strategy.ctx.neon_sig, self._neon_tx_res):
                 self.debug(f'Got Neon tx result: {self._neon_tx_res}')
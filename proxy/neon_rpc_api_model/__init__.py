@@ -1 +1,2 @@
 from .neon_rpc_api_worker import NeonRpcApiWorker, NEON_PROXY_PKG_VERSION, NEON_PROXY_REVISION
+from .neon_subscription_feed import NeonSubscriptionFeed, NeonSubscriber, NeonLogFilter
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import threading
+
+from collections import OrderedDict
+from typing import Any, Tuple
+
+
+class FinalizedResponseCache:
+    """
+    LRU cache of RPC results keyed by (method, params...).
+    Only results of finalized blocks are put into the cache, they never change, so entries don't expire.
+    The cached results are shared between requests and must not be modified by callers.
+    """
+
+    _CacheKey = Tuple[Any, ...]
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._result_dict: OrderedDict[FinalizedResponseCache._CacheKey, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._result_dict)
+
+    def get(self, key: _CacheKey) -> Tuple[bool, Any]:
+        """Returns (is found, result)"""
+        with self._lock:
+            result = self._result_dict.get(key, self)
+            if result is self:
+                return False, None
+            self._result_dict.move_to_end(key)
+            return True, result
+
+    def put(self, key: _CacheKey, result: Any) -> None:
+        with self._lock:
+            self._result_dict[key] = result
+            self._result_dict.move_to_end(key)
+            while len(self._result_dict) > self._max_size:
+                self._result_dict.popitem(last=False)
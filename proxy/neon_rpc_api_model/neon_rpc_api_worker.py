@@ -4,7 +4,7 @@ import eth_utils
 import time
 import math
 
-from typing import Optional, Union, Dict, Any, List, cast
+from typing import Optional, Union, Dict, Any, List, Tuple, cast
 
 import sha3
 from logged_groups import logged_group, LogMng
@@ -16,6 +16,7 @@ from ..common_neon.errors import EthereumError, InvalidParamError
 from ..common_neon.estimate import GasEstimate
 from ..common_neon.eth_proto import NeonTx
 from ..common_neon.keys_storage import KeyStorage
+from ..common_neon.logs_bloom import EMPTY_LOGS_BLOOM
 from ..common_neon.solana_interactor import SolInteractor
 from ..common_neon.utils import JsonBytesEncoder
 from ..common_neon.utils import SolanaBlockInfo, NeonTxReceiptInfo, NeonTxInfo, NeonTxResultInfo
@@ -25,6 +26,7 @@ from ..common_neon.environment_utils import neon_cli
 from ..common_neon.transaction_validator import NeonTxValidator
 from ..indexer.indexer_db import IndexerDB
 from ..statistics_exporter.proxy_metrics_interface import StatisticsExporter
+from .finalized_response_cache import FinalizedResponseCache
 from ..mempool import MemPoolClient, MP_SERVICE_ADDR, MPTxSendResult, MPTxSendResultCode, MPGasPriceResult
 
 
@@ -41,13 +43,17 @@ class NeonRpcApiWorker:
         self._solana = SolInteractor(self._config, self._config.solana_url)
         self._db = IndexerDB()
         self._stat_exporter: Optional[StatisticsExporter] = None
-        self._mempool_client = MemPoolClient(MP_SERVICE_ADDR)
+        self._mempool_client = MemPoolClient(MP_SERVICE_ADDR, self._config.mempool_client_conn_cnt)
 
         self._gas_price_value: Optional[MPGasPriceResult] = None
         self._last_gas_price_time = 0
 
         self._last_elf_params_time = 0
 
+        self._response_cache: Optional[FinalizedResponseCache] = None
+        if self._config.finalized_response_cache_size > 0:
+            self._response_cache = FinalizedResponseCache(self._config.finalized_response_cache_size)
+
         with self.proxy_id_glob.get_lock():
             self.proxy_id = self.proxy_id_glob.value
             self.proxy_id_glob.value += 1
@@ -59,6 +65,15 @@ class NeonRpcApiWorker:
     def set_stat_exporter(self, stat_exporter: StatisticsExporter):
         self._stat_exporter = stat_exporter
 
+    def stat_commit_account_cache(self) -> None:
+        account_cache = self._solana.account_cache
+        if account_cache is None:
+            return
+
+        hit_cnt, miss_cnt = account_cache.pop_stat()
+        if hit_cnt + miss_cnt > 0:
+            self._stat_exporter.stat_commit_account_cache(hit_cnt, miss_cnt, account_cache.hit_ratio)
+
     @property
     def _gas_price(self) -> MPGasPriceResult:
         now = math.ceil(time.time())
@@ -136,6 +151,19 @@ class NeonRpcApiWorker:
             raise InvalidParamError(message=f'failed to parse block tag: {tag}')
         return block
 
+    def _get_cached_result(self, key: Tuple[Any, ...]) -> Tuple[bool, Any]:
+        if self._response_cache is None:
+            return False, None
+        return self._response_cache.get(key)
+
+    def _put_cached_result(self, key: Tuple[Any, ...], block_slot: Optional[int], result: Any) -> None:
+        """Results of confirmed blocks can be changed by a fork, so only results of finalized blocks are cached"""
+        if (self._response_cache is None) or (result is None) or (block_slot is None):
+            return
+        if block_slot > self._db.get_finalized_block_slot():
+            return
+        self._response_cache.put(key, result)
+
     @staticmethod
     def _normalize_tx_id(tag: str) -> str:
         if not isinstance(tag, str):
@@ -217,12 +245,14 @@ class NeonRpcApiWorker:
             return hex(0)
 
     def eth_getLogs(self, obj: Dict[str, Any]) -> List[Dict[str, Any]]:
-        def to_list(items):
-            if isinstance(items, str):
+        def to_list(items: Union[None, str, List[str]], name: str) -> Optional[List[str]]:
+            if items is None:
+                return None
+            elif isinstance(items, str):
                 return [items.lower()]
-            elif isinstance(items, list):
-                return list(set([item.lower() for item in items if isinstance(item, str)]))
-            return []
+            elif isinstance(items, list) and all(isinstance(item, str) for item in items):
+                return list(set([item.lower() for item in items])) if len(items) > 0 else None
+            raise InvalidParamError(message=f'invalid {name} filter')
 
         from_block = None
         to_block = None
@@ -235,13 +265,16 @@ class NeonRpcApiWorker:
         if 'toBlock' in obj and obj['toBlock'] not in ('latest', 'pending'):
             to_block = self._process_block_tag(obj['toBlock']).block_slot
         if 'address' in obj:
-            addresses = to_list(obj['address'])
-        if 'topics' in obj:
-            topics = to_list(obj['topics'])
+            addresses = to_list(obj['address'], 'address') or []
+        if obj.get('topics', None) is not None:
+            if not isinstance(obj['topics'], list):
+                raise InvalidParamError(message='invalid topics filter')
+            # topics are positional, None matches any topic at the position
+            topics = [to_list(topic, 'topic') for topic in obj['topics']]
         if 'blockHash' in obj:
             block_hash = obj['blockHash']
 
-        return self._db.get_logs(from_block, to_block, addresses, topics, block_hash)
+        return self._db.get_logs(from_block, to_block, addresses, topics, block_hash, self._config.max_log_result_cnt)
 
     def _get_block_by_slot(self, block: SolanaBlockInfo, full: bool, skip_transaction: bool) -> Optional[dict]:
         if block.is_empty():
@@ -265,11 +298,17 @@ class NeonRpcApiWorker:
             else:
                 sig_list.append(tx.neon_tx.sig)
 
-        result = {
+        result = self.get_block_header(block, gas_used)
+        result["transactions"] = sig_list
+        return result
+
+    @staticmethod
+    def get_block_header(block: SolanaBlockInfo, gas_used: int) -> Dict[str, Any]:
+        return {
             "difficulty": '0x20000',
             "totalDifficulty": '0x20000',
             "extraData": "0x" + '0' * 63 + '1',
-            "logsBloom": '0x' + '0' * 512,
+            "logsBloom": block.logs_bloom or EMPTY_LOGS_BLOOM,
             "gasLimit": '0xec8563e271ac',
             "transactionsRoot": '0x' + '0' * 63 + '1',
             "receiptsRoot": '0x' + '0' * 63 + '1',
@@ -289,9 +328,7 @@ class NeonRpcApiWorker:
             "number": hex(block.block_slot),
             "parentHash": block.parent_block_hash,
             "timestamp": hex(block.block_time),
-            "transactions": sig_list,
         }
-        return result
 
     def eth_getStorageAt(self, account: str, position, tag: Union[int, str]) -> str:
         """
@@ -330,10 +367,16 @@ class NeonRpcApiWorker:
             block_hash - Hash of a block.
             full - If true it returns the full transaction objects, if false only the hashes of the transactions.
         """
+        key = ('eth_getBlockByHash', str(block_hash).strip().lower(), bool(full))
+        is_cached, ret = self._get_cached_result(key)
+        if is_cached:
+            return ret
+
         block = self._get_block_by_hash(block_hash)
         if block.is_empty():
             return None
         ret = self._get_block_by_slot(block, full, False)
+        self._put_cached_result(key, block.block_slot, ret)
         return ret
 
     def eth_getBlockByNumber(self, tag: Union[int, str], full: bool) -> Optional[dict]:
@@ -342,7 +385,17 @@ class NeonRpcApiWorker:
             full - If true it returns the full transaction objects, if false only the hashes of the transactions.
         """
         block = self._process_block_tag(tag)
-        ret = self._get_block_by_slot(block, full, tag in ('latest', 'pending'))
+        is_latest = tag in ('latest', 'pending')
+        if is_latest:
+            return self._get_block_by_slot(block, full, True)
+
+        key = ('eth_getBlockByNumber', block.block_slot, bool(full))
+        is_cached, ret = self._get_cached_result(key)
+        if is_cached:
+            return ret
+
+        ret = self._get_block_by_slot(block, full, False)
+        self._put_cached_result(key, block.block_slot, ret)
         return ret
 
     def eth_call(self, obj: dict, tag: Union[int, str]) -> str:
@@ -418,7 +471,7 @@ class NeonRpcApiWorker:
             "contractAddress": tx.neon_tx.contract,
             "logs": tx.neon_tx_res.log_list,
             "status": tx.neon_tx_res.status,
-            "logsBloom": "0x"+'0'*512
+            "logsBloom": tx.neon_tx_res.logs_bloom or EMPTY_LOGS_BLOOM
         }
 
         return result
@@ -426,11 +479,18 @@ class NeonRpcApiWorker:
     def eth_getTransactionReceipt(self, neon_tx_sig: str) -> Optional[dict]:
         neon_sig = self._normalize_tx_id(neon_tx_sig)
 
+        key = ('eth_getTransactionReceipt', neon_sig)
+        is_cached, ret = self._get_cached_result(key)
+        if is_cached:
+            return ret
+
         tx = self._db.get_tx_by_neon_sig(neon_sig)
         if not tx:
             self.debug("Not found receipt")
             return None
-        return self._get_transaction_receipt(tx)
+        ret = self._get_transaction_receipt(tx)
+        self._put_cached_result(key, tx.neon_tx_res.block_slot, ret)
+        return ret
 
     @staticmethod
     def _get_transaction(tx: NeonTxReceiptInfo) -> dict:
@@ -468,6 +528,11 @@ class NeonRpcApiWorker:
     def eth_getTransactionByHash(self, neon_tx_sig: str) -> Optional[dict]:
         neon_sig = self._normalize_tx_id(neon_tx_sig)
 
+        key = ('eth_getTransactionByHash', neon_sig)
+        is_cached, ret = self._get_cached_result(key)
+        if is_cached:
+            return ret
+
         neon_tx_receipt: NeonTxReceiptInfo = self._db.get_tx_by_neon_sig(neon_sig)
         if neon_tx_receipt is None:
             req_id = LogMng.get_logging_context().get("req_id")
@@ -476,7 +541,9 @@ class NeonRpcApiWorker:
                 self.debug("Not found receipt")
                 return None
             neon_tx_receipt = NeonTxReceiptInfo(NeonTxInfo.from_neon_tx(neon_tx), NeonTxResultInfo())
-        return self._get_transaction(neon_tx_receipt)
+        ret = self._get_transaction(neon_tx_receipt)
+        self._put_cached_result(key, neon_tx_receipt.neon_tx_res.block_slot, ret)
+        return ret
 
     def eth_getCode(self, account: str, tag: Union[str, int]) -> str:
         self._validate_block_tag(tag)
@@ -517,6 +584,7 @@ class NeonRpcApiWorker:
             )
 
             if result.code in (MPTxSendResultCode.Success, MPTxSendResultCode.AlreadyKnown):
+                self._invalidate_neon_tx_account_list(neon_tx)
                 self._stat_tx_success()
                 return neon_sig
             elif result.code == MPTxSendResultCode.Underprice:
@@ -534,6 +602,12 @@ class NeonRpcApiWorker:
             self._stat_tx_failed()
             raise
 
+    def _invalidate_neon_tx_account_list(self, neon_tx: NeonTx) -> None:
+        account_list = ['0x' + neon_tx.sender()]
+        if neon_tx.toAddress:
+            account_list.append('0x' + neon_tx.toAddress.hex())
+        self._solana.invalidate_neon_account_info_list(account_list)
+
     def _stat_tx_begin(self):
         self._stat_exporter.stat_commit_tx_begin()
 
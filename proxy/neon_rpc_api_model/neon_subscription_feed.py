@@ -0,0 +1,270 @@
+import secrets
+import socket
+import threading
+import time
+
+from typing import Any, Dict, List, Optional, Set, Union
+
+from logged_groups import logged_group
+
+from ..common_neon.errors import InvalidParamError
+from ..common_neon.utils import SolanaBlockInfo, json_dumps_bytes
+from ..core.connection import TcpConnection
+from ..http.websocket import WebsocketFrame, websocketOpcodes
+from ..indexer.indexer_db import IndexerDB
+
+from .neon_rpc_api_worker import NeonRpcApiWorker
+
+
+class NeonLogFilter:
+    """The filter of the logs subscription: {"address": ..., "topics": [...]} from eth_subscribe"""
+    def __init__(self, param: Optional[Dict[str, Any]]):
+        if param is None:
+            param = {}
+        elif not isinstance(param, dict):
+            raise InvalidParamError(message='invalid logs filter')
+
+        self._address_set: Optional[Set[str]] = self._to_set(param.get('address'), 'address')
+
+        topic_list = param.get('topics', [])
+        if topic_list is None:
+            topic_list = []
+        elif not isinstance(topic_list, list):
+            raise InvalidParamError(message='invalid topics filter')
+        self._topic_list: List[Optional[Set[str]]] = [self._to_set(topic, 'topic') for topic in topic_list]
+
+    @staticmethod
+    def _to_set(value: Union[None, str, List[str]], name: str) -> Optional[Set[str]]:
+        if value is None:
+            return None
+        elif isinstance(value, str):
+            return {value.lower()}
+        elif isinstance(value, list) and all(isinstance(item, str) for item in value):
+            return {item.lower() for item in value} if len(value) > 0 else None
+        raise InvalidParamError(message=f'invalid {name} filter')
+
+    def match(self, log: Dict[str, Any]) -> bool:
+        if (self._address_set is not None) and (log['address'].lower() not in self._address_set):
+            return False
+
+        log_topic_list = log['topics']
+        if len(self._topic_list) > len(log_topic_list):
+            return False
+
+        for topic_set, topic in zip(self._topic_list, log_topic_list):
+            if (topic_set is not None) and (topic.lower() not in topic_set):
+                return False
+        return True
+
+
+@logged_group("neon.Proxy")
+class NeonSubscriber:
+    """Subscriptions of one websocket connection.
+
+    Notifications are queued directly into the client buffer, which is flushed by the connection handler.
+    The handler waits for the client socket, so the feed thread wakes it up through wakeup_socket.
+    The client should read them in time: if the buffer reaches queue_size, the subscriber closes the connection.
+    """
+
+    # policy violation
+    _close_status_code = 1008
+
+    def __init__(self, client: TcpConnection, queue_size: int):
+        self._client = client
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        # None is for newHeads, NeonLogFilter is for logs
+        self._sub_dict: Dict[str, Optional[NeonLogFilter]] = {}
+        # new subscriptions don't receive notifications until the response with the subscription id is sent
+        self._pending_sub_dict: Dict[str, Optional[NeonLogFilter]] = {}
+        self._is_closed = False
+        self._has_queued_data = False
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_reader.setblocking(False)
+        self._wakeup_writer.setblocking(False)
+
+    @property
+    def is_closed(self) -> bool:
+        return self._is_closed
+
+    @property
+    def wakeup_socket(self) -> socket.socket:
+        return self._wakeup_reader
+
+    def read_wakeup(self) -> None:
+        try:
+            while self._wakeup_reader.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _wakeup(self) -> None:
+        try:
+            self._wakeup_writer.send(b'\x00')
+        except BlockingIOError:
+            # the socket buffer is full, so the handler is already woken up
+            pass
+
+    def has_head_subscription(self) -> bool:
+        return any(log_filter is None for log_filter in self._sub_dict.values())
+
+    def subscribe(self, kind: str, param: Optional[Dict[str, Any]] = None) -> str:
+        if kind == 'newHeads':
+            log_filter = None
+        elif kind == 'logs':
+            log_filter = NeonLogFilter(param)
+        else:
+            raise InvalidParamError(message=f'unsupported subscription {kind}')
+
+        sub_id = '0x' + secrets.token_hex(16)
+        with self._lock:
+            self._pending_sub_dict[sub_id] = log_filter
+        return sub_id
+
+    def unsubscribe(self, sub_id: str) -> bool:
+        with self._lock:
+            return (self._sub_dict.pop(sub_id, False) is not False) or \
+                   (self._pending_sub_dict.pop(sub_id, False) is not False)
+
+    def send_response(self, response_body: bytes) -> None:
+        with self._lock:
+            self._send(response_body)
+            self._sub_dict.update(self._pending_sub_dict)
+            self._pending_sub_dict.clear()
+
+    def _send(self, data: bytes) -> None:
+        self._client.queue(memoryview(WebsocketFrame.text(data)))
+        self._has_queued_data = True
+
+    def notify(self, head: Optional[Dict[str, Any]], log_list: List[Dict[str, Any]]) -> bool:
+        """Sends the block head and its logs to matched subscriptions, returns False if the connection is closed"""
+        with self._lock:
+            if self._is_closed:
+                return False
+
+            self._has_queued_data = False
+            is_open = self._notify_list(head, log_list)
+            if self._has_queued_data:
+                self._wakeup()
+        return is_open
+
+    def _notify_list(self, head: Optional[Dict[str, Any]], log_list: List[Dict[str, Any]]) -> bool:
+        if head is not None:
+            for sub_id, log_filter in self._sub_dict.items():
+                if (log_filter is None) and (not self._notify(sub_id, head)):
+                    return False
+
+        for log in log_list:
+            for sub_id, log_filter in self._sub_dict.items():
+                if (log_filter is not None) and log_filter.match(log) and (not self._notify(sub_id, log)):
+                    return False
+        return True
+
+    def _notify(self, sub_id: str, result: Dict[str, Any]) -> bool:
+        if len(self._client.buffer) >= self._queue_size:
+            self.warning(f'Close the websocket connection: {len(self._client.buffer)} notifications are not sent')
+            self._close()
+            return False
+
+        self._send(json_dumps_bytes({
+            'jsonrpc': '2.0',
+            'method': 'eth_subscription',
+            'params': {'subscription': sub_id, 'result': result}
+        }))
+        return True
+
+    def _close(self) -> None:
+        self._is_closed = True
+        self._sub_dict.clear()
+        self._pending_sub_dict.clear()
+
+        frame = WebsocketFrame()
+        frame.fin = True
+        frame.opcode = websocketOpcodes.CONNECTION_CLOSE
+        frame.data = self._close_status_code.to_bytes(2, 'big')
+        self._client.queue(memoryview(frame.build()))
+        self._has_queued_data = True
+
+    def close(self) -> None:
+        with self._lock:
+            self._is_closed = True
+            self._sub_dict.clear()
+            self._pending_sub_dict.clear()
+            self._wakeup_reader.close()
+            self._wakeup_writer.close()
+
+
+@logged_group("neon.Proxy")
+class NeonSubscriptionFeed:
+    """Tails solana_blocks and neon_transaction_logs and sends new blocks and logs to subscribers.
+
+    Only active blocks up to the latest block slot of the Indexer are sent,
+    the blocks deactivated by a fork after sending aren't revoked.
+    """
+
+    _poll_sec = 0.4
+    # a subscriber is interested in the recent blocks, it isn't a replacement of eth_getLogs
+    _max_block_cnt = 64
+
+    def __init__(self, db: Optional[IndexerDB] = None):
+        self._db = db
+        self._lock = threading.Lock()
+        self._subscriber_set: Set[NeonSubscriber] = set()
+        self._last_block_slot = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def add_subscriber(self, subscriber: NeonSubscriber) -> None:
+        with self._lock:
+            self._subscriber_set.add(subscriber)
+            if self._thread is not None:
+                return
+
+            # subscribers receive blocks after the moment of subscription
+            if self._db is None:
+                self._db = IndexerDB()
+            self._last_block_slot = self._db.get_latest_block_slot()
+            self._thread = threading.Thread(target=self._run, name='neon-subscription-feed', daemon=True)
+            self._thread.start()
+
+    def remove_subscriber(self, subscriber: NeonSubscriber) -> None:
+        with self._lock:
+            self._subscriber_set.discard(subscriber)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.poll()
+            except BaseException as exc:
+                self.error('Failed to send notifications to subscribers', exc_info=exc)
+            time.sleep(self._poll_sec)
+
+    def poll(self) -> None:
+        latest_block_slot = self._db.get_latest_block_slot()
+        if latest_block_slot <= self._last_block_slot:
+            return
+
+        with self._lock:
+            subscriber_list = list(self._subscriber_set)
+
+        from_block_slot = max(self._last_block_slot, latest_block_slot - self._max_block_cnt)
+        self._last_block_slot = latest_block_slot
+        if len(subscriber_list) == 0:
+            return
+
+        block_list = self._db.get_block_list_by_slot_range(from_block_slot, latest_block_slot)
+        log_dict: Dict[str, List[Dict[str, Any]]] = {}
+        for log in self._db.get_log_list_by_slot_range(from_block_slot, latest_block_slot):
+            log_dict.setdefault(log['blockNumber'], []).append(log)
+
+        has_head_subscription = any(subscriber.has_head_subscription() for subscriber in subscriber_list)
+        for block in block_list:
+            head = self._get_block_header(block) if has_head_subscription else None
+            log_list = log_dict.get(hex(block.block_slot), [])
+            for subscriber in subscriber_list:
+                if not subscriber.notify(head, log_list):
+                    self.remove_subscriber(subscriber)
+
+    def _get_block_header(self, block: SolanaBlockInfo) -> Dict[str, Any]:
+        tx_list = self._db.get_tx_list_by_block_slot(block.block_slot)
+        gas_used = sum(int(tx.neon_tx_res.gas_used, 16) for tx in tx_list)
+        return NeonRpcApiWorker.get_block_header(block, gas_used)
@@ -9,27 +9,34 @@
     :license: BSD, see LICENSE for more details.
 """
 import json
+import socket
 import threading
 import time
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Any, Optional, Union
 
-from logged_groups import logged_group, logging_context
+from logged_groups import logged_group, logging_context, LogMng
 from neon_py.utils import gen_unique_id
 
 from ..http.codes import httpStatusCodes
 from ..http.parser import HttpParser
-from ..http.websocket import WebsocketFrame
+from ..http.websocket import WebsocketFrame, websocketOpcodes
 from ..http.server import HttpWebServerBasePlugin, httpProtocolTypes
 
+from ..common.types import HasFileno
 from ..common.utils import build_http_response
 from ..common_neon.solana_tx_error_parser import SolTxError
 from ..common_neon.errors import EthereumError
+from ..common_neon.config import Config
+from ..common_neon.utils import json_dumps_bytes, str_preview
 
-from ..neon_rpc_api_model import NeonRpcApiWorker
+from ..neon_rpc_api_model import NeonRpcApiWorker, NeonSubscriptionFeed, NeonSubscriber
 from ..statistics_exporter.prometheus_proxy_exporter import PrometheusExporter
 
 modelInstanceLock = threading.Lock()
 modelInstance = None
+batchExecutorInstance = None
+subscriptionFeedInstance = None
 
 
 @logged_group("neon.Proxy")
@@ -44,9 +51,11 @@ class NeonRpcApiPlugin(HttpWebServerBasePlugin):
 
     def __init__(self, *args):
         HttpWebServerBasePlugin.__init__(self, *args)
+        self._config = Config()
         self._stat_exporter = PrometheusExporter()
         self.model = NeonRpcApiPlugin.getModel()
         self.model.set_stat_exporter(self._stat_exporter)
+        self._subscriber: Optional[NeonSubscriber] = None
 
     @classmethod
     def getModel(cls):
@@ -57,8 +66,29 @@ class NeonRpcApiPlugin(HttpWebServerBasePlugin):
                 modelInstance = NeonRpcApiWorker()
             return modelInstance
 
+    @classmethod
+    def getBatchExecutor(cls) -> ThreadPoolExecutor:
+        global modelInstanceLock
+        global batchExecutorInstance
+        with modelInstanceLock:
+            if batchExecutorInstance is None:
+                batchExecutorInstance = ThreadPoolExecutor(
+                    max_workers=Config().rpc_batch_thread_cnt, thread_name_prefix='rpc-batch'
+                )
+            return batchExecutorInstance
+
+    @classmethod
+    def getSubscriptionFeed(cls) -> NeonSubscriptionFeed:
+        global modelInstanceLock
+        global subscriptionFeedInstance
+        with modelInstanceLock:
+            if subscriptionFeedInstance is None:
+                subscriptionFeedInstance = NeonSubscriptionFeed()
+            return subscriptionFeedInstance
+
     def routes(self) -> List[Tuple[int, str]]:
         return [
+            (httpProtocolTypes.WEBSOCKET, NeonRpcApiPlugin.SOLANA_PROXY_LOCATION),
             (httpProtocolTypes.HTTP, NeonRpcApiPlugin.SOLANA_PROXY_LOCATION),
             (httpProtocolTypes.HTTPS, NeonRpcApiPlugin.SOLANA_PROXY_LOCATION)
         ]
@@ -70,7 +100,14 @@ class NeonRpcApiPlugin(HttpWebServerBasePlugin):
         }
 
         try:
-            if (not hasattr(self.model, request['method'])) or (not self.model.is_allowed_api(request["method"])):
+            if request['method'] in ('eth_subscribe', 'eth_unsubscribe'):
+                if self._subscriber is None:
+                    response['error'] = {'code': -32601, 'message': 'notifications are supported only via websocket'}
+                elif request['method'] == 'eth_subscribe':
+                    response['result'] = self._subscriber.subscribe(*request.get('params', []))
+                else:
+                    response['result'] = self._subscriber.unsubscribe(*request.get('params', []))
+            elif (not hasattr(self.model, request['method'])) or (not self.model.is_allowed_api(request["method"])):
                 response['error'] = {'code': -32601, 'message': f'method {request["method"]} is not supported'}
             else:
                 method = getattr(self.model, request['method'])
@@ -88,6 +125,23 @@ class NeonRpcApiPlugin(HttpWebServerBasePlugin):
 
         return response
 
+    def _process_batch_item(self, req_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        with logging_context(req_id=req_id):
+            return self.process_request(request)
+
+    def process_batch_request(self, request_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if len(request_list) == 0:
+            raise Exception("Empty batch request")
+        elif len(request_list) > self._config.max_rpc_batch_size:
+            raise Exception(f"Too big batch request: {len(request_list)} > {self._config.max_rpc_batch_size}")
+        elif len(request_list) == 1:
+            return [self.process_request(request_list[0])]
+
+        # map() returns results in the order of requests, errors are isolated inside process_request()
+        req_id = LogMng.get_logging_context().get("req_id")
+        executor = self.getBatchExecutor()
+        return list(executor.map(lambda r: self._process_batch_item(req_id, r), request_list))
+
     def handle_request(self, request: HttpParser) -> None:
         req_id = gen_unique_id()
         with logging_context(req_id=req_id):
@@ -109,14 +163,10 @@ class NeonRpcApiPlugin(HttpWebServerBasePlugin):
 
         try:
             self.info('handle_request <<< %s 0x%x %s', threading.get_ident(), id(self.model),
-                      request.body.decode('utf8'))
+                      str_preview(request.body))
             request = json.loads(request.body)
             if isinstance(request, list):
-                response = []
-                if len(request) == 0:
-                    raise Exception("Empty batch request")
-                for r in request:
-                    response.append(self.process_request(r))
+                response = self.process_batch_request(request)
             elif isinstance(request, dict):
                 response = self.process_request(request)
             else:
@@ -125,6 +175,7 @@ class NeonRpcApiPlugin(HttpWebServerBasePlugin):
             # traceback.print_exc()
             response = {'jsonrpc': '2.0', 'error': {'code': -32000, 'message': str(err)}}
 
+        response_body = json_dumps_bytes(response)
         resp_time_ms = (time.time() - start_time)*1000  # convert this into milliseconds
 
         method = '---'
@@ -134,24 +185,91 @@ class NeonRpcApiPlugin(HttpWebServerBasePlugin):
         self.info('handle_request >>> %s 0x%0x %s %s resp_time_ms= %s',
                   threading.get_ident(),
                   id(self.model),
-                  json.dumps(response),
+                  str_preview(response_body),
                   method,
                   resp_time_ms)
 
         self.client.queue(memoryview(build_http_response(
-            httpStatusCodes.OK, body=json.dumps(response).encode('utf8'),
+            httpStatusCodes.OK, body=response_body,
             headers={
                 b'Content-Type': b'application/json',
                 b'Access-Control-Allow-Origin': b'*',
             })))
 
         self._stat_exporter.stat_commit_request_and_timeout(method, resp_time_ms)
+        self.model.stat_commit_account_cache()
 
     def on_websocket_open(self) -> None:
-        pass
+        self._subscriber = NeonSubscriber(self.client, self._config.ws_subscription_queue_size)
+        self.getSubscriptionFeed().add_subscriber(self._subscriber)
 
     def on_websocket_message(self, frame: WebsocketFrame) -> None:
-        pass
+        if frame.opcode == websocketOpcodes.PING:
+            pong = WebsocketFrame()
+            pong.fin = True
+            pong.opcode = websocketOpcodes.PONG
+            pong.data = frame.data
+            pong.payload_length = len(frame.data)
+            self.client.queue(memoryview(pong.build()))
+            return
+        elif frame.opcode not in (websocketOpcodes.TEXT_FRAME, websocketOpcodes.BINARY_FRAME):
+            return
+
+        req_id = gen_unique_id()
+        with logging_context(req_id=req_id):
+            self.handle_websocket_message_impl(frame.data)
+            self.info("Websocket request processed")
+
+    def handle_websocket_message_impl(self, data: bytes) -> None:
+        start_time = time.time()
+        request = None
+
+        try:
+            self.info('handle_websocket_message <<< %s 0x%x %s', threading.get_ident(), id(self.model),
+                      str_preview(data))
+            request = json.loads(data)
+            if isinstance(request, list):
+                response = self.process_batch_request(request)
+            elif isinstance(request, dict):
+                response = self.process_request(request)
+            else:
+                raise Exception("Invalid request")
+        except Exception as err:
+            response = {'jsonrpc': '2.0', 'error': {'code': -32000, 'message': str(err)}}
+
+        response_body = json_dumps_bytes(response)
+        resp_time_ms = (time.time() - start_time)*1000  # convert this into milliseconds
+
+        method = '---'
+        if isinstance(request, dict):
+            method = request.get('method', '---')
+
+        self.info('handle_websocket_message >>> %s 0x%0x %s %s resp_time_ms= %s',
+                  threading.get_ident(),
+                  id(self.model),
+                  str_preview(response_body),
+                  method,
+                  resp_time_ms)
+
+        # new subscriptions are activated after sending of the response
+        self._subscriber.send_response(response_body)
+
+        self._stat_exporter.stat_commit_request_and_timeout(method, resp_time_ms)
 
     def on_websocket_close(self) -> None:
-        pass
+        if self._subscriber is None:
+            return
+        self.getSubscriptionFeed().remove_subscriber(self._subscriber)
+        self._subscriber.close()
+        self._subscriber = None
+
+    def get_descriptors(self) -> Tuple[List[socket.socket], List[socket.socket]]:
+        # notifications are queued by the feed thread, it wakes up the handler to send them
+        if self._subscriber is None:
+            return [], []
+        return [self._subscriber.wakeup_socket], []
+
+    def read_from_descriptors(self, r: List[Union[int, HasFileno]]) -> bool:
+        if (self._subscriber is not None) and (self._subscriber.wakeup_socket in r):
+            self._subscriber.read_wakeup()
+        return False
@@ -109,3 +109,6 @@ class IndexerStatistics(StatisticsExporter):
 
     def stat_commit_gas_parameters(self, *args):
         pass
+
+    def stat_commit_account_cache(self, *args):
+        pass
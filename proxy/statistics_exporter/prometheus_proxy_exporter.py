@@ -71,3 +71,11 @@ class PrometheusExporter(StatisticsExporter):
     def stat_commit_solana_rpc_health(self, *args):
         pass
 
+    def stat_commit_account_cache(self, hit_cnt: int, miss_cnt: int, hit_ratio: float):
+        from .prometheus_proxy_metrics import (
+            ACCOUNT_CACHE_HIT, ACCOUNT_CACHE_MISS, ACCOUNT_CACHE_HIT_RATIO
+        )
+        ACCOUNT_CACHE_HIT.inc(hit_cnt)
+        ACCOUNT_CACHE_MISS.inc(miss_cnt)
+        ACCOUNT_CACHE_HIT_RATIO.set(hit_ratio)
+
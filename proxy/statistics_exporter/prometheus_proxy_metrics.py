@@ -43,3 +43,6 @@ OPERATOR_FEE = Gauge(
     'operator_fee', 'Operator Fee',
     registry=registry,
 )
+ACCOUNT_CACHE_HIT = Counter('account_cache_hit_count', 'Count Of Solana Account Cache Hits', registry=registry)
+ACCOUNT_CACHE_MISS = Counter('account_cache_miss_count', 'Count Of Solana Account Cache Misses', registry=registry)
+ACCOUNT_CACHE_HIT_RATIO = Gauge('account_cache_hit_ratio', 'Solana Account Cache Hit Ratio', registry=registry)
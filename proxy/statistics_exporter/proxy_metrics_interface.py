@@ -56,3 +56,7 @@ class StatisticsExporter(ABC):
     @abstractmethod
     def stat_commit_solana_rpc_health(self, status: bool):
         """Solana Node status"""
+
+    @abstractmethod
+    def stat_commit_account_cache(self, hit_cnt: int, miss_cnt: int, hit_ratio: float):
+        """Hits and misses of Solana account cache"""
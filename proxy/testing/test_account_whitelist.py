@@ -1,11 +1,15 @@
+import threading
 import unittest
+from typing import List
 from proxy.common_neon.solana_interactor import SolInteractor
-from proxy.common_neon.account_whitelist import AccountWhitelist
+from proxy.common_neon.account_whitelist import AccountWhitelist, AccountPermissionCache
+from proxy.common_neon.elf_params import ElfParams
+from proxy.common_neon.solana_transaction import SolPubKey
 from proxy.common_neon.solana_transaction import SolAccount
 from proxy.common_neon.config import Config
 from solana.rpc.api import Client as SolanaClient
 from solana.rpc.commitment import Commitment
-from unittest.mock import Mock, MagicMock, patch, call
+from unittest.mock import Mock, MagicMock, PropertyMock, patch, call
 
 
 Confirmed = Commitment('confirmed')
@@ -44,7 +48,7 @@ class TestAccountWhitelist(unittest.TestCase):
         self.testee.allowance_token.mint_to.reset_mock()
         self.testee.denial_token.get_token_account_address.reset_mock()
         self.testee.denial_token.mint_to.reset_mock()
-        self.testee.account_cache = {}
+        self.testee.account_cache.clear()
 
     @patch.object(SolInteractor, 'get_token_account_balance_list')
     def test_grant_permissions_negative_difference(self, mock_get_token_account_balance_list):
@@ -144,3 +148,105 @@ class TestAccountWhitelist(unittest.TestCase):
         mock_get_current_time.assert_has_calls([call()] * 3)
         self.testee.allowance_token.get_token_account_address.assert_has_calls([call(ether_address)] * 2)
         self.testee.denial_token.get_token_account_address.assert_has_calls([call(ether_address)] * 2)
+
+
+class FakeSolInteractor:
+    def __init__(self):
+        self.read_cnt = 0
+        self._lock = threading.Lock()
+
+    def get_token_account_balance_list(self, token_list: List[SolPubKey]) -> List[int]:
+        with self._lock:
+            self.read_cnt += 1
+        return [100, 50]
+
+
+@patch.object(ElfParams.__wrapped__, 'allowance_token_addr', new_callable=PropertyMock,
+              return_value=str(SolAccount().public_key()))
+@patch.object(ElfParams.__wrapped__, 'denial_token_addr', new_callable=PropertyMock,
+              return_value=str(SolAccount().public_key()))
+class TestAccountPermissionCache(unittest.TestCase):
+    sender_list = [f'{idx:040x}' for idx in range(1, 11)]
+
+    def setUp(self) -> None:
+        self.config = FakeConfig()
+        self.solana = FakeSolInteractor()
+        AccountWhitelist(self.config, self.solana).account_cache.clear()
+
+    def _validate(self, validation_cnt: int) -> None:
+        for idx in range(validation_cnt):
+            # NeonTxValidator creates a new whitelist for each tx
+            w = AccountWhitelist(self.config, self.solana)
+            self.assertTrue(w.has_client_permission(self.sender_list[idx % len(self.sender_list)]))
+
+    def test_cache_is_shared_between_validations(self, *_):
+        self._validate(1000)
+        self.assertEqual(self.solana.read_cnt, len(self.sender_list))
+
+    def test_cache_is_shared_between_threads(self, *_):
+        thread_list = [threading.Thread(target=self._validate, args=(100,)) for _ in range(10)]
+        for thread in thread_list:
+            thread.start()
+        for thread in thread_list:
+            thread.join()
+        # a few threads can miss the cache for the same sender at the start
+        self.assertLess(self.solana.read_cnt, len(self.sender_list) * len(thread_list) + 1)
+        self.assertGreaterEqual(self.solana.read_cnt, len(self.sender_list))
+
+        read_cnt = self.solana.read_cnt
+        self._validate(1000)
+        self.assertEqual(self.solana.read_cnt, read_cnt)
+
+    @patch.object(AccountWhitelist, 'get_current_time')
+    def test_cache_expires(self, mock_get_current_time, *_):
+        update_int = self.config.account_permission_update_int
+        mock_get_current_time.side_effect = [100] * 10 + [100 + update_int - 1] * 10 + [100 + update_int] * 10
+        self._validate(30)
+        self.assertEqual(self.solana.read_cnt, len(self.sender_list) * 2)
+
+    def test_injected_cache(self, *_):
+        account_cache = AccountPermissionCache()
+        for _ in range(2):
+            w = AccountWhitelist(self.config, self.solana, account_cache)
+            self.assertTrue(w.has_client_permission(self.sender_list[0]))
+        self.assertEqual(self.solana.read_cnt, 1)
+        self.assertIsNotNone(account_cache.get(self.sender_list[0]))
+        self.assertIsNone(AccountWhitelist(self.config, self.solana).account_cache.get(self.sender_list[0]))
+
+    def test_size_limit(self, *_):
+        account_cache = AccountPermissionCache()
+        account_cache._max_size = 4
+        update_int = self.config.account_permission_update_int
+
+        # all items are fresh, the oldest ones are evicted
+        for idx, sender in enumerate(self.sender_list):
+            account_cache.set(sender, 100 + idx, idx, update_int)
+            self.assertLessEqual(len(account_cache._item_dict), 4)
+        self.assertEqual(list(account_cache._item_dict.keys()), self.sender_list[-4:])
+
+        # an update moves the item to the end
+        account_cache.set(self.sender_list[-4], 110, 0, update_int)
+        self.assertEqual(list(account_cache._item_dict.keys()), self.sender_list[-3:] + self.sender_list[-4:-3])
+
+        # expired items are evicted before the size limit is reached
+        account_cache.set(self.sender_list[0], 109 + update_int, 0, update_int)
+        self.assertEqual(list(account_cache._item_dict.keys()), self.sender_list[-4:-3] + self.sender_list[:1])
+
+    def test_out_of_order_updates(self, *_):
+        account_cache = AccountPermissionCache()
+        # the timestamp is taken before the read from Solana, so a concurrent validation can finish later
+        account_cache.set(self.sender_list[0], 100, 0, 10)
+        account_cache.set(self.sender_list[1], 95, 0, 10)
+        account_cache.set(self.sender_list[2], 104, 0, 10)
+        self.assertEqual(list(account_cache._item_dict.keys()), self.sender_list[:3])
+
+        # only expired items are evicted, the eviction stops on the first fresh one
+        account_cache.set(self.sender_list[3], 106, 0, 10)
+        self.assertEqual(list(account_cache._item_dict.keys()), self.sender_list[:4])
+        account_cache.set(self.sender_list[4], 111, 0, 10)
+        self.assertEqual(list(account_cache._item_dict.keys()), self.sender_list[2:5])
+
+    def test_zero_update_interval(self, *_):
+        account_cache = AccountPermissionCache()
+        account_cache.set(self.sender_list[0], 100, 0, 0)
+        self.assertEqual(len(account_cache._item_dict), 0)
@@ -0,0 +1,131 @@
+import time
+import unittest
+
+from typing import Any, Dict, List
+
+from logged_groups import logged_group
+
+from ..indexer.base_db import BaseDB
+from ..indexer.neon_tx_logs_db import NeonTxLogsDB
+from ..indexer.solana_tx_costs_db import SolTxCostsDB
+
+
+@logged_group("neon.TestCases")
+class TestBaseDBInsertBatch(unittest.TestCase):
+    # the test rows are placed far from the real slots and removed after each test
+    start_block_slot = 10 ** 15
+
+    def setUp(self) -> None:
+        self.db_list: List[BaseDB] = [NeonTxLogsDB(), SolTxCostsDB()]
+        self.log_column_list = self.db_list[0]._column_list
+        self._clear()
+
+    def tearDown(self) -> None:
+        self._clear()
+
+    def _clear(self) -> None:
+        for db in self.db_list:
+            with db._cursor() as cursor:
+                cursor.execute(f'DELETE FROM {db._table_name} WHERE block_slot >= %s', (self.start_block_slot,))
+
+    def _insert(self, db: BaseDB, value_list_list: List[List[Any]], insert_by_copy: bool) -> None:
+        db._insert_by_copy = insert_by_copy
+        with db.conn() as conn:
+            with conn.cursor() as cursor:
+                db._insert_batch(cursor, value_list_list)
+
+    def _select(self, db: BaseDB) -> List[tuple]:
+        with db._cursor() as cursor:
+            cursor.execute(f'''
+                SELECT {','.join(db._column_list)}
+                  FROM {db._table_name}
+                 WHERE block_slot >= %s
+              ORDER BY {','.join(db._column_list[:4])}
+            ''', (self.start_block_slot,))
+            return [
+                tuple(bytes(v) if isinstance(v, memoryview) else v for v in row)
+                for row in cursor.fetchall()
+            ]
+
+    def _new_log_value_list(self, idx: int, topic: bytes) -> List[Any]:
+        value_dict: Dict[str, Any] = {
+            'block_slot': self.start_block_slot + idx // 10,
+            'tx_idx': idx % 10,
+            'tx_log_idx': idx,
+            'log_idx': idx,
+            'address': idx.to_bytes(20, 'big'),
+            'log_data': b'\xab' * (idx % 100),
+            'tx_hash': idx.to_bytes(32, 'big'),
+            'topic0': topic,
+            'topic1': idx.to_bytes(32, 'big') if idx % 3 else None,
+            'topic2': None,
+            'topic3': None,
+        }
+        return [value_dict[column] for column in self.log_column_list]
+
+    def test_copy_and_values_store_same_rows(self):
+        db = NeonTxLogsDB()
+        tricky_topic_list = [b'', b'a,b', b'a"b', b'line\nbreak', b'\\N', b'tab\there', b"quote's"]
+        value_list_list = [
+            self._new_log_value_list(idx, tricky_topic_list[idx % len(tricky_topic_list)])
+            for idx in range(100)
+        ]
+
+        cost_db = SolTxCostsDB()
+        tricky_str_list = ['', 'a,b', 'a"b', 'line\nbreak', '\\N', 'tab\there', "quote's"]
+        cost_value_list_list = [
+            [f'sig-{idx}', self.start_block_slot + idx, tricky_str_list[idx % len(tricky_str_list)], idx]
+            for idx in range(100)
+        ]
+
+        copy_row_list_list = []
+        for table_db, table_value_list_list in ((db, value_list_list), (cost_db, cost_value_list_list)):
+            self.db_list = [table_db]
+            self._insert(table_db, table_value_list_list, insert_by_copy=False)
+            values_row_list = self._select(table_db)
+            self._clear()
+            self._insert(table_db, table_value_list_list, insert_by_copy=True)
+            copy_row_list = self._select(table_db)
+
+            self.assertEqual(len(copy_row_list), len(table_value_list_list))
+            self.assertEqual(copy_row_list, values_row_list)
+            copy_row_list_list.append(copy_row_list)
+        self.db_list = [db, cost_db]
+
+        topic1_idx = db._column_list.index('topic1')
+        for row, value_list in zip(sorted(copy_row_list_list[0], key=lambda r: r[2]), value_list_list):
+            self.assertEqual(row[topic1_idx], value_list[topic1_idx])
+
+    def test_copy_skips_conflicts(self):
+        db = SolTxCostsDB()
+        value_list_list = [
+            [f'sig-{idx}', self.start_block_slot + idx, f'operator-{idx % 3}', idx * 5000]
+            for idx in range(10)
+        ]
+        self._insert(db, value_list_list[:5], insert_by_copy=False)
+        # duplicates with the existing rows and inside the batch are ignored
+        self._insert(db, value_list_list + value_list_list[7:], insert_by_copy=True)
+        self.assertEqual(self._select(db), [tuple(value_list) for value_list in value_list_list])
+
+        # the temporary table doesn't keep rows between batches
+        self._insert(db, value_list_list[:1], insert_by_copy=True)
+        self.assertEqual(len(self._select(db)), len(value_list_list))
+
+    def test_rows_per_second(self):
+        db = NeonTxLogsDB()
+        row_cnt, batch_size = 20000, 2000
+        value_list_list = [self._new_log_value_list(idx, idx.to_bytes(32, 'big')) for idx in range(row_cnt)]
+
+        row_per_sec_dict: Dict[str, float] = {}
+        for name, insert_by_copy in (('execute_values', False), ('copy', True)):
+            self._clear()
+            start_time = time.monotonic()
+            for idx in range(0, row_cnt, batch_size):
+                self._insert(db, value_list_list[idx:idx + batch_size], insert_by_copy)
+            row_per_sec_dict[name] = row_cnt / (time.monotonic() - start_time)
+            self.info(f'{name}: {row_per_sec_dict[name]:.0f} rows per second')
+            self.assertEqual(len(self._select(db)), row_cnt)
+
+
+if __name__ == '__main__':
+    unittest.main()
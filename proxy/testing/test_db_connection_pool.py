@@ -0,0 +1,181 @@
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, Set
+
+import psycopg2
+
+from logged_groups import logged_group
+
+from ..indexer.base_db import BaseDB, DBConnectionPool
+from ..indexer.neon_txs_db import NeonTxsDB
+from ..indexer.solana_blocks_db import SolBlocksDB
+from ..indexer.solana_signatures_db import SolSigsDB
+from ..indexer.sql_dict import SQLDict
+
+
+class _RemoteDBCursor(psycopg2.extensions.cursor):
+    # in deployments Postgres runs on a separate host, a local server answers in microseconds
+    rtt_sec = 0.001
+
+    def execute(self, query, vars=None):
+        time.sleep(self.rtt_sec)
+        return super().execute(query, vars)
+
+
+class _RemoteDBConnectionPool(DBConnectionPool):
+    @contextmanager
+    def borrow_conn(self) -> Iterator[BaseDB.Connection]:
+        with super().borrow_conn() as conn:
+            conn.cursor_factory = _RemoteDBCursor
+            yield conn
+
+
+@logged_group("neon.TestCases")
+class TestDBConnectionPool(unittest.TestCase):
+    # the test rows are placed far from the real slots and removed after each test
+    start_block_slot = 10 ** 15
+    tx_cnt = 50
+
+    def setUp(self) -> None:
+        self.blocks_db = SolBlocksDB()
+        self.txs_db = NeonTxsDB()
+        self._clear()
+
+    def tearDown(self) -> None:
+        self._clear()
+
+    def _clear(self) -> None:
+        for db in (self.blocks_db, self.txs_db):
+            with db._cursor() as cursor:
+                cursor.execute(f'DELETE FROM {db._table_name} WHERE block_slot >= %s', (self.start_block_slot,))
+
+    @staticmethod
+    def _get_backend_pid(db: BaseDB) -> int:
+        with db._cursor() as cursor:
+            cursor.execute('SELECT pg_backend_pid()')
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def _neon_sig(idx: int) -> str:
+        return f'0x{idx:064x}'
+
+    def _add_tx_list(self) -> None:
+        value_list_list = []
+        for idx in range(self.tx_cnt):
+            value_dict = {column: '0x0' for column in self.txs_db._column_list}
+            value_dict.update({
+                'neon_sig': self._neon_sig(idx),
+                'sol_sig': f'sig{idx}',
+                'sol_ix_idx': 0,
+                'sol_ix_inner_idx': 0,
+                'block_slot': self.start_block_slot,
+                'tx_idx': idx,
+                'logs': [],
+                'logs_bloom': None
+            })
+            value_list_list.append([
+                self.txs_db._encode_value(column, value_dict[column]) for column in self.txs_db._column_list
+            ])
+
+        with self.blocks_db.conn() as conn:
+            with conn.cursor() as cursor:
+                self.blocks_db._insert_batch(cursor, [[
+                    self.start_block_slot, self.start_block_slot.to_bytes(32, 'big'),
+                    1, self.start_block_slot - 1, False, True, None
+                ]])
+                self.txs_db._insert_batch(cursor, value_list_list)
+
+    def test_db_classes_share_connections(self):
+        self.assertIs(self.txs_db._conn_pool, SQLDict(tablename='constants')._conn_pool)
+
+        # sequential operations of different DB classes reuse the same connection
+        db_list = [self.blocks_db, self.txs_db, SolSigsDB(), SQLDict(tablename='constants')]
+        pid_set = {self._get_backend_pid(db) for db in db_list for _ in range(3)}
+        self.assertEqual(len(pid_set), 1)
+
+        self.assertTrue(self.txs_db.is_connected())
+
+    def test_wait_for_free_connection(self):
+        pool = DBConnectionPool(2, 2)
+        pid_set: Set[int] = set()
+        active_cnt, max_active_cnt = 0, 0
+        lock = threading.Lock()
+
+        def _borrow(_: int) -> None:
+            nonlocal active_cnt, max_active_cnt
+            with pool.borrow_conn() as conn:
+                with lock:
+                    active_cnt += 1
+                    max_active_cnt = max(max_active_cnt, active_cnt)
+                with conn.cursor() as cursor:
+                    cursor.execute('SELECT pg_backend_pid(), pg_sleep(0.02)')
+                    pid = cursor.fetchone()[0]
+                with lock:
+                    active_cnt -= 1
+                    pid_set.add(pid)
+
+        # psycopg2 pool raises PoolError on exhaustion, the pool waits instead
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(_borrow, range(16)))
+
+        self.assertEqual(max_active_cnt, 2)
+        self.assertLessEqual(len(pid_set), 2)
+        pool.close()
+
+    def test_broken_connection_is_replaced(self):
+        pool = DBConnectionPool(1, 1)
+        with pool.borrow_conn() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                pid = cursor.fetchone()[0]
+
+        with self.assertRaises(psycopg2.OperationalError):
+            with pool.borrow_conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('SELECT pg_terminate_backend(pg_backend_pid())')
+
+        with pool.borrow_conn() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                self.assertNotEqual(cursor.fetchone()[0], pid)
+        pool.close()
+
+    def _get_receipts(self, db: NeonTxsDB, thread_cnt: int, request_cnt: int) -> float:
+        def _get_receipt(idx: int) -> None:
+            self.assertIsNotNone(db.get_tx_by_neon_sig(self._neon_sig(idx % self.tx_cnt)))
+
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(thread_cnt) as executor:
+            list(executor.map(_get_receipt, range(request_cnt)))
+        return time.monotonic() - start_time
+
+    def test_benchmark_concurrent_receipts(self):
+        self._add_tx_list()
+        thread_cnt, request_cnt = 8, 400
+
+        # the previous model: each DB object has one connection, which serializes all requests
+        single_db = NeonTxsDB()
+        single_db._conn_pool = _RemoteDBConnectionPool(1, 1)
+        self._get_receipts(single_db, thread_cnt, thread_cnt)
+        single_time = self._get_receipts(single_db, thread_cnt, request_cnt)
+
+        pool_db = NeonTxsDB()
+        pool_db._conn_pool = _RemoteDBConnectionPool(4, 4)
+        self._get_receipts(pool_db, thread_cnt, thread_cnt)
+        pool_time = self._get_receipts(pool_db, thread_cnt, request_cnt)
+
+        self.info(
+            f'{request_cnt} eth_getTransactionReceipt DB requests in {thread_cnt} threads '
+            f'with {_RemoteDBCursor.rtt_sec * 1000:.1f} ms RTT: '
+            f'one connection {single_time * 1000:.1f} ms, pool of 4 connections {pool_time * 1000:.1f} ms'
+        )
+        single_db._conn_pool.close()
+        pool_db._conn_pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from logged_groups import logged_group
+
+from ..common_neon.emulator_pool import EmulatorPool, EmulatorWorker, EmulatorWorkerError, get_emulator_pool
+from ..common_neon.environment_data import SOLANA_URL
+from ..common_neon.environment_utils import CliBase, neon_cli
+
+
+FAKE_EMULATOR_SRC = '''
+import json
+import os
+import sys
+import time
+
+CANNED_RESULT = {"exit_status": "succeed", "result": "00", "steps_executed": 1, "used_gas": 21000}
+
+
+def emulate(args):
+    global_args = []
+    while args[0].startswith("-"):
+        arg_len = 2 if args[0] == "--url" else 1
+        global_args, args = global_args + args[:arg_len], args[arg_len:]
+
+    cmd = args[0]
+    if cmd == "emulate":
+        return 0, json.dumps(dict(CANNED_RESULT, pid=os.getpid(), args=args[1:], global_args=global_args)), ""
+    elif cmd == "fail":
+        return 245, "", "NeonCli Error (245): too many steps"
+    elif cmd == "sleep":
+        time.sleep(float(args[1]))
+        return 0, "{}", ""
+    elif cmd == "crash":
+        sys.exit(1)
+    return 1, "", "unknown command"
+
+
+if sys.argv[1:2] == ["--worker"]:
+    for line in sys.stdin:
+        request = json.loads(line)
+        exit_code, stdout, stderr = emulate(request["args"])
+        response = {"id": request["id"], "exit_code": exit_code, "stdout": stdout, "stderr": stderr}
+        sys.stdout.write(json.dumps(response) + "\\n")
+        sys.stdout.flush()
+else:
+    exit_code, stdout, stderr = emulate(sys.argv[1:])
+    sys.stdout.write(stdout)
+    sys.stderr.write(stderr)
+    sys.exit(exit_code)
+'''
+
+
+@logged_group("neon.TestCases")
+class TestEmulatorPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.script = tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False)
+        cls.script.write(FAKE_EMULATOR_SRC)
+        cls.script.close()
+        cls.worker_cmd = [sys.executable, cls.script.name, '--worker']
+        cls.spawn_cmd = [sys.executable, cls.script.name]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        os.unlink(cls.script.name)
+
+    def test_canned_result(self):
+        pool = EmulatorPool(self.worker_cmd, 2)
+        try:
+            result = json.loads(pool.call('emulate', 'sender', 'contract', 'data', '0x0', timeout=5))
+            self.assertEqual(result['exit_status'], 'succeed')
+            self.assertEqual(result['args'], ['sender', 'contract', 'data', '0x0'])
+        finally:
+            pool.stop()
+
+    def test_worker_is_reused(self):
+        pool = EmulatorPool(self.worker_cmd, 1)
+        try:
+            pid_set = {json.loads(pool.call('emulate', timeout=5))['pid'] for _ in range(10)}
+            self.assertEqual(len(pid_set), 1)
+        finally:
+            pool.stop()
+
+    def test_error_exit_code(self):
+        pool = EmulatorPool(self.worker_cmd, 1)
+        try:
+            with self.assertRaises(subprocess.CalledProcessError) as ctx:
+                pool.call('fail', timeout=5)
+            self.assertEqual(ctx.exception.returncode, 245)
+            self.assertIn('NeonCli Error (245)', ctx.exception.stderr)
+
+            # the worker survives the error
+            self.assertEqual(json.loads(pool.call('emulate', timeout=5))['exit_status'], 'succeed')
+        finally:
+            pool.stop()
+
+    def test_restart_after_crash(self):
+        pool = EmulatorPool(self.worker_cmd, 1)
+        try:
+            first_pid = json.loads(pool.call('emulate', timeout=5))['pid']
+            with self.assertRaises(EmulatorWorkerError):
+                pool.call('crash', timeout=5)
+
+            second_pid = json.loads(pool.call('emulate', timeout=5))['pid']
+            self.assertNotEqual(first_pid, second_pid)
+        finally:
+            pool.stop()
+
+    def test_restart_after_died_between_requests(self):
+        pool = EmulatorPool(self.worker_cmd, 1)
+        try:
+            first_pid = json.loads(pool.call('emulate', timeout=5))['pid']
+            os.kill(first_pid, 9)
+            time.sleep(0.1)
+
+            second_pid = json.loads(pool.call('emulate', timeout=5))['pid']
+            self.assertNotEqual(first_pid, second_pid)
+        finally:
+            pool.stop()
+
+    def test_timeout(self):
+        worker = EmulatorWorker(self.worker_cmd)
+        try:
+            with self.assertRaises(subprocess.TimeoutExpired) as ctx:
+                worker.call(['sleep', '2'], timeout=0.2)
+            self.assertEqual(ctx.exception.timeout, 0.2)
+            self.assertFalse(worker.is_alive())
+
+            self.assertEqual(json.loads(worker.call(['emulate'], timeout=5))['exit_status'], 'succeed')
+        finally:
+            worker.stop()
+
+    def test_neon_cli_sends_global_args(self):
+        with patch('proxy.common_neon.environment_utils.EMULATOR_WORKER_CMD', ' '.join(self.worker_cmd)), \
+             patch('proxy.common_neon.environment_utils.EMULATOR_POOL_SIZE', 1):
+            try:
+                result = json.loads(neon_cli().emulate('sender', 'contract'))
+            finally:
+                get_emulator_pool(self.worker_cmd, 1).stop()
+
+        self.assertEqual(result['args'], ['sender', 'contract'])
+        self.assertEqual(result['global_args'][:3], ['--commitment=recent', '--url', SOLANA_URL])
+        self.assertTrue(result['global_args'][3].startswith('--evm_loader='))
+        self.assertTrue(result['global_args'][4].startswith('--loglevel='))
+
+    def test_concurrent_calls(self):
+        pool = EmulatorPool(self.worker_cmd, 4)
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                result_list = list(executor.map(
+                    lambda i: json.loads(pool.call('emulate', str(i), timeout=5)), range(100)
+                ))
+            self.assertEqual([r['args'] for r in result_list], [[str(i)] for i in range(100)])
+            self.assertLessEqual(len({r['pid'] for r in result_list}), 4)
+        finally:
+            pool.stop()
+
+    def test_benchmark_pool_vs_spawn(self):
+        call_cnt = 50
+        cli = CliBase()
+        cli.debug = lambda *args, **kwargs: None
+
+        start_time = time.monotonic()
+        for _ in range(call_cnt):
+            cli.run_cli(self.spawn_cmd + ['emulate'], timeout=5, universal_newlines=True)
+        spawn_rps = call_cnt / (time.monotonic() - start_time)
+
+        pool = EmulatorPool(self.worker_cmd, 1)
+        try:
+            pool.call('emulate', timeout=5)  # warm up
+            start_time = time.monotonic()
+            for _ in range(call_cnt):
+                pool.call('emulate', timeout=5)
+            pool_rps = call_cnt / (time.monotonic() - start_time)
+        finally:
+            pool.stop()
+
+        self.info(f'Emulator requests per second: spawn-per-call {spawn_rps:.1f}, pool {pool_rps:.1f}')
+
+
+if __name__ == '__main__':
+    unittest.main()
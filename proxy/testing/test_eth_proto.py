@@ -0,0 +1,93 @@
+import pickle
+import time
+import unittest
+
+from unittest.mock import patch
+
+import rlp
+
+from eth_keys import keys
+from logged_groups import logged_group
+from sha3 import keccak_256
+
+from ..common_neon.eth_proto import NeonTx
+
+
+class UncachedNeonTx(NeonTx):
+    """The previous implementation without the cache, it is used as a reference"""
+    def hash_unsigned(self) -> bytes:
+        return keccak_256(self._unsigned_msg()).digest()
+
+    def sender(self) -> str:
+        return self._sender().hex()
+
+    def hash_signed(self) -> bytes:
+        return keccak_256(rlp.encode((self.nonce, self.gasPrice, self.gasLimit,
+                                      self.toAddress, self.value, self.callData,
+                                      self.v, self.r, self.s))).digest()
+
+
+@logged_group("neon.TestCases")
+class TestNeonTxCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.pk = keys.PrivateKey(bytes.fromhex('886d5b4ce9465473701bf394b1b0b217548c57576436864fcbc1f554033a0680'))
+        cls.raw_tx_list = [cls._sign_tx(cls.pk, nonce) for nonce in range(100)]
+
+    @staticmethod
+    def _sign_tx(pk: keys.PrivateKey, nonce: int, chain_id: int = 111) -> bytes:
+        unsigned_tx = NeonTx(nonce, 10 ** 9, 21000, b'\x11' * 20, 1, b'', chain_id * 2 + 35, 0, 0)
+        sig = pk.sign_msg_hash(unsigned_tx.hash_unsigned())
+        signed_tx = NeonTx(nonce, 10 ** 9, 21000, b'\x11' * 20, 1, b'', sig.v + chain_id * 2 + 35, sig.r, sig.s)
+        return rlp.encode(signed_tx)
+
+    def test_sender_is_recovered_once(self):
+        tx = NeonTx.fromString(self.raw_tx_list[0])
+        recover_func = keys.Signature.recover_public_key_from_msg_hash
+        with patch.object(keys.Signature, 'recover_public_key_from_msg_hash', autospec=True,
+                          side_effect=recover_func) as recover_mock:
+            for _ in range(5):
+                self.assertEqual(tx.sender(), self.pk.public_key.to_canonical_address().hex())
+            tx.contract()
+            tx.hash_signed()
+            self.assertEqual(recover_mock.call_count, 1)
+
+            # the cached values are transferred with the object to MemPool
+            pickle.loads(pickle.dumps(tx)).sender()
+            self.assertEqual(recover_mock.call_count, 1)
+
+            # a change of the field creates a new object with the own cache
+            new_tx = tx.copy(nonce=tx.nonce + 1)
+            self.assertNotEqual(new_tx.hash_signed(), tx.hash_signed())
+            self.assertNotEqual(new_tx.hash_unsigned(), tx.hash_unsigned())
+            self.assertNotEqual(new_tx.sender(), tx.sender())
+            self.assertEqual(recover_mock.call_count, 2)
+
+    def test_hash_signed(self):
+        tx = NeonTx.fromString(self.raw_tx_list[1])
+        self.assertEqual(tx.hash_signed(), keccak_256(self.raw_tx_list[1]).digest())
+        self.assertIs(tx.hash_signed(), tx.hash_signed())
+
+    def test_benchmark_sender_and_hash(self):
+        # the validator, the mempool, the executor and the logging
+        call_cnt = 5
+
+        time_dict = {}
+        for tx_type in (UncachedNeonTx, NeonTx):
+            start_time = time.monotonic()
+            for raw_tx in self.raw_tx_list:
+                tx = rlp.decode(raw_tx, tx_type)
+                for _ in range(call_cnt):
+                    tx.sender()
+                    tx.hash_signed()
+            time_dict[tx_type] = time.monotonic() - start_time
+        no_cache_time, cache_time = time_dict[UncachedNeonTx], time_dict[NeonTx]
+
+        self.info(
+            f'{len(self.raw_tx_list)} txs with {call_cnt} calls of sender() and hash_signed(): '
+            f'without cache {no_cache_time * 1000:.3f} ms, with cache {cache_time * 1000:.3f} ms'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+import base64
+import unittest
+
+from typing import Dict, List, Tuple
+
+import base58
+
+from logged_groups import logged_group
+
+from ..common_neon.config import Config
+from ..common_neon.elf_params import ElfParams
+from ..common_neon.environment_data import EVM_LOADER_ID
+from ..common_neon.solana_interactor import SolSendResult
+from ..common_neon.solana_transaction import SolBlockhash
+from ..mempool.neon_tx_evm_step_cost import EvmStepCostEstimator
+from ..mempool.neon_tx_send_iterative_strategy import IterativeNeonTxStrategy, SolIterativeTx
+
+
+class FakeTx:
+    def __init__(self, idx: int):
+        self.recent_blockhash = None
+        self._idx = idx
+
+    def sign(self, signer) -> None:
+        pass
+
+    def signature(self) -> bytes:
+        return self._idx.to_bytes(64, 'big')
+
+
+class FakeNeonTx:
+    toAddress = bytes.fromhex('ab' * 20)
+    callData = bytes.fromhex('a9059cbb') + bytes(64)
+
+
+class FakeNeonTxExecCfg:
+    resize_iter_cnt = 0
+
+
+class SampleListEstimator(EvmStepCostEstimator):
+    def __init__(self):
+        super().__init__()
+        self.sample_list: List[Tuple[int, int]] = []
+
+    def add_used_cu(self, key, evm_step_cnt: int, used_cu_cnt: int) -> None:
+        self.sample_list.append((evm_step_cnt, used_cu_cnt))
+        super().add_used_cu(key, evm_step_cnt, used_cu_cnt)
+
+
+class FakeCtx:
+    def __init__(self, solana, evm_step_cnt: int):
+        self.config = Config()
+        self.solana = solana
+        self.signer = None
+        self.neon_tx = FakeNeonTx()
+        self.neon_sig = '0x' + '01' * 32
+        self.emulated_evm_step_cnt = evm_step_cnt
+        self.neon_tx_exec_cfg = FakeNeonTxExecCfg()
+
+
+class FakeSolInteractor:
+    """Iterations cost base_cu + evm_step_cu * evm_step_cnt, the budget is cu_limit"""
+    def __init__(self, cu_limit: int, base_cu: int, evm_step_cu: int):
+        self.blockhash_provider = None
+        self.cu_limit = cu_limit
+        self.base_cu = base_cu
+        self.evm_step_cu = evm_step_cu
+        self.sent_tx_cnt = 0
+        self.failed_tx_cnt = 0
+        self._left_evm_step_cnt = 0
+        self._receipt_dict: Dict[str, Tuple[int, bool]] = {}
+
+    def start_neon_tx(self, evm_step_cnt: int) -> None:
+        self._left_evm_step_cnt = evm_step_cnt
+
+    def get_recent_blockhash(self) -> SolBlockhash:
+        return SolBlockhash('4NCYB3kRT8sCNodPNuCZo8VUh4xqpBQxsxed2wd9xaD4')
+
+    def get_confirmed_slot_for_tx_sig_list(self, tx_sig_list: List[str]) -> Tuple[int, bool]:
+        return 1, True
+
+    def send_tx_list(self, tx_list: List[SolIterativeTx], skip_preflight: bool) -> List[SolSendResult]:
+        result_list: List[SolSendResult] = []
+        for tx in tx_list:
+            self.sent_tx_cnt += 1
+            # resize iterations reallocate accounts and don't execute EVM steps
+            evm_step_cnt = 0 if tx.is_add_iter else min(tx.evm_step_cnt, self._left_evm_step_cnt)
+            used_cu = self.base_cu + self.evm_step_cu * evm_step_cnt
+            if used_cu > self.cu_limit:
+                self.failed_tx_cnt += 1
+                error = {
+                    'code': -32002, 'message': 'Transaction simulation failed',
+                    'data': {
+                        'err': {'InstructionError': [1, 'ComputationalBudgetExceeded']},
+                        'logs': [f'Program {EVM_LOADER_ID} failed: exceeded CUs meter at BPF instruction']
+                    }
+                }
+                result_list.append(SolSendResult(result=None, error=error))
+                continue
+
+            self._left_evm_step_cnt -= evm_step_cnt
+            tx_sig = base58.b58encode(tx.signature()).decode('utf-8')
+            self._receipt_dict[tx_sig] = (used_cu, self._left_evm_step_cnt == 0)
+            result_list.append(SolSendResult(result=tx_sig, error=None))
+        return result_list
+
+    def get_tx_receipt_list(self, tx_sig_list: List[str]):
+        return [self._get_receipt(tx_sig) for tx_sig in tx_sig_list]
+
+    def _get_receipt(self, tx_sig: str):
+        used_cu, is_done = self._receipt_dict.pop(tx_sig)
+        log_list = [f'Program {EVM_LOADER_ID} invoke [1]']
+        if is_done:
+            data = [base64.b64encode(v).decode('utf-8') for v in (b'RETURN', b'\x11', (21000).to_bytes(8, 'little'))]
+            log_list.append('Program data: ' + ' '.join(data))
+        log_list += [
+            f'Program {EVM_LOADER_ID} consumed {used_cu} of {self.cu_limit} compute units',
+            f'Program {EVM_LOADER_ID} success'
+        ]
+        return {
+            'slot': 1,
+            'transaction': {
+                'signatures': [tx_sig],
+                'message': {
+                    'accountKeys': ['operator', EVM_LOADER_ID],
+                    'instructions': [{'programIdIndex': 1, 'accounts': [], 'data': base58.b58encode(b'\x20').decode()}]
+                }
+            },
+            'meta': {
+                'err': None, 'fee': 5000, 'preBalances': [10000], 'postBalances': [5000],
+                'innerInstructions': [], 'logMessages': log_list
+            }
+        }
+
+
+class FakeIterativeNeonTxStrategy(IterativeNeonTxStrategy):
+    def _build_tx(self) -> FakeTx:
+        self._uniq_idx += 1
+        FakeIterativeNeonTxStrategy._tx_idx += 1
+        return FakeTx(FakeIterativeNeonTxStrategy._tx_idx)
+
+    _tx_idx = 0
+
+
+class FixedStepNeonTxStrategy(FakeIterativeNeonTxStrategy):
+    """The previous behavior: it starts from the same count of steps and decreases it by 150"""
+    def _estimate_evm_step_cnt(self):
+        return None
+
+
+@logged_group("neon.TestCases")
+class TestEvmStepCost(unittest.TestCase):
+    cu_limit = 400_000
+    neon_tx_cnt = 5
+    evm_step_cnt = 10_000
+
+    def setUp(self) -> None:
+        ElfParams().set_elf_param_dict({'NEON_COMPUTE_UNITS': str(self.cu_limit)})
+
+    def _execute(self, strategy_type, evm_step_cu: int) -> FakeSolInteractor:
+        solana = FakeSolInteractor(self.cu_limit, base_cu=20_000, evm_step_cu=evm_step_cu)
+        estimator = EvmStepCostEstimator()
+        for _ in range(self.neon_tx_cnt):
+            solana.start_neon_tx(self.evm_step_cnt)
+            strategy = strategy_type(FakeCtx(solana, self.evm_step_cnt))
+            strategy._evm_step_cost = estimator
+            neon_tx_res = strategy.execute()
+            self.assertTrue(neon_tx_res.is_valid())
+        return solana
+
+    def test_fewer_txs_for_expensive_steps(self):
+        fixed = self._execute(FixedStepNeonTxStrategy, evm_step_cu=800)
+        adaptive = self._execute(FakeIterativeNeonTxStrategy, evm_step_cu=800)
+        self.info(
+            f'{self.neon_tx_cnt} Neon txs with expensive steps: fixed step count {fixed.sent_tx_cnt} Solana txs '
+            f'({fixed.failed_tx_cnt} failed), adaptive {adaptive.sent_tx_cnt} Solana txs ({adaptive.failed_tx_cnt} failed)'
+        )
+        self.assertLess(adaptive.sent_tx_cnt, fixed.sent_tx_cnt)
+        self.assertLess(adaptive.failed_tx_cnt, fixed.failed_tx_cnt)
+
+    def test_fewer_txs_for_cheap_steps(self):
+        fixed = self._execute(FixedStepNeonTxStrategy, evm_step_cu=100)
+        adaptive = self._execute(FakeIterativeNeonTxStrategy, evm_step_cu=100)
+        self.info(
+            f'{self.neon_tx_cnt} Neon txs with cheap steps: fixed step count {fixed.sent_tx_cnt} Solana txs, '
+            f'adaptive {adaptive.sent_tx_cnt} Solana txs'
+        )
+        self.assertEqual(fixed.failed_tx_cnt, 0)
+        self.assertEqual(adaptive.failed_tx_cnt, 0)
+        self.assertLess(adaptive.sent_tx_cnt, fixed.sent_tx_cnt)
+
+    def test_estimator(self):
+        estimator = EvmStepCostEstimator(max_size=2)
+        key = ('ab' * 20, 'a9059cbb')
+        self.assertIsNone(estimator.get_cu_per_evm_step(key))
+
+        estimator.add_used_cu(key, 100, 100_000)
+        self.assertEqual(estimator.get_cu_per_evm_step(key), 1000)
+        estimator.add_used_cu(key, 100, 200_000)
+        self.assertAlmostEqual(estimator.get_cu_per_evm_step(key), 1300)
+
+        # the exceeded budget is the lower bound of the cost
+        estimator.add_budget_exceeded(key, 200, 400_000)
+        self.assertEqual(estimator.get_cu_per_evm_step(key), 2000)
+        estimator.add_budget_exceeded(key, 100, 100_000)
+        self.assertEqual(estimator.get_cu_per_evm_step(key), 2000)
+
+        estimator.add_used_cu(('cd' * 20, ''), 10, 10_000)
+        estimator.add_used_cu(('ef' * 20, ''), 10, 10_000)
+        self.assertIsNone(estimator.get_cu_per_evm_step(key))
+
+
+    def test_deploy_key(self):
+        deploy_tx, other_deploy_tx, call_tx = FakeNeonTx(), FakeNeonTx(), FakeNeonTx()
+        deploy_tx.toAddress = other_deploy_tx.toAddress = b''
+        # solc init code starts with the same bytes
+        deploy_tx.callData = bytes.fromhex('60806040') + bytes(100)
+        other_deploy_tx.callData = bytes.fromhex('60806040') + bytes(200)
+
+        key_set = {EvmStepCostEstimator.get_key(tx) for tx in (deploy_tx, other_deploy_tx, call_tx)}
+        self.assertEqual(len(key_set), 3)
+        self.assertEqual(EvmStepCostEstimator.get_key(deploy_tx), EvmStepCostEstimator.get_key(deploy_tx))
+
+    def test_resize_iterations_are_not_sampled(self):
+        solana = FakeSolInteractor(self.cu_limit, base_cu=20_000, evm_step_cu=100)
+        solana.start_neon_tx(self.evm_step_cnt)
+        ctx = FakeCtx(solana, self.evm_step_cnt)
+        ctx.neon_tx_exec_cfg.resize_iter_cnt = 2
+
+        strategy = FakeIterativeNeonTxStrategy(ctx)
+        strategy._evm_step_cost = estimator = SampleListEstimator()
+        tx_list = strategy.build_tx_list(self.evm_step_cnt, 2)
+        self.assertEqual([tx.is_add_iter for tx in tx_list[:3]], [True, True, False])
+
+        self.assertTrue(strategy.execute().is_valid())
+        self.assertGreater(len(estimator.sample_list), 0)
+        for evm_step_cnt, used_cu_cnt in estimator.sample_list:
+            self.assertEqual(used_cu_cnt, 20_000 + 100 * evm_step_cnt)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+
+from unittest.mock import MagicMock
+
+from logged_groups import logged_group
+
+from ..common_neon.config import Config
+from ..common_neon.utils import SolanaBlockInfo, NeonTxReceiptInfo, NeonTxInfo, NeonTxResultInfo
+from ..neon_rpc_api_model import NeonRpcApiWorker
+from ..neon_rpc_api_model.finalized_response_cache import FinalizedResponseCache
+
+
+class FakeIndexerDB:
+    def __init__(self, finalized_block_slot: int, latest_block_slot: int):
+        self.finalized_block_slot = finalized_block_slot
+        self.latest_block_slot = latest_block_slot
+        self.call_cnt = 0
+
+    def _block(self, block_slot: int) -> SolanaBlockInfo:
+        return SolanaBlockInfo(
+            block_slot=block_slot,
+            block_hash=f'0x{block_slot:064x}',
+            block_time=block_slot,
+            parent_block_hash=f'0x{block_slot - 1:064x}',
+            is_finalized=block_slot <= self.finalized_block_slot
+        )
+
+    def _tx(self, neon_sig: str) -> NeonTxReceiptInfo:
+        block_slot = int(neon_sig[-8:], 16)
+        neon_tx_res = NeonTxResultInfo()
+        neon_tx_res.fill_result(status='0x1', gas_used='0x5208', return_value='')
+        neon_tx_res.fill_block_info(self._block(block_slot), 0, 0)
+        return NeonTxReceiptInfo(NeonTxInfo(sig=neon_sig), neon_tx_res)
+
+    def get_finalized_block_slot(self) -> int:
+        return self.finalized_block_slot
+
+    def get_latest_block(self) -> SolanaBlockInfo:
+        self.call_cnt += 1
+        return self._block(self.latest_block_slot)
+
+    def get_block_by_slot(self, block_slot: int) -> SolanaBlockInfo:
+        self.call_cnt += 1
+        return self._block(block_slot)
+
+    def get_block_by_hash(self, block_hash: str) -> SolanaBlockInfo:
+        self.call_cnt += 1
+        return self._block(int(block_hash, 16))
+
+    def get_tx_list_by_block_slot(self, block_slot: int):
+        self.call_cnt += 1
+        return [self._tx(f'0x{block_slot:064x}')]
+
+    def get_tx_by_neon_sig(self, neon_sig: str) -> NeonTxReceiptInfo:
+        self.call_cnt += 1
+        return self._tx(neon_sig)
+
+
+@logged_group("neon.TestCases")
+class TestFinalizedResponseCache(unittest.TestCase):
+    finalized_block_slot = 100
+    latest_block_slot = 110
+
+    def setUp(self) -> None:
+        # the worker without connections to Solana, MemPool and Postgres
+        self.worker = NeonRpcApiWorker.__new__(NeonRpcApiWorker)
+        self.worker._config = Config()
+        self.worker._db = self.db = FakeIndexerDB(self.finalized_block_slot, self.latest_block_slot)
+        self.worker._mempool_client = MagicMock()
+        self.worker._response_cache = FinalizedResponseCache(16)
+
+    def _call_twice(self, method: str, *params):
+        call_cnt = self.db.call_cnt
+        first_result = getattr(self.worker, method)(*params)
+        first_call_cnt, call_cnt = self.db.call_cnt - call_cnt, self.db.call_cnt
+        second_result = getattr(self.worker, method)(*params)
+        second_call_cnt = self.db.call_cnt - call_cnt
+
+        self.assertEqual(first_result, second_result)
+        self.assertGreater(first_call_cnt, 0)
+        return second_call_cnt
+
+    def test_finalized_results_are_cached(self):
+        block_slot = self.finalized_block_slot
+        for method, param_list in (
+            ('eth_getBlockByNumber', [hex(block_slot), False]),
+            ('eth_getBlockByNumber', [block_slot - 1, True]),
+            ('eth_getBlockByHash', [f'0x{block_slot - 2:064x}', False]),
+            ('eth_getTransactionReceipt', [f'0x{block_slot - 3:064x}']),
+            ('eth_getTransactionByHash', [f'0x{block_slot - 4:064x}']),
+        ):
+            self.assertEqual(self._call_twice(method, *param_list), 0, method)
+
+        self.assertEqual(len(self.worker._response_cache), 5)
+        # the same block with the other params is a separate entry
+        self.assertEqual(self._call_twice('eth_getBlockByNumber', hex(block_slot), True), 0)
+        self.assertEqual(len(self.worker._response_cache), 6)
+
+    def test_confirmed_results_are_not_cached(self):
+        block_slot = self.finalized_block_slot + 1
+        for method, param_list in (
+            ('eth_getBlockByNumber', [hex(block_slot), False]),
+            ('eth_getBlockByNumber', ['latest', False]),
+            ('eth_getBlockByHash', [f'0x{block_slot:064x}', True]),
+            ('eth_getTransactionReceipt', [f'0x{block_slot:064x}']),
+            ('eth_getTransactionByHash', [f'0x{block_slot:064x}']),
+        ):
+            self.assertGreater(self._call_twice(method, *param_list), 0, method)
+
+        self.assertEqual(len(self.worker._response_cache), 0)
+
+        # the block becomes finalized, the next request puts the result into the cache
+        self.db.finalized_block_slot = block_slot
+        self.assertEqual(self._call_twice('eth_getBlockByNumber', hex(block_slot), False), 0)
+
+    def test_lru_eviction(self):
+        cache = FinalizedResponseCache(2)
+        cache.put(('a',), 1)
+        cache.put(('b',), None)
+        self.assertEqual(cache.get(('a',)), (True, 1))
+        cache.put(('c',), 3)
+        self.assertEqual(cache.get(('b',)), (False, None))
+        self.assertEqual(cache.get(('a',)), (True, 1))
+        self.assertEqual(cache.get(('c',)), (True, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,412 @@
+import copy
+import os
+import random
+import time
+import unittest
+
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+from logged_groups import logged_group
+
+from ..common_neon.logs_bloom import calc_logs_bloom, logs_bloom_to_hex
+from ..common_neon.solana_neon_tx_receipt import SolTxMetaInfo, SolTxCostInfo, SolNeonIxReceiptInfo
+from ..common_neon.utils import NeonTxInfo, SolanaBlockInfo
+from ..indexer.indexed_objects import NeonIndexedHolderInfo, NeonIndexedTxInfo, NeonIndexedBlockInfo
+
+
+DataChunk = NeonIndexedHolderInfo.DataChunk
+
+
+class BytesHolderInfo(NeonIndexedHolderInfo):
+    """The previous implementation with the concatenation of bytes, it is used as a reference"""
+    def __init__(self, account: str):
+        super().__init__(account)
+        self._ref_data = bytes()
+
+    @property
+    def data(self) -> bytes:
+        return self._ref_data
+
+    def add_data_chunk(self, chunk: DataChunk) -> None:
+        end_pos = chunk.offset + chunk.length
+        data_len = len(self._ref_data)
+        if end_pos > data_len:
+            self._ref_data += bytes(end_pos - data_len)
+
+        self._ref_data = self._ref_data[:chunk.offset] + chunk.data + self._ref_data[end_pos:]
+        self._data_size += chunk.length
+
+
+def split_into_chunk_list(data: bytes, chunk_len: int) -> List[DataChunk]:
+    return [
+        DataChunk(offset=offset, length=len(data[offset:offset + chunk_len]), data=data[offset:offset + chunk_len])
+        for offset in range(0, len(data), chunk_len)
+    ]
+
+
+@logged_group("neon.TestCases")
+class TestNeonIndexedHolderInfo(unittest.TestCase):
+    def _replay(self, holder: NeonIndexedHolderInfo, chunk_list: List[DataChunk]) -> NeonIndexedHolderInfo:
+        for chunk in chunk_list:
+            holder.add_data_chunk(chunk)
+        return holder
+
+    def test_in_order_chunks(self):
+        data = os.urandom(24 * 1024)
+        holder = self._replay(NeonIndexedHolderInfo('holder'), split_into_chunk_list(data, 1000))
+        self.assertEqual(holder.data, data)
+        self.assertEqual(holder.data_size, len(data))
+
+    def test_out_of_order_chunks(self):
+        data = os.urandom(24 * 1024)
+        chunk_list = split_into_chunk_list(data, 1000)
+        random.Random(1).shuffle(chunk_list)
+
+        holder = NeonIndexedHolderInfo('holder')
+        for idx, chunk in enumerate(chunk_list):
+            holder.add_data_chunk(chunk)
+            # the data is available between chunks
+            self.assertEqual(holder.data[chunk.offset:chunk.offset + chunk.length], chunk.data)
+            self.assertEqual(len(holder.data), max(c.offset + c.length for c in chunk_list[:idx + 1]))
+
+        self.assertEqual(holder.data, data)
+        self.assertEqual(holder.data_size, len(data))
+
+    def test_gaps_and_overlaps(self):
+        chunk_list = [
+            DataChunk(offset=10, length=4, data=b'\x01' * 4),
+            DataChunk(offset=0, length=2, data=b'\x02' * 2),
+            DataChunk(offset=12, length=4, data=b'\x03' * 4),
+            DataChunk(offset=1, length=2, data=b'\x04' * 2),
+        ]
+        holder = self._replay(NeonIndexedHolderInfo('holder'), chunk_list)
+        ref_holder = self._replay(BytesHolderInfo('holder'), chunk_list)
+
+        self.assertEqual(holder.data, b'\x02\x04\x04' + bytes(7) + b'\x01\x01' + b'\x03' * 4)
+        self.assertEqual(holder.data, ref_holder.data)
+        # the overlapped bytes are counted twice, the gaps are not counted
+        self.assertEqual(holder.data_size, 12)
+        self.assertEqual(holder.data_size, ref_holder.data_size)
+
+    def test_random_chunks_against_reference(self):
+        rnd = random.Random(2)
+        chunk_list: List[DataChunk] = []
+        for _ in range(200):
+            length = rnd.randint(1, 300)
+            chunk_list.append(DataChunk(offset=rnd.randint(0, 5000), length=length, data=os.urandom(length)))
+
+        holder = self._replay(NeonIndexedHolderInfo('holder'), chunk_list)
+        ref_holder = self._replay(BytesHolderInfo('holder'), chunk_list)
+        self.assertEqual(holder.data, ref_holder.data)
+        self.assertEqual(holder.data_size, ref_holder.data_size)
+
+    def test_benchmark_contract_deployment(self):
+        for data_len in (24 * 1024, 1024 * 1024):
+            chunk_list = split_into_chunk_list(os.urandom(data_len), 1000)
+            repeat_cnt = 200 if data_len < 100 * 1024 else 3
+
+            time_dict = {}
+            for holder_type in (BytesHolderInfo, NeonIndexedHolderInfo):
+                start_time = time.monotonic()
+                for _ in range(repeat_cnt):
+                    holder = self._replay(holder_type('holder'), chunk_list)
+                    _ = holder.data
+                time_dict[holder_type] = (time.monotonic() - start_time) / repeat_cnt
+
+            self.info(
+                f'Holder data of {data_len} bytes in {len(chunk_list)} chunks: '
+                f'bytes {time_dict[BytesHolderInfo] * 1000:.3f} ms, '
+                f'bytearray {time_dict[NeonIndexedHolderInfo] * 1000:.3f} ms'
+            )
+
+
+class DeepCopyBlockInfo(NeonIndexedBlockInfo):
+    """The previous implementation with the deep copy of all objects on cloning, it is used as a reference"""
+    def clone(self, history_block_deque) -> NeonIndexedBlockInfo:
+        new_block = DeepCopyBlockInfo(history_block_deque)
+        new_block._neon_holder_dict = copy.deepcopy(self._neon_holder_dict)
+        new_block._neon_tx_dict = copy.deepcopy(self._neon_tx_dict)
+        new_block._sol_neon_ix_dict = copy.deepcopy(self._sol_neon_ix_dict)
+        return new_block
+
+
+class NoLogsBloomBlockInfo(NeonIndexedBlockInfo):
+    """The block without the logs bloom calculation, it is used to measure the overhead"""
+    def _add_logs_bloom(self, tx: NeonIndexedTxInfo) -> None:
+        pass
+
+
+def new_sol_block_deque(block_slot: int) -> deque:
+    return deque([SolanaBlockInfo(block_slot=block_slot, block_hash=f'hash-{block_slot}', block_time=1)])
+
+
+def new_sol_neon_ix(block_slot: int, idx: int) -> SolNeonIxReceiptInfo:
+    tx_meta = SolTxMetaInfo(block_slot, f'sig-{block_slot}-{idx}', {
+        'transaction': {'message': {'accountKeys': ['operator']}},
+        'meta': {'preBalances': [10000], 'postBalances': [5000]}
+    })
+    sol_neon_ix = SolNeonIxReceiptInfo.from_tx(tx_meta)
+    sol_neon_ix._tx_cost = SolTxCostInfo(tx_meta)
+    return sol_neon_ix
+
+
+def new_neon_tx_key(idx: int) -> NeonIndexedTxInfo.Key:
+    return NeonIndexedTxInfo.Key.from_neon_tx_sig(f'{idx:064x}', f'storage-{idx}', iter([f'account-{idx}']))
+
+
+def get_block_state(neon_block: NeonIndexedBlockInfo) -> Dict[str, Any]:
+    def get_ix_list(obj) -> List[Tuple]:
+        return [ix.ident for ix in obj.iter_sol_neon_ix()]
+
+    return dict(
+        tx_dict={
+            tx.key.value: (tx.status, tx.block_slot, tx.holder_account, tx.sol_tx_cnt, get_ix_list(tx))
+            for tx in neon_block.iter_neon_tx()
+        },
+        holder_dict={
+            holder.account: (holder.block_slot, holder.data, holder.data_size, get_ix_list(holder))
+            for holder in neon_block.iter_neon_holder()
+        },
+        ix_dict={ix.ident: neon_block._sol_neon_ix_dict.get(ix) for ix in neon_block.iter_sol_neon_ix()},
+        done_tx_list=[(tx.key.value, tx.neon_tx_res.block_slot) for tx in neon_block.iter_done_neon_tx()],
+        neon_tx_cnt=neon_block.neon_tx_cnt,
+        neon_holder_cnt=neon_block.neon_holder_cnt,
+        sol_neon_ix_cnt=neon_block.sol_neon_ix_cnt,
+    )
+
+
+class SlotStreamReplayer:
+    """Generates the random stream of slots with iterative txs and holders, and applies it to blocks"""
+    def __init__(self, seed: int):
+        self._rnd = random.Random(seed)
+        self._next_tx_idx = 0
+        self._next_holder_idx = 0
+
+    def _new_ix(self, block_slot: int, ix_idx: List[int]) -> SolNeonIxReceiptInfo:
+        ix_idx[0] += 1
+        return new_sol_neon_ix(block_slot, ix_idx[0])
+
+    def generate_slot(self, neon_block: NeonIndexedBlockInfo) -> List[Tuple]:
+        """The list of operations depends on the block state, so it is generated for the reference block"""
+        rnd = self._rnd
+        tx_key_list = [tx.key.value for tx in neon_block.iter_neon_tx()]
+        holder_list = [holder.account for holder in neon_block.iter_neon_holder()]
+        op_list: List[Tuple] = []
+        for _ in range(rnd.randint(0, 8)):
+            op = rnd.choice(('add_tx', 'step_tx', 'done_tx', 'cancel_tx', 'fail_tx', 'add_holder', 'write_holder',
+                             'use_holder', 'fail_holder'))
+            if op in ('add_tx', 'add_holder'):
+                if op == 'add_tx':
+                    self._next_tx_idx += 1
+                    op_list.append((op, self._next_tx_idx))
+                else:
+                    self._next_holder_idx += 1
+                    op_list.append((op, f'holder-{self._next_holder_idx}'))
+            elif op in ('write_holder', 'fail_holder') and len(holder_list):
+                op_list.append((op, rnd.choice(holder_list), rnd.randint(0, 1000), os.urandom(rnd.randint(1, 50))))
+            elif op == 'use_holder' and len(holder_list) and len(tx_key_list):
+                holder = rnd.choice(holder_list)
+                holder_list.remove(holder)
+                op_list.append((op, rnd.choice(tx_key_list), holder))
+            elif len(tx_key_list) and op not in ('write_holder', 'fail_holder', 'use_holder'):
+                op_list.append((op, rnd.choice(tx_key_list)))
+        return op_list
+
+    def apply_slot(self, neon_block: NeonIndexedBlockInfo, op_list: List[Tuple]) -> None:
+        block_slot = neon_block.block_slot
+        ix_idx = [0]
+        for op in op_list:
+            if op[0] == 'add_tx':
+                key = new_neon_tx_key(op[1])
+                ix = self._new_ix(block_slot, ix_idx)
+                if neon_block.find_neon_tx(key, ix) is None:
+                    neon_block.add_neon_tx(key, NeonTxInfo.from_neon_sig(key.value), ix)
+            elif op[0] == 'add_holder':
+                neon_block.add_neon_holder(op[1], self._new_ix(block_slot, ix_idx))
+            elif op[0] in ('write_holder', 'fail_holder'):
+                holder = neon_block.find_neon_holder(op[1], self._new_ix(block_slot, ix_idx))
+                if holder is None:
+                    continue
+                holder.add_data_chunk(NeonIndexedHolderInfo.DataChunk(offset=op[2], length=len(op[3]), data=op[3]))
+                if op[0] == 'fail_holder':
+                    neon_block.fail_neon_holder(holder)
+            elif op[0] == 'use_holder':
+                tx = next((tx for tx in neon_block.iter_neon_tx() if tx.key.value == op[1]), None)
+                if (tx is None) or (tx.holder_account != ''):
+                    continue
+                ix = self._new_ix(block_slot, ix_idx)
+                tx = neon_block.find_neon_tx(tx.key, ix)
+                holder = neon_block.find_neon_holder(op[2], ix)
+                if holder is not None:
+                    tx.set_holder_account(holder)
+                    neon_block.done_neon_holder(holder)
+            else:
+                tx = next((tx for tx in neon_block.iter_neon_tx() if tx.key.value == op[1]), None)
+                if (tx is None) or (tx.status != NeonIndexedTxInfo.Status.IN_PROGRESS):
+                    continue
+                ix = self._new_ix(block_slot, ix_idx)
+                if op[0] == 'cancel_tx':
+                    neon_block.cancel_neon_tx(tx, ix)
+                    continue
+                tx = neon_block.find_neon_tx(tx.key, ix)
+                if op[0] == 'done_tx':
+                    neon_block.done_neon_tx(tx, ix)
+                elif op[0] == 'fail_tx':
+                    neon_block.fail_neon_tx(tx)
+        neon_block.complete_block()
+
+
+@logged_group("neon.TestCases")
+class TestNeonIndexedBlockInfo(unittest.TestCase):
+    def _replay_slot_stream(self, seed: int, slot_cnt: int, fork_probability: float) -> None:
+        rnd = random.Random(seed)
+        replayer = SlotStreamReplayer(seed)
+        block_slot = 1
+        ref_block_list: List[NeonIndexedBlockInfo] = [DeepCopyBlockInfo(new_sol_block_deque(block_slot))]
+        cow_block_list: List[NeonIndexedBlockInfo] = [NeonIndexedBlockInfo(new_sol_block_deque(block_slot))]
+        state_list: List[Dict[str, Any]] = []
+
+        for _ in range(slot_cnt):
+            # a fork continues one of the previous blocks, as it happens on switching of Solana branches
+            parent_idx = -1
+            if rnd.random() < fork_probability:
+                parent_idx = rnd.randint(0, len(ref_block_list) - 1)
+
+            block_slot += 1
+            ref_block = ref_block_list[parent_idx].clone(new_sol_block_deque(block_slot))
+            cow_block = cow_block_list[parent_idx].clone(new_sol_block_deque(block_slot))
+
+            op_list = replayer.generate_slot(ref_block)
+            replayer.apply_slot(ref_block, op_list)
+            replayer.apply_slot(cow_block, op_list)
+
+            ref_block_list.append(ref_block)
+            cow_block_list.append(cow_block)
+            state_list.append(get_block_state(ref_block))
+            self.assertEqual(get_block_state(cow_block), state_list[-1])
+
+        # the changes in the clones don't touch the previous blocks
+        for idx, (ref_block, cow_block) in enumerate(zip(ref_block_list[1:], cow_block_list[1:])):
+            self.assertEqual(get_block_state(ref_block), state_list[idx])
+            self.assertEqual(get_block_state(cow_block), state_list[idx])
+
+    def test_linear_slot_stream(self):
+        for seed in range(3):
+            self._replay_slot_stream(seed, 100, 0)
+
+    def test_forked_slot_stream(self):
+        for seed in range(3):
+            self._replay_slot_stream(seed, 200, 0.2)
+
+    def test_cancel_does_not_change_parent_block(self):
+        neon_block = NeonIndexedBlockInfo(new_sol_block_deque(1))
+        key = new_neon_tx_key(1)
+        neon_block.add_neon_tx(key, NeonTxInfo.from_neon_sig(key.value), new_sol_neon_ix(1, 1))
+
+        new_neon_block = neon_block.clone(new_sol_block_deque(2))
+        tx = next(new_neon_block.iter_neon_tx())
+        new_tx = new_neon_block.cancel_neon_tx(tx, new_sol_neon_ix(2, 1))
+
+        self.assertEqual(new_tx.status, NeonIndexedTxInfo.Status.CANCELED)
+        self.assertEqual(next(new_neon_block.iter_neon_tx()).status, NeonIndexedTxInfo.Status.CANCELED)
+        self.assertEqual(next(neon_block.iter_neon_tx()).status, NeonIndexedTxInfo.Status.IN_PROGRESS)
+        self.assertEqual(next(neon_block.iter_neon_tx()).block_slot, 1)
+
+    @staticmethod
+    def _add_tx_list(neon_block: NeonIndexedBlockInfo, tx_cnt: int,
+                     log_cnt: int) -> List[Tuple[NeonIndexedTxInfo, SolNeonIxReceiptInfo]]:
+        block_slot = neon_block.block_slot
+        tx_list: List[Tuple[NeonIndexedTxInfo, SolNeonIxReceiptInfo]] = []
+        for idx in range(tx_cnt):
+            key = new_neon_tx_key(block_slot * tx_cnt + idx)
+            tx = neon_block.add_neon_tx(key, NeonTxInfo.from_neon_sig(key.value), new_sol_neon_ix(block_slot, idx))
+            for log_idx in range(log_cnt):
+                # ERC20 Transfer events of a few tokens
+                tx.neon_tx_res.append_record({
+                    'address': f'0x{idx % 5:040x}',
+                    'topics': [f'0x{0xdd:064x}', f'0x{idx:064x}', f'0x{log_idx:064x}'],
+                    'data': '0x',
+                })
+            tx_list.append((tx, new_sol_neon_ix(block_slot, tx_cnt + idx)))
+        return tx_list
+
+    def _done_tx_list(self, neon_block: NeonIndexedBlockInfo, tx_cnt: int, log_cnt: int) -> None:
+        for tx, ix in self._add_tx_list(neon_block, tx_cnt, log_cnt):
+            neon_block.done_neon_tx(tx, ix)
+
+    def test_logs_bloom(self):
+        neon_block = NeonIndexedBlockInfo(new_sol_block_deque(1))
+        self.assertIsNone(neon_block.logs_bloom)
+        self._done_tx_list(neon_block, 10, 3)
+
+        tx_list = list(neon_block.iter_done_neon_tx())
+        block_logs_bloom = 0
+        for tx in tx_list:
+            self.assertEqual(tx.neon_tx_res.logs_bloom, logs_bloom_to_hex(calc_logs_bloom(tx.neon_tx_res.log_list)))
+            block_logs_bloom |= int(tx.neon_tx_res.logs_bloom, 16)
+        self.assertEqual(neon_block.logs_bloom, logs_bloom_to_hex(block_logs_bloom))
+
+        # the bloom is stored with the block, and it survives the finalization
+        neon_block.set_finalized(True)
+        self.assertEqual(list(neon_block.iter_history_block())[-1].logs_bloom, logs_bloom_to_hex(block_logs_bloom))
+
+        # the txs without logs don't change the bloom
+        neon_block = NeonIndexedBlockInfo(new_sol_block_deque(2))
+        self._done_tx_list(neon_block, 2, 0)
+        self.assertIsNone(neon_block.logs_bloom)
+        self.assertEqual(next(neon_block.iter_done_neon_tx()).neon_tx_res.logs_bloom, logs_bloom_to_hex(0))
+
+    def test_benchmark_logs_bloom(self):
+        tx_cnt, log_cnt, block_cnt = 100, 3, 50
+
+        time_dict: Dict[type, float] = {NoLogsBloomBlockInfo: 0.0, NeonIndexedBlockInfo: 0.0}
+        for block_slot in range(1, block_cnt + 1):
+            for block_type in time_dict.keys():
+                neon_block = block_type(new_sol_block_deque(block_slot))
+                tx_list = self._add_tx_list(neon_block, tx_cnt, log_cnt)
+
+                start_time = time.monotonic()
+                for tx, ix in tx_list:
+                    neon_block.done_neon_tx(tx, ix)
+                time_dict[block_type] += (time.monotonic() - start_time) / block_cnt
+
+        overhead = time_dict[NeonIndexedBlockInfo] - time_dict[NoLogsBloomBlockInfo]
+        self.info(
+            f'Done txs of the block with {tx_cnt} txs and {tx_cnt * log_cnt} logs: '
+            f'without blooms {time_dict[NoLogsBloomBlockInfo] * 1000:.3f} ms, '
+            f'with blooms {time_dict[NeonIndexedBlockInfo] * 1000:.3f} ms, '
+            f'overhead {overhead * 1000:.3f} ms'
+        )
+
+    def test_benchmark_clone_with_open_txs(self):
+        open_tx_cnt, slot_cnt, step_per_slot_cnt = 1000, 5, 10
+
+        time_dict: Dict[type, float] = {}
+        for block_type in (DeepCopyBlockInfo, NeonIndexedBlockInfo):
+            neon_block = block_type(new_sol_block_deque(1))
+            for idx in range(open_tx_cnt):
+                key = new_neon_tx_key(idx)
+                neon_block.add_neon_tx(key, NeonTxInfo.from_neon_sig(key.value), new_sol_neon_ix(1, idx))
+
+            rnd = random.Random(1)
+            start_time = time.monotonic()
+            for block_slot in range(2, slot_cnt + 2):
+                neon_block = neon_block.clone(new_sol_block_deque(block_slot))
+                for ix_idx in range(step_per_slot_cnt):
+                    key = new_neon_tx_key(rnd.randint(0, open_tx_cnt - 1))
+                    neon_block.find_neon_tx(key, new_sol_neon_ix(block_slot, ix_idx))
+                neon_block.complete_block()
+            time_dict[block_type] = (time.monotonic() - start_time) / slot_cnt
+            self.assertEqual(neon_block.neon_tx_cnt, open_tx_cnt)
+
+        self.info(
+            f'Slot with {open_tx_cnt} open txs and {step_per_slot_cnt} tx steps: '
+            f'deep copy {time_dict[DeepCopyBlockInfo] * 1000:.3f} ms, '
+            f'copy-on-write {time_dict[NeonIndexedBlockInfo] * 1000:.3f} ms, '
+            f'ratio {time_dict[DeepCopyBlockInfo] / time_dict[NeonIndexedBlockInfo]:.1f}'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
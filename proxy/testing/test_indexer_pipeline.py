@@ -0,0 +1,175 @@
+import threading
+import time
+import unittest
+
+from typing import Any, Dict, List, Optional, Set
+from unittest.mock import patch
+
+from logged_groups import logged_group
+
+from ..common_neon.config import Config
+from ..common_neon.solana_neon_tx_receipt import SolTxSigSlotInfo
+from ..indexer.solana_tx_meta_collector import SolTxMetaDict, SolHistoryNotFound
+from ..indexer.solana_tx_meta_collector import FinalizedSolTxMetaCollector, ConfirmedSolTxMetaCollector
+
+
+class FakeConfig(Config):
+    def __init__(self, prefetch_tx_cnt: int):
+        super().__init__()
+        self._prefetch_tx_cnt = prefetch_tx_cnt
+
+    @property
+    def indexer_poll_cnt(self) -> int:
+        return 100
+
+    @property
+    def indexer_prefetch_tx_cnt(self) -> int:
+        return self._prefetch_tx_cnt
+
+
+class FakeSolSigsDB:
+    def __init__(self):
+        self.sig_list: List[SolTxSigSlotInfo] = []
+
+    def add_sig(self, info: SolTxSigSlotInfo) -> None:
+        self.sig_list.append(info)
+
+    def get_next_sig(self, block_slot: int) -> Optional[SolTxSigSlotInfo]:
+        sig_list = [info for info in self.sig_list if info.block_slot > block_slot]
+        return min(sig_list, key=lambda info: info.block_slot) if len(sig_list) > 0 else None
+
+    def get_max_sig(self) -> Optional[SolTxSigSlotInfo]:
+        return max(self.sig_list, key=lambda info: info.block_slot) if len(self.sig_list) > 0 else None
+
+
+class FakeSolInteractor:
+    """Serves a fixture of Solana responses with the network latency"""
+    RPC_DELAY_SEC = 0.005
+
+    def __init__(self, start_slot: int, slot_cnt: int, tx_per_slot_cnt: int):
+        # Solana returns signatures from the newest one
+        self.sig_response_list: List[Dict[str, Any]] = [
+            {'signature': f'sig-{slot}-{i}', 'slot': slot, 'err': None}
+            for slot in reversed(range(start_slot, start_slot + slot_cnt))
+            for i in range(tx_per_slot_cnt)
+        ]
+        self.sig_idx_dict = {r['signature']: idx for idx, r in enumerate(self.sig_response_list)}
+        self.missing_sig_set: Set[str] = set()
+        self.active_call_cnt = 0
+        self.receipt_cnt = 0
+        self._lock = threading.Lock()
+
+    def _call(self) -> None:
+        with self._lock:
+            self.active_call_cnt += 1
+        time.sleep(self.RPC_DELAY_SEC)
+        with self._lock:
+            self.active_call_cnt -= 1
+
+    def get_sig_list_for_address(self, _, before: Optional[str], limit: int, commitment: str) -> List[Dict[str, Any]]:
+        self._call()
+        start_idx = self.sig_idx_dict[before] + 1 if before else 0
+        return self.sig_response_list[start_idx:start_idx + limit]
+
+    def get_tx_receipt_list(self, sig_list: List[str], commitment: str) -> List[Optional[Dict[str, Any]]]:
+        self._call()
+        with self._lock:
+            self.receipt_cnt += len(sig_list)
+        return [
+            None if sig in self.missing_sig_set else {
+                'slot': self.sig_response_list[self.sig_idx_dict[sig]]['slot'],
+                'transaction': {'signatures': [sig], 'message': {}},
+                'meta': {'err': None}
+            }
+            for sig in sig_list
+        ]
+
+
+@logged_group("neon.TestCases")
+class TestIndexerPipeline(unittest.TestCase):
+    start_slot = 1000
+    slot_cnt = 200
+    tx_per_slot_cnt = 5
+
+    def setUp(self) -> None:
+        self.solana = FakeSolInteractor(self.start_slot, self.slot_cnt, self.tx_per_slot_cnt)
+
+    def _new_collector(self, prefetch_tx_cnt: int) -> FinalizedSolTxMetaCollector:
+        with patch('proxy.indexer.solana_tx_meta_collector.SolSigsDB', FakeSolSigsDB):
+            return FinalizedSolTxMetaCollector(
+                FakeConfig(prefetch_tx_cnt), self.solana, SolTxMetaDict(), self.start_slot - 1
+            )
+
+    def _index(self, collector: FinalizedSolTxMetaCollector, process_delay_sec: float) -> List[SolTxSigSlotInfo]:
+        """Emulates decoding of receipts and writing to DB"""
+        stop_slot = self.start_slot + self.slot_cnt - 1
+        ident_list: List[SolTxSigSlotInfo] = []
+        for tx_meta in collector.iter_tx_meta(stop_slot, collector.last_block_slot + 1):
+            time.sleep(process_delay_sec)
+            ident_list.append(tx_meta.ident)
+        return ident_list
+
+    def test_pipeline_keeps_order_and_checkpoints(self):
+        seq_collector = self._new_collector(0)
+        seq_ident_list = self._index(seq_collector, 0)
+
+        pipe_collector = self._new_collector(300)
+        pipe_ident_list = self._index(pipe_collector, 0)
+
+        self.assertGreater(len(seq_ident_list), 0)
+        self.assertEqual(pipe_ident_list, seq_ident_list)
+        self.assertEqual(pipe_collector.last_block_slot, seq_collector.last_block_slot)
+        self.assertGreater(len(seq_collector._sigs_db.sig_list), 0)
+        self.assertEqual(pipe_collector._sigs_db.sig_list, seq_collector._sigs_db.sig_list)
+
+    def test_fetch_errors_are_raised_to_processing(self):
+        self.solana.missing_sig_set.add(f'sig-{self.start_slot + 10}-0')
+        collector = self._new_collector(300)
+        with self.assertRaises(SolHistoryNotFound):
+            self._index(collector, 0)
+
+    def test_interrupted_processing_stops_fetching(self):
+        collector = self._new_collector(10)
+        stop_slot = self.start_slot + self.slot_cnt - 1
+        for i, _ in enumerate(collector.iter_tx_meta(stop_slot, self.start_slot)):
+            if i == 5:
+                break
+
+        self.assertEqual(self.solana.active_call_cnt, 0)
+        self.assertFalse(any(t.name.startswith('fetch-') for t in threading.enumerate()))
+
+    def test_confirmed_collector(self):
+        seq_collector = ConfirmedSolTxMetaCollector(FakeConfig(0), self.solana, SolTxMetaDict())
+        pipe_collector = ConfirmedSolTxMetaCollector(FakeConfig(300), self.solana, SolTxMetaDict())
+        stop_slot = self.start_slot + self.slot_cnt - 1
+        self.assertEqual(
+            [tx_meta.ident for tx_meta in pipe_collector.iter_tx_meta(stop_slot, stop_slot - 10)],
+            [tx_meta.ident for tx_meta in seq_collector.iter_tx_meta(stop_slot, stop_slot - 10)]
+        )
+
+    def _wait_receipt_cnt(self, receipt_cnt: int) -> int:
+        # the deadline only protects the test from hanging, the result doesn't depend on the timing
+        deadline = time.monotonic() + 10
+        while (self.solana.receipt_cnt < receipt_cnt) and (time.monotonic() < deadline):
+            time.sleep(0.01)
+        return self.solana.receipt_cnt
+
+    def test_fetch_runs_ahead_of_processing(self):
+        prefetch_tx_cnt = 300
+        collector = self._new_collector(prefetch_tx_cnt)
+        stop_slot = self.start_slot + self.slot_cnt - 1
+        tx_meta_iter = collector.iter_tx_meta(stop_slot, collector.last_block_slot + 1)
+
+        # the processing is paused on the first receipt, the fetching fills the queue meanwhile
+        next(tx_meta_iter)
+        receipt_cnt = self._wait_receipt_cnt(prefetch_tx_cnt + 1)
+        self.assertGreaterEqual(receipt_cnt, prefetch_tx_cnt + 1)
+
+        # the bounded queue stops the fetching: at most one more portion of receipts is requested
+        self.assertLess(self.solana.receipt_cnt, self.slot_cnt * self.tx_per_slot_cnt)
+        tx_meta_iter.close()
+        self.assertEqual(self.solana.active_call_cnt, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import time
+import unittest
+
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+from logged_groups import logged_group
+
+from ..common_neon.utils import utils, json_dumps_bytes, str_preview
+
+
+@logged_group("neon.TestCases")
+class TestJsonCodec(unittest.TestCase):
+    @staticmethod
+    def _get_log_list(log_cnt: int) -> List[Dict[str, Any]]:
+        return [
+            {
+                'address': f'0x{idx:040x}',
+                'topics': [f'0x{idx + topic_idx:064x}' for topic_idx in range(3)],
+                'data': '0x' + 'ab' * 256,
+                'blockNumber': hex(idx // 10),
+                'blockHash': f'0x{idx // 10:064x}',
+                'transactionHash': f'0x{idx // 5:064x}',
+                'transactionIndex': hex(idx % 10),
+                'transactionLogIndex': hex(idx % 5),
+                'logIndex': hex(idx),
+                'removed': False,
+            }
+            for idx in range(log_cnt)
+        ]
+
+    def test_same_result_as_stdlib(self):
+        response = {'jsonrpc': '2.0', 'id': 1, 'result': self._get_log_list(10), 'error': None}
+        self.assertEqual(json.loads(json_dumps_bytes(response)), response)
+
+        # bytes are encoded as in JsonBytesEncoder
+        self.assertEqual(json.loads(json_dumps_bytes({'data': b'\x01\x02', 'raw': bytearray(b'\xff')})),
+                         {'data': '0102', 'raw': 'ff'})
+
+        # orjson doesn't support big integers, the stdlib encoder is used for them
+        self.assertEqual(json.loads(json_dumps_bytes({'value': 2 ** 100})), {'value': 2 ** 100})
+
+        with patch.object(utils, 'orjson', None):
+            self.assertEqual(json.loads(json_dumps_bytes(response)), response)
+            self.assertEqual(json.loads(json_dumps_bytes({'data': b'\x01'})), {'data': '01'})
+
+        with self.assertRaises(TypeError):
+            json_dumps_bytes({'value': object()})
+
+    def test_str_preview(self):
+        self.assertEqual(str_preview(b'{"id": 1}'), '{"id": 1}')
+        self.assertEqual(str_preview('x' * 10, max_len=4), 'xxxx... (10 chars)')
+        self.assertEqual(str_preview(b'x' * 10, max_len=4), 'xxxx... (10 bytes)')
+
+        with patch.object(utils, 'LOG_FULL_OBJECT_INFO', True):
+            self.assertEqual(str_preview(b'x' * 10, max_len=4), 'x' * 10)
+
+    def test_benchmark_1000_logs(self):
+        response = {'jsonrpc': '2.0', 'id': 1, 'result': self._get_log_list(1000)}
+        repeat_cnt = 20
+
+        start_time = time.monotonic()
+        for _ in range(repeat_cnt):
+            # the previous path: the full response is serialized for the log and for the body
+            log_msg = json.dumps(response)
+            body = json.dumps(response).encode('utf8')
+        stdlib_time = (time.monotonic() - start_time) / repeat_cnt
+
+        start_time = time.monotonic()
+        for _ in range(repeat_cnt):
+            new_body = json_dumps_bytes(response)
+            new_log_msg = str_preview(new_body)
+        codec_time = (time.monotonic() - start_time) / repeat_cnt
+
+        self.assertEqual(json.loads(new_body), json.loads(body))
+        self.assertLess(len(new_log_msg), len(log_msg))
+        self.info(
+            f'1000 logs ({len(body)} bytes): json.dumps x2 {stdlib_time * 1000:.3f} ms, '
+            f'json_dumps_bytes with preview {codec_time * 1000:.3f} ms (orjson: {utils.orjson is not None})'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+
+from sha3 import keccak_256
+
+from ..common_neon.logs_bloom import EMPTY_LOGS_BLOOM, calc_logs_bloom, logs_bloom_bits, logs_bloom_to_hex
+from ..common_neon.utils import SolanaBlockInfo
+from ..indexer.neon_txs_db import NeonTxsDB
+from ..indexer.solana_blocks_db import SolBlocksDB
+
+
+TRANSFER_EVENT = '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef'
+
+
+def new_transfer_log(token: int, from_addr: int, to_addr: int) -> dict:
+    return {
+        'address': f'0x{token:040x}',
+        'topics': [TRANSFER_EVENT, f'0x{from_addr:064x}', f'0x{to_addr:064x}'],
+        'data': '0x' + '00' * 32,
+    }
+
+
+def has_value(logs_bloom: int, value: bytes) -> bool:
+    bits = logs_bloom_bits(value)
+    return (logs_bloom & bits) == bits
+
+
+class TestLogsBloom(unittest.TestCase):
+    def test_ethereum_vectors(self):
+        # the vectors from go-ethereum core/types/bloom9_test.go
+        logs_bloom = 0
+        for idx in range(100):
+            logs_bloom |= logs_bloom_bits(f'xxxxxxxxxx data {idx} yyyyyyyyyyyyyy'.encode('utf8'))
+        self.assertEqual(
+            keccak_256(bytes.fromhex(logs_bloom_to_hex(logs_bloom)[2:])).hexdigest(),
+            'c8d3ca65cdb4874300a9e39475508f23ed6da09fdbc487f89a2dcf50b09eb263'
+        )
+
+        logs_bloom = 0
+        for value in (b'testtest', b'test', b'hallo', b'other'):
+            logs_bloom |= logs_bloom_bits(value)
+        for value in (b'testtest', b'test', b'hallo', b'other'):
+            self.assertTrue(has_value(logs_bloom, value))
+        for value in (b'tes', b'lo'):
+            self.assertFalse(has_value(logs_bloom, value))
+
+    def test_logs_bloom(self):
+        self.assertEqual(calc_logs_bloom([]), 0)
+        self.assertEqual(logs_bloom_to_hex(0), EMPTY_LOGS_BLOOM)
+        self.assertEqual(len(EMPTY_LOGS_BLOOM), 2 + 512)
+
+        log_list = [new_transfer_log(1, 2, 3), new_transfer_log(4, 3, 5)]
+        logs_bloom = calc_logs_bloom(log_list)
+        for log in log_list:
+            for value in [log['address']] + log['topics']:
+                self.assertTrue(has_value(logs_bloom, bytes.fromhex(value[2:])))
+        # the data isn't added to the bloom
+        self.assertEqual(logs_bloom, calc_logs_bloom([dict(log, data='0x01') for log in log_list]))
+        self.assertFalse(has_value(logs_bloom, bytes.fromhex(f'{6:040x}')))
+        # each value sets at most 3 of 2048 bits
+        self.assertLessEqual(bin(logs_bloom).count('1'), 3 * 7)
+
+    def test_receipt_bloom_from_db_row(self):
+        txs_db = NeonTxsDB()
+        log_list = [new_transfer_log(1, 2, 3)]
+        value_dict = {column: '0x1' for column in txs_db._column_list}
+        value_dict.update({'sol_sig': 'sig', 'sol_ix_idx': 0, 'sol_ix_inner_idx': 0, 'block_slot': 1, 'tx_idx': 0})
+
+        for logs_bloom in (logs_bloom_to_hex(calc_logs_bloom(log_list)), None):
+            # None is the row indexed before blooms, the bloom is calculated from the stored logs
+            value_dict.update({'logs': log_list, 'logs_bloom': logs_bloom})
+            value_list = [txs_db._encode_value(column, value_dict[column]) for column in txs_db._column_list]
+            tx = txs_db._tx_from_value(value_list + [b'\x01' * 32])
+            self.assertEqual(tx.neon_tx_res.logs_bloom, logs_bloom_to_hex(calc_logs_bloom(log_list)))
+
+        # the empty bloom isn't stored
+        self.assertIsNone(txs_db._encode_value('logs_bloom', EMPTY_LOGS_BLOOM))
+        value_dict.update({'logs': [], 'logs_bloom': None})
+        value_list = [txs_db._encode_value(column, value_dict[column]) for column in txs_db._column_list]
+        self.assertEqual(txs_db._tx_from_value(value_list + [None]).neon_tx_res.logs_bloom, EMPTY_LOGS_BLOOM)
+
+    def test_block_bloom_in_db(self):
+        # the test rows are placed far from the real slots
+        start_block_slot = 10 ** 15
+        blocks_db = SolBlocksDB()
+        logs_bloom = logs_bloom_to_hex(calc_logs_bloom([new_transfer_log(1, 2, 3)]))
+        block_list = [
+            SolanaBlockInfo(block_slot=start_block_slot, block_hash=f'0x{1:064x}', block_time=1, is_finalized=True),
+            SolanaBlockInfo(
+                block_slot=start_block_slot + 1, block_hash=f'0x{2:064x}', block_time=1, is_finalized=True,
+                logs_bloom=logs_bloom
+            ),
+        ]
+        try:
+            with blocks_db.conn() as conn:
+                with conn.cursor() as cursor:
+                    blocks_db.set_block_list(cursor, iter(block_list))
+
+            block_list = blocks_db.get_block_list_by_slot_range(start_block_slot - 1, start_block_slot + 1)
+            self.assertEqual([block.logs_bloom for block in block_list], [None, logs_bloom])
+            self.assertEqual(block_list[1].parent_block_hash, f'0x{1:064x}')
+        finally:
+            with blocks_db._cursor() as cursor:
+                cursor.execute('DELETE FROM solana_blocks WHERE block_slot >= %s', (start_block_slot,))
+
+
+if __name__ == '__main__':
+    unittest.main()
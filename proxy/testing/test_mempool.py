@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 from random import randint
 
 from web3 import Web3, Account
 from eth_account.account import LocalAccount
-from typing import Any, List, Dict, Optional, Union
+from typing import Any, List, Dict, Optional, Tuple, Union, Callable
 
 import unittest
 from unittest.mock import patch, MagicMock, call
@@ -16,7 +17,7 @@ from ..common_neon.data import NeonTxExecCfg
 from ..common_neon.solana_transaction import SolPubKey
 
 from ..mempool.mempool import MemPool, IMPExecutor, MPTask, MPTxRequestList
-from ..mempool.mempool_api import MPRequest, MPRequestType
+from ..mempool.mempool_api import MPRequest, MPRequestType, MPTxRequest
 from ..mempool.mempool_api import MPTxExecRequest, MPTxExecResult, MPTxExecResultCode
 from ..mempool.mempool_api import MPGasPriceResult, MPSenderTxCntData
 from ..mempool.mempool_schedule import MPTxSchedule, MPSenderTxPool
@@ -71,6 +72,14 @@ class MockTask:
     def exception(self):
         return self._exception
 
+    def add_done_callback(self, fn: Callable[[MockTask], None]) -> None:
+        if self._is_done:
+            asyncio.get_event_loop().call_soon(fn, self)
+
+
+def get_pending_mp_task(mp_request: MPRequest) -> MPTask:
+    return MPTask(1, MockTask(None, is_done=False), mp_request)
+
 
 class MockMPExecutor(IMPExecutor):
     def submit_mp_request(self, mp_request: MPRequest) -> MPTask:
@@ -148,8 +157,7 @@ class TestMemPool(unittest.IsolatedAsyncioTestCase):
         submit_mp_request_mock.assert_called_once()
         submit_mp_request_mock.assert_called_with(mp_tx_request)
 
-    @patch.object(MockMPExecutor, "submit_mp_request",
-                  return_value=(1, MockTask(MPTxExecResult(MPTxExecResultCode.Done, None))))
+    @patch.object(MockMPExecutor, "submit_mp_request", side_effect=get_pending_mp_task)
     @patch.object(MockMPExecutor, "is_available", return_value=False)
     async def test_single_sender_couple_txs(self, is_available_mock: MagicMock, submit_mp_request_mock: MagicMock):
         """Checks if an enqueued mp_tx_requests get in effect in the right order"""
@@ -172,8 +180,7 @@ class TestMemPool(unittest.IsolatedAsyncioTestCase):
         await asyncio.sleep(MemPool.CHECK_TASK_TIMEOUT_SEC * 2)
         submit_mp_request_mock.assert_has_calls([call(requests[0]), call(requests[1])])
 
-    @patch.object(MockMPExecutor, "submit_mp_request",
-                  return_value=(1, MockTask(MPTxExecResult(MPTxExecResultCode.Done, None))))
+    @patch.object(MockMPExecutor, "submit_mp_request", side_effect=get_pending_mp_task)
     @patch.object(MockMPExecutor, "is_available", return_value=False)
     async def test_2_senders_4_txs(self, is_available_mock: MagicMock, submit_mp_request_mock: MagicMock):
         """Checks if an enqueued mp_tx_request from different senders gets in effect in the right order"""
@@ -201,7 +208,7 @@ class TestMemPool(unittest.IsolatedAsyncioTestCase):
     @patch.object(MockMPExecutor, "is_available")
     async def test_mp_waits_for_previous_tx_done(self, is_available_mock: MagicMock, submit_mp_request_mock: MagicMock):
         """Checks if an enqueued mp_tx_request waits for the previous one from the same sender"""
-        submit_mp_request_mock.return_value = (1, MockTask(None, is_done=False))
+        submit_mp_request_mock.side_effect = get_pending_mp_task
         is_available_mock.return_value = False
         acc_0 = create_account()
         acc_1 = create_account()
@@ -272,8 +279,7 @@ class TestMemPool(unittest.IsolatedAsyncioTestCase):
         acc_1_count = self._mempool.get_pending_tx_count(requests[3].sender_address)
         self.assertEqual(acc_1_count, 2)
 
-    @patch.object(MockMPExecutor, "submit_mp_request",
-                  return_value=(1, MockTask(MPTxExecResult(MPTxExecResultCode.Done, None))))
+    @patch.object(MockMPExecutor, "submit_mp_request", side_effect=get_pending_mp_task)
     @patch.object(MockMPExecutor, "is_available")
     async def test_over_9000_transfers(self, is_available_mock: MagicMock, submit_mp_request_mock: MagicMock):
         """Checks if all mp_tx_requests are processed by the MemPool"""
@@ -327,6 +333,104 @@ class TestMemPool(unittest.IsolatedAsyncioTestCase):
         self._mempool._tx_schedule.set_sender_state_tx_cnt_list(sender_tx_cnt_list)
 
 
+class FakeDelayedMPExecutor(IMPExecutor):
+    """Executes tx requests after random delays, other requests never complete"""
+    def __init__(self, executor_cnt: int):
+        self._available_cnt = executor_cnt
+        self.mempool: Optional[MemPool] = None
+        self.event_list: List[Tuple[str, str]] = []
+
+    def submit_mp_request(self, mp_request: MPRequest) -> MPTask:
+        if mp_request.type != MPRequestType.SendTransaction:
+            return MPTask(0, asyncio.get_event_loop().create_future(), mp_request)
+
+        self._available_cnt -= 1
+        return MPTask(1, asyncio.get_event_loop().create_task(self._execute(mp_request)), mp_request)
+
+    async def _execute(self, tx: MPTxExecRequest) -> MPTxExecResult:
+        await asyncio.sleep(random.uniform(0.001, 0.02))
+        self.event_list.append(('done', tx.sig))
+        return MPTxExecResult(MPTxExecResultCode.Done, NeonTxExecCfg().set_state_tx_cnt(tx.nonce + 1))
+
+    def is_available(self) -> bool:
+        return self._available_cnt > 0
+
+    def release_executor(self, executor_id: int):
+        self._available_cnt += 1
+        self.mempool.on_executor_got_available(executor_id)
+
+
+class EventListMemPool(MemPool):
+    def __init__(self, *args, event_list: List[Tuple[str, str]]):
+        super().__init__(*args)
+        self.event_list = event_list
+        self.complete_task_list: List[Optional[asyncio.Task]] = []
+
+    def _on_done_tx(self, tx: MPTxRequest):
+        self.event_list.append(('complete', tx.sig))
+        # the done callback runs outside of tasks, a polling loop runs inside of its task
+        self.complete_task_list.append(asyncio.current_task())
+        super()._on_done_tx(tx)
+
+
+class TestMemPoolTaskCompletion(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        TestMemPool.turn_logger_off()
+
+    async def asyncSetUp(self):
+        self._executor = FakeDelayedMPExecutor(executor_cnt=4)
+        self._mempool = EventListMemPool(
+            FakeConfig(), MockResourceManager(None), self._executor, event_list=self._executor.event_list
+        )
+        self._executor.mempool = self._mempool
+
+        # periodic tasks aren't tested here
+        for task_loop in (self._mempool._gas_price_task_loop, self._mempool._elf_param_dict_task_loop,
+                          self._mempool._state_tx_cnt_task_loop, self._mempool._op_res_init_task_loop,
+                          self._mempool._free_alt_queue_task_loop):
+            task_loop._task_loop.cancel()
+        price_result = MPGasPriceResult(suggested_gas_price=1, min_gas_price=1)
+        self._mempool._gas_price_task_loop._gas_price = price_result
+
+    async def test_results_in_done_callbacks_and_idle_loop(self):
+        """Checks that results are processed by done callbacks of executor tasks, and that idle mempool only waits"""
+        sender_cnt, nonce_cnt = 10, 5
+        to_acc = create_account()
+        for from_acc in [create_account() for _ in range(sender_cnt)]:
+            for nonce in range(nonce_cnt):
+                request = get_transfer_mp_request(
+                    req_id=f'{from_acc.address}-{nonce}', nonce=nonce, gas_price=randint(50000, 100000),
+                    gas=1000, from_acc=from_acc, to_acc=to_acc
+                )
+                await self._mempool.enqueue_mp_request(request)
+
+        tx_cnt = sender_cnt * nonce_cnt
+        for _ in range(500):
+            if len(self._mempool.complete_task_list) == tx_cnt:
+                break
+            await asyncio.sleep(0.01)
+        self.assertEqual(len(self._mempool.complete_task_list), tx_cnt)
+        self.assertEqual(self._mempool._tx_schedule.get_tx_count(), 0)
+
+        # each result is processed after the executor is done, and not by a task
+        event_list = self._executor.event_list
+        for sig in {sig for _, sig in event_list}:
+            self.assertLess(event_list.index(('done', sig)), event_list.index(('complete', sig)))
+        self.assertEqual(self._mempool.complete_task_list, [None] * tx_cnt)
+
+        # kick tasks of released executors
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # the schedule loop waits for the condition, there are no periodic wakeups
+        task_list = [
+            task for task in asyncio.all_tasks()
+            if (task is not asyncio.current_task()) and (not task.done())
+        ]
+        self.assertEqual(task_list, [self._mempool._process_tx_schedule_task_loop])
+        self.assertEqual(task_list[0].get_coro().cr_await.__qualname__, 'Condition.wait')
+
+
 class TestMPSchedule(unittest.TestCase):
 
     @classmethod
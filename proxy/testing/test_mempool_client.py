@@ -0,0 +1,173 @@
+import asyncio
+import pickle
+import random
+import socket
+import struct
+import threading
+import time
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Tuple
+
+from logged_groups import logged_group
+
+from ..mempool.mempool_client import MemPoolClient
+
+
+def _encode_pickable(data: Any) -> bytes:
+    payload = pickle.dumps(data)
+    return struct.pack("!I", len(payload)) + payload
+
+
+class FakeMemPoolSrv:
+    """
+    Stand-in for AddrPickableDataSrv: length-prefixed pickled requests, one request at a time per connection.
+    Answers after a random delay, so responses of different connections arrive out of order.
+    """
+    MAX_DELAY_SEC = 0.01
+
+    def __init__(self):
+        self._event_loop = asyncio.new_event_loop()
+        self._server = self._event_loop.run_until_complete(
+            asyncio.start_server(self._handle_client, host='127.0.0.1', port=0)
+        )
+        self.address: Tuple[str, int] = self._server.sockets[0].getsockname()
+        self.conn_cnt = 0
+        self.in_flight_cnt = 0
+        self.max_in_flight_cnt = 0
+        self._thread = threading.Thread(target=self._event_loop.run_forever, daemon=True)
+        self._thread.start()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.conn_cnt += 1
+        try:
+            while True:
+                data_len = struct.unpack("!I", await reader.readexactly(4))[0]
+                request = pickle.loads(await reader.readexactly(data_len))
+                self.in_flight_cnt += 1
+                self.max_in_flight_cnt = max(self.max_in_flight_cnt, self.in_flight_cnt)
+                await asyncio.sleep(random.uniform(0, self.MAX_DELAY_SEC))
+                self.in_flight_cnt -= 1
+                writer.write(_encode_pickable(request.req_id))
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    def stop(self) -> None:
+        self._event_loop.call_soon_threadsafe(self._event_loop.stop)
+        self._thread.join()
+
+
+class FakePickableDataClient:
+    """Stand-in for AddrPickableDataClient with the same wire format"""
+    def __init__(self, address: Tuple[str, int]):
+        self._sock = socket.create_connection(address)
+
+    def _recv(self, size: int) -> bytes:
+        data = b''
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if len(chunk) == 0:
+                raise ConnectionError('Connection is closed')
+            data += chunk
+        return data
+
+    def send_data(self, data: Any) -> Any:
+        self._sock.sendall(_encode_pickable(data))
+        data_len = struct.unpack("!I", self._recv(4))[0]
+        return pickle.loads(self._recv(data_len))
+
+
+class FakeMemPoolClient(MemPoolClient):
+    def _create_client(self) -> FakePickableDataClient:
+        return FakePickableDataClient(self._address)
+
+
+@logged_group("neon.TestCases")
+class TestMemPoolClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.srv = FakeMemPoolSrv()
+
+    def tearDown(self) -> None:
+        self.srv.stop()
+
+    @staticmethod
+    def _call_concurrently(client: MemPoolClient, caller_cnt: int, request_cnt: int) -> Tuple[list, float]:
+        start_time = time.monotonic()
+        with ThreadPoolExecutor(max_workers=caller_cnt) as executor:
+            result_list = list(executor.map(lambda i: client.get_gas_price(f'req-{i}'), range(request_cnt)))
+        return result_list, time.monotonic() - start_time
+
+    def test_responses_are_routed_to_callers(self):
+        client = FakeMemPoolClient(self.srv.address, 8)
+        result_list, _ = self._call_concurrently(client, 32, 256)
+        self.assertEqual(result_list, [f'req-{i}' for i in range(256)])
+        self.assertEqual(self.srv.conn_cnt, 8)
+
+    def test_broken_connection_is_replaced(self):
+        client = FakeMemPoolClient(self.srv.address, 2)
+        client.RECONNECT_MP_TIME_SEC = 0.01
+
+        broken_client = client._conn_queue.get()
+        broken_client._sock.close()
+        client._conn_queue.put(broken_client)
+
+        for i in range(4):
+            try:
+                client.get_gas_price('req')
+            except OSError:
+                break
+        time.sleep(0.1)
+
+        self.assertEqual(client._alive_conn_cnt, 2)
+        result_list, _ = self._call_concurrently(client, 4, 16)
+        self.assertEqual(result_list, [f'req-{i}' for i in range(16)])
+
+    def test_no_free_connection(self):
+        client = FakeMemPoolClient(self.srv.address, 1)
+        client.WAIT_CONN_TIME_SEC = 0.01
+
+        busy_client = client._conn_queue.get()
+        with self.assertRaises(ConnectionError):
+            client.get_gas_price('req')
+
+        client._conn_queue.put(busy_client)
+        self.assertEqual(client.get_gas_price('req'), 'req')
+
+    def test_concurrent_reconnects(self):
+        client = FakeMemPoolClient(self.srv.address, 2)
+        client.RECONNECT_MP_TIME_SEC = 0.01
+
+        # both connections are dropped by concurrent callers, only one reconnection is scheduled
+        for _ in range(2):
+            client._conn_queue.get()
+            client._alive_conn_cnt -= 1
+        thread_list = [threading.Thread(target=client._reconnect_mp) for _ in range(8)]
+        for thread in thread_list:
+            thread.start()
+        for thread in thread_list:
+            thread.join()
+        time.sleep(0.1)
+
+        self.assertEqual(client._alive_conn_cnt, 2)
+        self.assertEqual(client._conn_queue.qsize(), 2)
+        self.assertEqual(self.srv.conn_cnt, 4)
+
+    def test_throughput_with_32_callers(self):
+        caller_cnt, request_cnt = 32, 320
+        for conn_cnt in (1, 8, 32):
+            self.srv.max_in_flight_cnt = 0
+            client = FakeMemPoolClient(self.srv.address, conn_cnt)
+            result_list, duration = self._call_concurrently(client, caller_cnt, request_cnt)
+            self.assertEqual(len(result_list), request_cnt)
+            self.info(
+                f'{caller_cnt} callers, {conn_cnt} connections: {request_cnt / duration:.1f} requests per second'
+            )
+            # MemPool processes requests of different connections concurrently
+            self.assertLessEqual(self.srv.max_in_flight_cnt, conn_cnt)
+            self.assertGreater(self.srv.max_in_flight_cnt, conn_cnt // 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
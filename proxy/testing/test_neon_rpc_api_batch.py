@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from logged_groups import logged_group
+
+from ..common_neon.errors import EthereumError
+from ..plugin.neon_rpc_api_plugin import NeonRpcApiPlugin
+
+
+class FakeNeonRpcApiWorker:
+    CALL_DELAY_SEC = 0.05
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active_call_cnt = 0
+        self.max_active_call_cnt = 0
+
+    def set_stat_exporter(self, _):
+        pass
+
+    @staticmethod
+    def is_allowed_api(method_name: str) -> bool:
+        return method_name.startswith('eth_')
+
+    def eth_getBalance(self, account: str, tag: str) -> str:
+        with self._lock:
+            self.active_call_cnt += 1
+            self.max_active_call_cnt = max(self.max_active_call_cnt, self.active_call_cnt)
+        time.sleep(self.CALL_DELAY_SEC)
+        with self._lock:
+            self.active_call_cnt -= 1
+        if account == 'bad':
+            raise EthereumError(message='bad account')
+        elif account == 'crash':
+            raise RuntimeError('unexpected error')
+        return hex(int(account, 16))
+
+
+@logged_group("neon.TestCases")
+class TestNeonRpcApiBatch(unittest.TestCase):
+    def setUp(self) -> None:
+        with patch.object(NeonRpcApiPlugin, 'getModel', return_value=FakeNeonRpcApiWorker()):
+            self.plugin = NeonRpcApiPlugin(uuid.uuid4(), None, None, None)
+
+    @staticmethod
+    def _get_balance_request(req_id: int, account: str):
+        return {'jsonrpc': '2.0', 'id': req_id, 'method': 'eth_getBalance', 'params': [account, 'latest']}
+
+    def _process_batch(self, request_list, thread_cnt: int = 8):
+        with ThreadPoolExecutor(max_workers=thread_cnt) as executor:
+            with patch.object(NeonRpcApiPlugin, 'getBatchExecutor', return_value=executor):
+                return self.plugin.process_batch_request(request_list)
+
+    def test_response_order(self):
+        request_list = [self._get_balance_request(i, hex(i)) for i in range(40)]
+        response_list = self._process_batch(request_list)
+
+        self.assertEqual([r['id'] for r in response_list], list(range(40)))
+        self.assertEqual([r['result'] for r in response_list], [hex(i) for i in range(40)])
+
+    def test_error_isolation(self):
+        request_list = [
+            self._get_balance_request(1, '0x1'),
+            self._get_balance_request(2, 'bad'),
+            self._get_balance_request(3, 'crash'),
+            {'jsonrpc': '2.0', 'id': 4, 'method': 'unknown_method', 'params': []},
+            self._get_balance_request(5, '0x5'),
+        ]
+        response_list = self._process_batch(request_list)
+
+        self.assertEqual([r['id'] for r in response_list], [1, 2, 3, 4, 5])
+        self.assertEqual(response_list[0]['result'], '0x1')
+        self.assertEqual(response_list[1]['error']['message'], 'bad account')
+        self.assertEqual(response_list[2]['error']['message'], 'unexpected error')
+        self.assertEqual(response_list[3]['error']['code'], -32601)
+        self.assertEqual(response_list[4]['result'], '0x5')
+
+    def test_batch_size_limit(self):
+        batch_size = self.plugin._config.max_rpc_batch_size + 1
+        request_list = [self._get_balance_request(i, hex(i)) for i in range(batch_size)]
+        with self.assertRaises(Exception) as ctx:
+            self._process_batch(request_list)
+        self.assertIn('Too big batch request', str(ctx.exception))
+
+        with self.assertRaises(Exception):
+            self._process_batch([])
+
+    def test_concurrency_scales_with_pool_size(self):
+        request_list = [self._get_balance_request(i, hex(i)) for i in range(32)]
+        worker = self.plugin.model
+
+        for thread_cnt in (1, 4, 16):
+            worker.max_active_call_cnt = 0
+            start_time = time.monotonic()
+            response_list = self._process_batch(request_list, thread_cnt)
+            spent_time = time.monotonic() - start_time
+            self.info(f'Batch of {len(request_list)} requests with {thread_cnt} threads: {spent_time:.3f} sec')
+
+            self.assertEqual([r['result'] for r in response_list], [hex(i) for i in range(32)])
+            # the requests of the batch are processed in parallel, up to the pool size
+            self.assertLessEqual(worker.max_active_call_cnt, thread_cnt)
+            self.assertGreater(worker.max_active_call_cnt, thread_cnt // 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,361 @@
+import base64
+import json
+import secrets
+import select
+import socket
+import struct
+import threading
+import unittest
+import uuid
+
+from typing import Any, Dict, List, Tuple
+from unittest.mock import patch
+
+from logged_groups import logged_group
+
+from ..common.flags import Flags
+from ..common.utils import build_websocket_handshake_request
+from ..core.connection import TcpClientConnection
+from ..http.handler import HttpProtocolHandler
+from ..http.parser import HttpParser, httpParserTypes
+from ..http.websocket import WebsocketFrame, websocketOpcodes
+from ..indexer.indexer_db import IndexerDB
+from ..indexer.neon_tx_logs_db import NeonTxLogsDB
+from ..indexer.solana_blocks_db import SolBlocksDB
+from ..neon_rpc_api_model import NeonSubscriptionFeed, NeonSubscriber, NeonLogFilter
+from ..plugin.neon_rpc_api_plugin import NeonRpcApiPlugin
+from ..statistics_exporter.prometheus_proxy_exporter import PrometheusExporter
+
+
+class FakeNeonRpcApiWorker:
+    def set_stat_exporter(self, _):
+        pass
+
+    def stat_commit_account_cache(self):
+        pass
+
+    @staticmethod
+    def is_allowed_api(method_name: str) -> bool:
+        return method_name.startswith('eth_')
+
+    @staticmethod
+    def eth_chainId() -> str:
+        return hex(111)
+
+
+class FakeClient:
+    def __init__(self):
+        self.buffer: List[memoryview] = []
+
+    def queue(self, mv: memoryview) -> None:
+        self.buffer.append(mv)
+
+
+class JsonRpcWebsocketClient:
+    def __init__(self, port: int):
+        self._sock = socket.create_connection(('127.0.0.1', port), timeout=10)
+        key = base64.b64encode(secrets.token_bytes(16))
+        self._sock.sendall(build_websocket_handshake_request(key, url=b'/solana'))
+
+        response = HttpParser(httpParserTypes.RESPONSE_PARSER)
+        response.parse(self._sock.recv(4096))
+        assert response.header(b'Sec-Websocket-Accept') == WebsocketFrame.key_to_accept(key)
+
+        self._req_id = 0
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def _recv_exactly(self, size: int) -> bytes:
+        data = b''
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('connection is closed')
+            data += chunk
+        return data
+
+    def recv_frame(self) -> Tuple[int, bytes]:
+        header = self._recv_exactly(2)
+        opcode, payload_len = header[0] & 0x0f, header[1] & 0x7f
+        if payload_len == 126:
+            payload_len, = struct.unpack('!H', self._recv_exactly(2))
+        elif payload_len == 127:
+            payload_len, = struct.unpack('!Q', self._recv_exactly(8))
+        return opcode, self._recv_exactly(payload_len)
+
+    def recv(self) -> Any:
+        opcode, data = self.recv_frame()
+        assert opcode == websocketOpcodes.TEXT_FRAME, opcode
+        return json.loads(data)
+
+    def send(self, data: Any) -> None:
+        frame = WebsocketFrame()
+        frame.fin = True
+        frame.opcode = websocketOpcodes.TEXT_FRAME
+        frame.masked = True
+        frame.data = json.dumps(data).encode('utf8')
+        self._sock.sendall(frame.build())
+
+    def call(self, method: str, *params) -> Dict[str, Any]:
+        self._req_id += 1
+        self.send({'jsonrpc': '2.0', 'id': self._req_id, 'method': method, 'params': list(params)})
+        response = self.recv()
+        assert response['id'] == self._req_id, response
+        return response
+
+
+@logged_group("neon.TestCases")
+class TestNeonSubscriptionFeed(unittest.TestCase):
+    # the test rows are placed far from the real slots and removed after each test
+    start_block_slot = 10 ** 15
+
+    def setUp(self) -> None:
+        self.blocks_db = SolBlocksDB()
+        self.logs_db = NeonTxLogsDB()
+        self._clear()
+
+        self.latest_block_slot = self.start_block_slot
+        self.indexer_db = IndexerDB()
+        self.latest_patch = patch.object(
+            self.indexer_db, 'get_latest_block_slot', side_effect=lambda: self.latest_block_slot
+        )
+        self.latest_patch.start()
+
+        self.feed = NeonSubscriptionFeed(self.indexer_db)
+        self.feed._poll_sec = 0.05
+        self.patch_list = [
+            self.latest_patch,
+            patch.object(NeonRpcApiPlugin, 'getModel', return_value=FakeNeonRpcApiWorker()),
+            patch.object(NeonRpcApiPlugin, 'getSubscriptionFeed', return_value=self.feed),
+            # the metrics are collected by the proxy process, they aren't a part of this test
+            patch.object(PrometheusExporter, 'stat_commit_request_and_timeout'),
+        ]
+        for p in self.patch_list[1:]:
+            p.start()
+
+        self.flags = Flags()
+        self.flags.plugins = Flags.load_plugins(
+            b'proxy.http.server.HttpWebServerPlugin,proxy.plugin.neon_rpc_api_plugin.NeonRpcApiPlugin'
+        )
+        self.server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_sock.bind(('127.0.0.1', 0))
+        self.server_sock.listen(8)
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def tearDown(self) -> None:
+        self.server_sock.close()
+        for p in self.patch_list:
+            p.stop()
+        self._clear()
+
+    def _serve(self) -> None:
+        while True:
+            try:
+                conn, addr = self.server_sock.accept()
+            except OSError:
+                return
+            handler = HttpProtocolHandler(TcpClientConnection(conn, addr), flags=self.flags)
+            threading.Thread(target=handler.run, daemon=True).start()
+
+    def _connect(self) -> JsonRpcWebsocketClient:
+        return JsonRpcWebsocketClient(self.server_sock.getsockname()[1])
+
+    def _clear(self) -> None:
+        for db in (self.blocks_db, self.logs_db):
+            with db._cursor() as cursor:
+                cursor.execute(f'DELETE FROM {db._table_name} WHERE block_slot >= %s', (self.start_block_slot,))
+
+    @staticmethod
+    def _block_hash(block_slot: int) -> str:
+        return f'0x{block_slot:064x}'
+
+    def _add_block(self, block_slot: int, log_list: List[Tuple[str, List[str]]], is_active: bool = True) -> None:
+        log_value_list_list: List[List[Any]] = []
+        for tx_log_idx, (address, topic_list) in enumerate(log_list):
+            value_dict: Dict[str, Any] = {
+                'block_slot': block_slot,
+                'tx_idx': tx_log_idx // 2,
+                'tx_log_idx': tx_log_idx,
+                'log_idx': tx_log_idx,
+                'address': self.logs_db._encode_hex(address),
+                'log_data': b'',
+                'tx_hash': (tx_log_idx // 2).to_bytes(32, 'big'),
+            }
+            for topic_idx in range(4):
+                topic = topic_list[topic_idx] if topic_idx < len(topic_list) else None
+                value_dict[f'topic{topic_idx}'] = self.logs_db._encode_hex(topic) if topic is not None else None
+            log_value_list_list.append([value_dict[column] for column in self.logs_db._column_list])
+
+        with self.blocks_db.conn() as conn:
+            with conn.cursor() as cursor:
+                self.blocks_db._insert_batch(cursor, [[
+                    block_slot, self.blocks_db._encode_hex(self._block_hash(block_slot)),
+                    block_slot, block_slot - 1, False, is_active, None
+                ]])
+                self.logs_db._insert_batch(cursor, log_value_list_list)
+
+    def _recv_notification_list(self, client: JsonRpcWebsocketClient, cnt: int) -> List[Tuple[str, str, Any]]:
+        notification_list: List[Tuple[str, str, Any]] = []
+        for _ in range(cnt):
+            notification = client.recv()
+            self.assertEqual(notification['method'], 'eth_subscription')
+            sub_id, result = notification['params']['subscription'], notification['params']['result']
+            if 'topics' in result:
+                notification_list.append((sub_id, result['blockNumber'], result['transactionLogIndex']))
+            else:
+                notification_list.append((sub_id, result['number'], result['parentHash']))
+        return notification_list
+
+    def test_delivery_order(self):
+        address_a, address_b = '0x' + 'aa' * 20, '0x' + 'bb' * 20
+        topic_x, topic_y, topic_z = ['0x' + c * 64 for c in 'abc']
+
+        client = self._connect()
+        try:
+            head_sub_id = client.call('eth_subscribe', 'newHeads')['result']
+            all_log_sub_id = client.call('eth_subscribe', 'logs', {})['result']
+            address_sub_id = client.call('eth_subscribe', 'logs', {'address': '0x' + address_b[2:].upper()})['result']
+            topic_sub_id = client.call('eth_subscribe', 'logs', {'topics': [None, [topic_y, topic_z]]})['result']
+            # an ordinary request over the same connection
+            self.assertEqual(client.call('eth_chainId')['result'], hex(111))
+
+            slot = self.start_block_slot
+            self._add_block(slot + 1, [(address_a, [topic_x, topic_y]), (address_b, [topic_x])])
+            self._add_block(slot + 2, [])
+            # a block from a fork is skipped
+            self._add_block(slot + 3, [(address_b, [topic_y])], is_active=False)
+            self._add_block(slot + 4, [(address_b, [topic_z, topic_z]), (address_a, [topic_z])])
+            self.latest_block_slot = slot + 4
+
+            expected_list = [
+                (head_sub_id, hex(slot + 1), self.blocks_db._generate_fake_block_hash(slot)),
+                (all_log_sub_id, hex(slot + 1), '0x0'),
+                (topic_sub_id, hex(slot + 1), '0x0'),
+                (all_log_sub_id, hex(slot + 1), '0x1'),
+                (address_sub_id, hex(slot + 1), '0x1'),
+                (head_sub_id, hex(slot + 2), self._block_hash(slot + 1)),
+                # the parent block from the fork isn't active
+                (head_sub_id, hex(slot + 4), self.blocks_db._generate_fake_block_hash(slot + 3)),
+                (all_log_sub_id, hex(slot + 4), '0x0'),
+                (address_sub_id, hex(slot + 4), '0x0'),
+                (topic_sub_id, hex(slot + 4), '0x0'),
+                (all_log_sub_id, hex(slot + 4), '0x1'),
+            ]
+            self.assertEqual(self._recv_notification_list(client, len(expected_list)), expected_list)
+
+            # the next blocks are sent after the previous ones
+            self._add_block(slot + 5, [(address_b, [topic_x])])
+            self.latest_block_slot = slot + 5
+            self.assertEqual(self._recv_notification_list(client, 3), [
+                (head_sub_id, hex(slot + 5), self._block_hash(slot + 4)),
+                (all_log_sub_id, hex(slot + 5), '0x0'),
+                (address_sub_id, hex(slot + 5), '0x0'),
+            ])
+        finally:
+            client.close()
+
+    def test_unsubscribe(self):
+        client = self._connect()
+        try:
+            head_sub_id = client.call('eth_subscribe', 'newHeads')['result']
+            log_sub_id = client.call('eth_subscribe', 'logs', {'address': '0x' + 'aa' * 20})['result']
+            self.assertNotEqual(head_sub_id, log_sub_id)
+
+            self.assertIs(client.call('eth_unsubscribe', head_sub_id)['result'], True)
+            self.assertIs(client.call('eth_unsubscribe', head_sub_id)['result'], False)
+            self.assertIn('error', client.call('eth_subscribe', 'newPendingTransactions'))
+            self.assertIn('error', client.call('eth_subscribe', 'logs', {'topics': 'bad'}))
+
+            self._add_block(self.start_block_slot + 1, [('0x' + 'aa' * 20, ['0x' + '11' * 32])])
+            self.latest_block_slot = self.start_block_slot + 1
+            self.assertEqual(
+                self._recv_notification_list(client, 1),
+                [(log_sub_id, hex(self.start_block_slot + 1), '0x0')]
+            )
+        finally:
+            client.close()
+
+    def test_subscribe_over_http(self):
+        plugin = NeonRpcApiPlugin(uuid.uuid4(), None, None, None)
+        request = {'jsonrpc': '2.0', 'id': 1, 'method': 'eth_subscribe', 'params': ['newHeads']}
+        response = plugin.process_request(request)
+        self.assertEqual(response['error']['code'], -32601)
+
+    def test_slow_client_is_disconnected(self):
+        client = FakeClient()
+        subscriber = NeonSubscriber(client, queue_size=3)
+        sub_id = subscriber.subscribe('newHeads')
+        subscriber.send_response(json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': sub_id}).encode('utf8'))
+
+        self.assertTrue(subscriber.notify({'number': '0x1'}, []))
+        self.assertTrue(subscriber.notify({'number': '0x2'}, []))
+        # nobody reads the buffer
+        self.assertFalse(subscriber.notify({'number': '0x3'}, []))
+        self.assertTrue(subscriber.is_closed)
+        self.assertEqual(len(client.buffer), 4)
+
+        close_frame = WebsocketFrame()
+        close_frame.parse(client.buffer[-1].tobytes() + b'\x00')
+        self.assertEqual(close_frame.opcode, websocketOpcodes.CONNECTION_CLOSE)
+        subscriber.close()
+
+    def test_pending_subscription_is_not_notified(self):
+        client = FakeClient()
+        subscriber = NeonSubscriber(client, queue_size=100)
+        subscriber.subscribe('newHeads')
+        subscriber.notify({'number': '0x1'}, [])
+        self.assertEqual(len(client.buffer), 0)
+        subscriber.close()
+
+    @staticmethod
+    def _is_woken_up(subscriber: NeonSubscriber) -> bool:
+        readable, _, _ = select.select([subscriber.wakeup_socket], [], [], 0)
+        return len(readable) > 0
+
+    def test_notification_wakes_up_handler(self):
+        client = FakeClient()
+        subscriber = NeonSubscriber(client, queue_size=100)
+        sub_id = subscriber.subscribe('logs', {'address': '0x' + 'aa' * 20})
+        # the response is sent by the handler thread, it doesn't wait for the wakeup
+        subscriber.send_response(json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': sub_id}).encode('utf8'))
+        self.assertFalse(self._is_woken_up(subscriber))
+
+        # nothing is queued for unmatched logs
+        subscriber.notify(None, [{'address': '0x' + 'bb' * 20, 'topics': []}])
+        self.assertFalse(self._is_woken_up(subscriber))
+
+        for _ in range(2):
+            subscriber.notify(None, [{'address': '0x' + 'aa' * 20, 'topics': []}])
+            self.assertTrue(self._is_woken_up(subscriber))
+        subscriber.read_wakeup()
+        self.assertFalse(self._is_woken_up(subscriber))
+        self.assertEqual(len(client.buffer), 3)
+        subscriber.close()
+
+    def test_plugin_waits_for_wakeup_socket(self):
+        plugin = NeonRpcApiPlugin(uuid.uuid4(), None, FakeClient(), None)
+        self.assertEqual(plugin.get_descriptors(), ([], []))
+
+        plugin.on_websocket_open()
+        subscriber = plugin._subscriber
+        self.assertEqual(plugin.get_descriptors(), ([subscriber.wakeup_socket], []))
+        self.assertFalse(plugin.read_from_descriptors([subscriber.wakeup_socket]))
+
+        plugin.on_websocket_close()
+        self.assertEqual(plugin.get_descriptors(), ([], []))
+        self.assertNotIn(subscriber, self.feed._subscriber_set)
+
+    def test_log_filter(self):
+        log = {'address': '0x' + 'AA' * 20, 'topics': ['0x01', '0x02']}
+        self.assertTrue(NeonLogFilter(None).match(log))
+        self.assertTrue(NeonLogFilter({'address': ['0x' + 'aa' * 20, '0x' + 'bb' * 20]}).match(log))
+        self.assertFalse(NeonLogFilter({'address': '0x' + 'bb' * 20}).match(log))
+        self.assertTrue(NeonLogFilter({'topics': ['0x01']}).match(log))
+        self.assertTrue(NeonLogFilter({'topics': [None, ['0x03', '0x02']]}).match(log))
+        self.assertFalse(NeonLogFilter({'topics': ['0x02']}).match(log))
+        self.assertFalse(NeonLogFilter({'topics': [None, None, None]}).match(log))
+
+
+if __name__ == '__main__':
+    unittest.main()
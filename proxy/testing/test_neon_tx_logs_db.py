@@ -0,0 +1,178 @@
+import time
+import unittest
+
+from typing import Any, Dict, List, Optional
+
+from logged_groups import logged_group
+
+from ..common_neon.errors import LimitExceededError
+from ..indexer.neon_tx_logs_db import NeonTxLogsDB
+from ..indexer.solana_blocks_db import SolBlocksDB
+
+
+@logged_group("neon.TestCases")
+class TestNeonTxLogsDB(unittest.TestCase):
+    # the test rows are placed far from the real slots and removed after the tests
+    start_block_slot = 10 ** 15
+    block_cnt = 10000
+    block_log_cnt = 100
+    log_cnt = block_cnt * block_log_cnt
+    max_log_cnt = 10000
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.blocks_db = SolBlocksDB()
+        cls.logs_db = NeonTxLogsDB()
+        cls._clear()
+
+        # log N: 50 contracts, 7 events, topic1 from 1000 values, topic2 in even logs, topic3 in each 10th log
+        with cls.logs_db._cursor() as cursor:
+            cursor.execute(f'''
+                INSERT INTO {cls.blocks_db._table_name}
+                    (block_slot, block_hash, block_time, parent_block_slot, is_finalized, is_active)
+                SELECT %(slot)s + b, int8send(%(slot)s + b), b, %(slot)s + b - 1, True, True
+                  FROM generate_series(0, %(block_cnt)s - 1) AS b
+            ''', dict(slot=cls.start_block_slot, block_cnt=cls.block_cnt))
+            cursor.execute(f'''
+                INSERT INTO {cls.logs_db._table_name}
+                    (block_slot, tx_idx, tx_log_idx, log_idx, address, log_data, tx_hash,
+                     topic0, topic1, topic2, topic3)
+                SELECT %(slot)s + n / %(block_log_cnt)s, (n %% %(block_log_cnt)s) / 4, n %% 4, n %% %(block_log_cnt)s,
+                       decode(lpad(to_hex(n %% 50), 40, '0'), 'hex'), '\\x'::BYTEA,
+                       decode(lpad(to_hex(n / 4), 64, '0'), 'hex'),
+                       decode('ee' || lpad(to_hex(n %% 7), 62, '0'), 'hex'),
+                       decode(lpad(to_hex(n %% 1000), 64, '0'), 'hex'),
+                       CASE WHEN n %% 2 = 0 THEN decode(lpad(to_hex(n %% 13), 64, '0'), 'hex') END,
+                       CASE WHEN n %% 10 = 0 THEN decode(lpad(to_hex(n %% 3), 64, '0'), 'hex') END
+                  FROM generate_series(0, %(log_cnt)s - 1) AS n
+            ''', dict(slot=cls.start_block_slot, block_log_cnt=cls.block_log_cnt, log_cnt=cls.log_cnt))
+            cursor.execute(f'ANALYZE {cls.blocks_db._table_name}, {cls.logs_db._table_name}')
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls._clear()
+
+    @classmethod
+    def _clear(cls) -> None:
+        for db in (cls.blocks_db, cls.logs_db):
+            with db._cursor() as cursor:
+                cursor.execute(f'DELETE FROM {db._table_name} WHERE block_slot >= %s', (cls.start_block_slot,))
+
+    @staticmethod
+    def _address(value: int) -> str:
+        return f'0x{value:040x}'
+
+    @staticmethod
+    def _event(value: int) -> str:
+        return f'0xee{value:062x}'
+
+    @staticmethod
+    def _topic(value: int) -> str:
+        return f'0x{value:064x}'
+
+    def _topic_list(self, n: int) -> List[str]:
+        topic_list = [self._event(n % 7), self._topic(n % 1000)]
+        if n % 2 == 0:
+            topic_list.append(self._topic(n % 13))
+            if n % 5 == 0:
+                topic_list.append(self._topic(n % 3))
+        return topic_list
+
+    def _expected_log_idx_list(self, from_block: int, to_block: int,
+                               address_list: List[str], topic_list: List[Optional[List[str]]]) -> List[int]:
+        # the reference implementation of the eth_getLogs filter
+        log_idx_list: List[int] = []
+        for n in range(from_block * self.block_log_cnt, (to_block + 1) * self.block_log_cnt):
+            if (len(address_list) > 0) and (self._address(n % 50) not in address_list):
+                continue
+            log_topic_list = self._topic_list(n)
+            if len(topic_list) > len(log_topic_list):
+                continue
+            if all(t is None or log_t in t for t, log_t in zip(topic_list, log_topic_list)):
+                log_idx_list.append(n)
+        return log_idx_list
+
+    def _get_logs(self, from_block: int, to_block: int,
+                  address_list: List[str], topic_list: List[Optional[List[str]]]) -> List[Dict[str, Any]]:
+        return self.logs_db.get_logs(
+            self.start_block_slot + from_block, self.start_block_slot + to_block,
+            address_list, topic_list, None, self.max_log_cnt
+        )
+
+    def _check_filter(self, from_block: int, to_block: int,
+                      address_list: List[str], topic_list: List[Optional[List[str]]]) -> None:
+        log_list = self._get_logs(from_block, to_block, address_list, topic_list)
+        n_list = self._expected_log_idx_list(from_block, to_block, address_list, topic_list)
+        self.assertGreater(len(n_list), 0)
+        self.assertEqual(len(log_list), len(n_list))
+        for log, n in zip(log_list, n_list):
+            self.assertEqual(int(log['blockNumber'], 16), self.start_block_slot + n // self.block_log_cnt)
+            self.assertEqual(int(log['logIndex'], 16), n % self.block_log_cnt)
+            self.assertEqual(log['address'], self._address(n % 50))
+            self.assertEqual(log['topics'], self._topic_list(n))
+
+    def test_positional_topic_filter(self):
+        self._check_filter(100, 120, [self._address(7)], [])
+        self._check_filter(100, 120, [self._address(7), self._address(8)], [[self._event(1)]])
+        self._check_filter(0, 500, [], [[self._event(3)], [self._topic(10), self._topic(20)]])
+        # None matches any topic at the position, but the position should exist
+        self._check_filter(200, 220, [], [None, None, [self._topic(4)]])
+        self._check_filter(200, 220, [self._address(10)], [None, None, None, None])
+        self._check_filter(300, 300, [], [[self._event(2)], None, None])
+
+        # topics aren't matched at other positions
+        self.assertEqual(self._get_logs(0, 500, [], [[self._topic(10)]]), [])
+        # the EVM emits up to 4 topics
+        self.assertEqual(self._get_logs(0, 500, [], [None, None, None, None, None]), [])
+        self.assertEqual(self._get_logs(0, 500, ['bad-address'], []), [])
+
+    def test_result_limit(self):
+        # 100 blocks x 100 logs are exactly at the limit
+        log_list = self._get_logs(0, 99, [], [])
+        self.assertEqual(len(log_list), self.max_log_cnt)
+        self.assertEqual(
+            [(log['blockNumber'], log['logIndex']) for log in log_list[:2]],
+            [(hex(self.start_block_slot), '0x0'), (hex(self.start_block_slot), '0x1')]
+        )
+
+        with self.assertRaises(LimitExceededError) as ctx:
+            self._get_logs(0, 100, [], [])
+        self.assertEqual(ctx.exception.code, -32005)
+        self.assertIn(str(self.max_log_cnt), ctx.exception.message)
+
+    def test_filters_use_indexes(self):
+        for column, value in (
+            ('address', bytes.fromhex(self._address(7)[2:])),
+            ('topic0', bytes.fromhex(self._event(3)[2:])),
+            ('topic1', bytes.fromhex(self._topic(10)[2:])),
+            ('topic2', bytes.fromhex(self._topic(4)[2:])),
+        ):
+            with self.logs_db._cursor() as cursor:
+                cursor.execute(f'''
+                    EXPLAIN SELECT * FROM {self.logs_db._table_name}
+                     WHERE {column} IN (%s) AND block_slot >= %s AND block_slot <= %s
+                ''', (value, self.start_block_slot, self.start_block_slot + self.block_cnt))
+                plan = '\n'.join(row[0] for row in cursor.fetchall())
+            self.assertIn(f'idx_neon_transaction_logs_{column}', plan)
+
+    def test_benchmark_get_logs(self):
+        request_cnt = 20
+        for name, from_block, to_block, address_list, topic_list in (
+            ('address', 0, self.block_cnt - 1, [self._address(7)], [[self._event(2)], [self._topic(7)]]),
+            ('topic0 + topic1', 0, self.block_cnt - 1, [], [[self._event(2)], [self._topic(9)]]),
+            ('topic2', 1000, 2000, [], [None, None, [self._topic(4)]]),
+            ('block range', 5000, 5049, [], []),
+        ):
+            start_time = time.monotonic()
+            for _ in range(request_cnt):
+                log_list = self._get_logs(from_block, to_block, address_list, topic_list)
+            spent_time = (time.monotonic() - start_time) / request_cnt
+            self.info(
+                f'eth_getLogs by {name} over {self.log_cnt} logs: '
+                f'{len(log_list)} logs in {spent_time * 1000:.1f} ms'
+            )
+            self.assertGreater(len(log_list), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
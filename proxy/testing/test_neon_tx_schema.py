@@ -0,0 +1,197 @@
+import os
+import pickle
+import random
+import time
+import unittest
+
+from typing import Any, Dict, List, Tuple
+
+import psycopg2.extras
+
+from logged_groups import logged_group
+
+from ..indexer.base_db import BaseDB
+from ..indexer.neon_txs_db import NeonTxsDB
+from ..indexer.neon_tx_logs_db import NeonTxLogsDB
+
+
+@logged_group("neon.TestCases")
+class TestNeonTxSchema(unittest.TestCase):
+    tx_cnt = 10000
+    lookup_cnt = 2000
+
+    # the layout before the binary columns
+    text_tx_table = '''
+        CREATE TEMPORARY TABLE bench_text_txs (
+            neon_sig TEXT, from_addr TEXT,
+            sol_sig TEXT, sol_ix_idx INT, sol_ix_inner_idx INT, block_slot BIGINT, tx_idx INT,
+            nonce TEXT, gas_price TEXT, gas_limit TEXT, value TEXT, gas_used TEXT,
+            to_addr TEXT, contract TEXT, status TEXT, return_value TEXT,
+            v TEXT, r TEXT, s TEXT, calldata TEXT, logs BYTEA, logs_bloom BYTEA
+        );
+        CREATE INDEX ON bench_text_txs(sol_sig, block_slot);
+        CREATE UNIQUE INDEX ON bench_text_txs(neon_sig, block_slot);
+        CREATE INDEX ON bench_text_txs(block_slot, tx_idx);
+
+        CREATE TEMPORARY TABLE bench_text_logs (
+            address TEXT, block_slot BIGINT, tx_hash TEXT, tx_idx INT, tx_log_idx INT, log_idx INT,
+            topic TEXT, log_data TEXT, topic_list BYTEA
+        );
+        CREATE UNIQUE INDEX ON bench_text_logs(block_slot, tx_hash, tx_log_idx);
+        CREATE INDEX ON bench_text_logs(address);
+        CREATE INDEX ON bench_text_logs(topic);
+        CREATE INDEX ON bench_text_logs(block_slot);
+    '''
+
+    bin_tx_table = '''
+        CREATE TEMPORARY TABLE bench_bin_txs (LIKE neon_transactions INCLUDING ALL);
+        CREATE TEMPORARY TABLE bench_bin_logs (LIKE neon_transaction_logs INCLUDING ALL);
+    '''
+
+    def setUp(self) -> None:
+        self.txs_db = NeonTxsDB()
+        self.logs_db = NeonTxLogsDB()
+
+    @staticmethod
+    def _hex(size: int) -> str:
+        return '0x' + os.urandom(size).hex()
+
+    def _new_tx(self, idx: int) -> Dict[str, Any]:
+        # ERC20 transfer with one Transfer event
+        neon_sig = self._hex(32)
+        from_addr, to_addr = self._hex(20), self._hex(20)
+        block_slot = 1000 + idx // 10
+        log = {
+            'address': to_addr,
+            'topics': [self._hex(32), '0x' + '0' * 24 + from_addr[2:], '0x' + '0' * 24 + self._hex(20)[2:]],
+            'data': self._hex(32),
+            'transactionHash': neon_sig,
+            'transactionLogIndex': '0x0',
+            'logIndex': hex(idx % 10),
+            'transactionIndex': hex(idx % 10),
+            'blockNumber': hex(block_slot),
+            'blockHash': self._hex(32),
+        }
+        return {
+            'neon_sig': neon_sig, 'from_addr': from_addr,
+            'sol_sig': os.urandom(64).hex(), 'sol_ix_idx': 1, 'sol_ix_inner_idx': None,
+            'block_slot': block_slot, 'tx_idx': idx % 10,
+            'nonce': hex(idx), 'gas_price': hex(random.randint(10 ** 9, 10 ** 11)), 'gas_limit': hex(100000),
+            'value': hex(0), 'gas_used': hex(random.randint(21000, 100000)),
+            'to_addr': to_addr, 'contract': None, 'status': '0x1', 'return_value': '',
+            'v': hex(245022934 * 2 + 35), 'r': self._hex(32), 's': self._hex(32),
+            'calldata': '0xa9059cbb' + os.urandom(64).hex(),
+            'logs': [log], 'logs_bloom': None,
+        }
+
+    text_log_column_list = [
+        'block_slot', 'tx_idx', 'tx_log_idx', 'log_idx', 'address', 'log_data', 'tx_hash', 'topic', 'topic_list'
+    ]
+
+    def _insert(self, cursor: BaseDB.Cursor, tx_list: List[Dict[str, Any]]) -> None:
+        tx_column_list = self.txs_db._column_list
+        log_column_list = self.logs_db._column_list
+
+        text_tx_list, bin_tx_list, text_log_list, bin_log_list = [], [], [], []
+        for tx in tx_list:
+            text_tx_list.append([
+                psycopg2.Binary(pickle.dumps(tx[c])) if c == 'logs' else tx[c] for c in tx_column_list
+            ])
+            bin_tx_list.append([self.txs_db._encode_value(c, tx[c]) for c in tx_column_list])
+
+            log = tx['logs'][0]
+            value_dict = {
+                'block_slot': tx['block_slot'], 'tx_idx': tx['tx_idx'], 'tx_log_idx': 0, 'log_idx': tx['tx_idx'],
+                'address': log['address'], 'log_data': log['data'], 'tx_hash': tx['neon_sig'],
+                'topic': log['topics'][0], 'topic3': None
+            }
+            text_log_list.append([
+                psycopg2.Binary(pickle.dumps(log['topics'])) if c == 'topic_list' else value_dict[c]
+                for c in self.text_log_column_list
+            ])
+            value_dict.update({f'topic{idx}': topic for idx, topic in enumerate(log['topics'])})
+            bin_log_list.append([
+                value_dict[c] if isinstance(value_dict[c], (int, type(None))) else self.logs_db._encode_hex(value_dict[c])
+                for c in log_column_list
+            ])
+
+        for table_name, column_list, value_list_list in (
+            ('bench_text_txs', tx_column_list, text_tx_list),
+            ('bench_bin_txs', tx_column_list, bin_tx_list),
+            ('bench_text_logs', self.text_log_column_list, text_log_list),
+            ('bench_bin_logs', log_column_list, bin_log_list),
+        ):
+            psycopg2.extras.execute_values(
+                cursor, f'INSERT INTO {table_name} ({",".join(column_list)}) VALUES %s', value_list_list
+            )
+
+    @staticmethod
+    def _get_size(cursor: BaseDB.Cursor, table_name: str) -> Tuple[int, int]:
+        cursor.execute(f'''
+            SELECT pg_total_relation_size('{table_name}'::regclass) - pg_indexes_size('{table_name}'::regclass),
+                   pg_indexes_size('{table_name}'::regclass)
+        ''')
+        return cursor.fetchone()
+
+    def _lookup_text(self, cursor: BaseDB.Cursor, neon_sig: str) -> Dict[str, Any]:
+        # the previous decoding: values are returned as is, logs are unpickled
+        cursor.execute(
+            f'SELECT {",".join(self.txs_db._column_list)} FROM bench_text_txs WHERE neon_sig = %s', (neon_sig,)
+        )
+        value_dict = dict(zip(self.txs_db._column_list, cursor.fetchone()))
+        value_dict['logs'] = pickle.loads(bytes(value_dict['logs']))
+        return value_dict
+
+    def _lookup_bin(self, cursor: BaseDB.Cursor, neon_sig: str) -> Dict[str, Any]:
+        cursor.execute(
+            f'SELECT {",".join(self.txs_db._column_list)} FROM bench_bin_txs WHERE neon_sig = %s',
+            (self.txs_db._encode_hex(neon_sig),)
+        )
+        return {
+            column: self.txs_db._decode_value(column, value)
+            for column, value in zip(self.txs_db._column_list, cursor.fetchone())
+        }
+
+    def test_benchmark_table_size_and_receipt_lookup(self):
+        tx_list = [self._new_tx(idx) for idx in range(self.tx_cnt)]
+        lookup_list = [random.choice(tx_list) for _ in range(self.lookup_cnt)]
+
+        with self.txs_db.conn() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    cursor.execute(self.text_tx_table + self.bin_tx_table)
+                    self._insert(cursor, tx_list)
+                    cursor.execute('ANALYZE bench_text_txs, bench_bin_txs, bench_text_logs, bench_bin_logs')
+
+                    size_dict = {
+                        table_name: self._get_size(cursor, table_name)
+                        for table_name in ('bench_text_txs', 'bench_bin_txs', 'bench_text_logs', 'bench_bin_logs')
+                    }
+
+                    time_dict: Dict[str, float] = {}
+                    for name, lookup in (('text', self._lookup_text), ('binary', self._lookup_bin)):
+                        start_time = time.monotonic()
+                        for tx in lookup_list:
+                            value_dict = lookup(cursor, tx['neon_sig'])
+                            self.assertEqual(value_dict['neon_sig'], tx['neon_sig'])
+                            self.assertEqual(value_dict['value'], tx['value'])
+                            self.assertEqual(value_dict['logs'], tx['logs'])
+                        time_dict[name] = (time.monotonic() - start_time) / self.lookup_cnt
+                finally:
+                    cursor.execute('''
+                        DROP TABLE IF EXISTS bench_text_txs, bench_bin_txs, bench_text_logs, bench_bin_logs
+                    ''')
+
+        for table_name, (table_size, index_size) in size_dict.items():
+            self.info(f'{table_name} with {self.tx_cnt} rows: table {table_size // 1024} KB, indexes {index_size // 1024} KB')
+        self.info(
+            f'receipt lookup: text columns {time_dict["text"] * 1000:.3f} ms, '
+            f'binary columns {time_dict["binary"] * 1000:.3f} ms'
+        )
+
+        for name in ('txs', 'logs'):
+            self.assertLess(sum(size_dict[f'bench_bin_{name}']), sum(size_dict[f'bench_text_{name}']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import base64
+import time
+import unittest
+
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+from ..common_neon.address import EthereumAddress, ether2program
+from ..common_neon.config import Config
+from ..common_neon.solana_interactor import SolInteractor
+from ..common_neon.solana_transaction import SolPubKey, SolLegacyTx, SolTxIx, SolAccountMeta
+
+
+class FakeConfig(Config):
+    @property
+    def account_cache_size(self) -> int:
+        return 4
+
+    @property
+    def account_cache_ttl_slot_cnt(self) -> int:
+        return 2
+
+    @property
+    def account_cache_ttl_msec(self) -> int:
+        return 60 * 1000
+
+
+class FakeSession:
+    def __init__(self):
+        self.slot = 100
+        self.rpc_call_cnt = 0
+        self.missing_key_set = set()
+
+    def _account(self, pubkey: str) -> Any:
+        if pubkey in self.missing_key_set:
+            return None
+        data = base64.b64encode(bytes([self.slot % 256]) + pubkey.encode('utf-8')).decode('utf-8')
+        return {'data': [data, 'base64'], 'lamports': self.slot, 'owner': str(SolPubKey(bytes(32)))}
+
+    def _response(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        method = request['method']
+        params = request['params']
+        context = {'slot': self.slot}
+        if method == 'getAccountInfo':
+            return {'id': request['id'], 'result': {'context': context, 'value': self._account(params[0])}}
+        elif method == 'getMultipleAccounts':
+            value = [self._account(key) for key in params[0]]
+            return {'id': request['id'], 'result': {'context': context, 'value': value}}
+        raise RuntimeError(f'unexpected method {method}')
+
+    def post(self, _url: str, headers: Dict[str, str], json: Any) -> MagicMock:
+        self.rpc_call_cnt += 1
+        response = MagicMock()
+        if isinstance(json, list):
+            response.json.return_value = [self._response(r) for r in json]
+        else:
+            response.json.return_value = self._response(json)
+        return response
+
+
+class TestSolanaAccountCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.solana = SolInteractor(FakeConfig(), 'http://localhost:8899')
+        self.session = FakeSession()
+        self.solana._session = self.session
+        self.key_list: List[SolPubKey] = [SolPubKey(bytes([i + 1] * 32)) for i in range(6)]
+
+    def test_cache_hit(self):
+        for _ in range(10):
+            info = self.solana.get_account_info(self.key_list[0])
+            self.assertEqual(info.lamports, 100)
+        self.assertEqual(self.session.rpc_call_cnt, 1)
+
+        # other commitment is other key
+        self.solana.get_account_info(self.key_list[0], commitment='confirmed')
+        self.assertEqual(self.session.rpc_call_cnt, 2)
+
+        # data slices aren't cached
+        self.solana.get_account_info(self.key_list[0], length=0)
+        self.solana.get_account_info(self.key_list[0], length=0)
+        self.assertEqual(self.session.rpc_call_cnt, 4)
+
+        self.assertAlmostEqual(self.solana.account_cache.hit_ratio, 9 / 11)
+        self.assertEqual(self.solana.account_cache.pop_stat(), (9, 2))
+        self.assertEqual(self.solana.account_cache.pop_stat(), (0, 0))
+
+    def test_absent_account_is_cached(self):
+        self.session.missing_key_set.add(str(self.key_list[0]))
+        self.assertIsNone(self.solana.get_account_info(self.key_list[0]))
+        self.assertIsNone(self.solana.get_account_info(self.key_list[0]))
+        self.assertEqual(self.session.rpc_call_cnt, 1)
+
+    def test_slot_expiration(self):
+        self.solana.get_account_info(self.key_list[0])
+        self.session.slot += 1
+        self.solana.get_account_info(self.key_list[1])
+        self.assertEqual(self.solana.get_account_info(self.key_list[0]).lamports, 100)
+        self.assertEqual(self.session.rpc_call_cnt, 2)
+
+        # a response from the newer slot expires the entry
+        self.session.slot += 1
+        self.solana.get_account_info(self.key_list[2])
+        self.assertEqual(self.solana.get_account_info(self.key_list[0]).lamports, 102)
+        self.assertEqual(self.session.rpc_call_cnt, 4)
+
+    def test_time_expiration(self):
+        self.solana.account_cache._ttl_msec = 50
+        self.solana.get_account_info(self.key_list[0])
+        self.solana.get_account_info(self.key_list[0])
+        self.assertEqual(self.session.rpc_call_cnt, 1)
+
+        time.sleep(0.06)
+        self.solana.get_account_info(self.key_list[0])
+        self.assertEqual(self.session.rpc_call_cnt, 2)
+
+    def test_lru_eviction(self):
+        for key in self.key_list[:5]:
+            self.solana.get_account_info(key)
+        self.assertEqual(len(self.solana.account_cache), 4)
+
+        # the first key was evicted
+        self.solana.get_account_info(self.key_list[0])
+        self.assertEqual(self.session.rpc_call_cnt, 6)
+
+        # the last key is still in the cache
+        self.solana.get_account_info(self.key_list[4])
+        self.assertEqual(self.session.rpc_call_cnt, 6)
+
+    def test_account_info_list(self):
+        self.session.missing_key_set.add(str(self.key_list[2]))
+        self.solana.get_account_info(self.key_list[1])
+        self.assertEqual(self.session.rpc_call_cnt, 1)
+
+        info_list = self.solana.get_account_info_list(self.key_list[:4])
+        self.assertEqual(self.session.rpc_call_cnt, 2)
+        self.assertEqual([i.address if i else None for i in info_list],
+                         [self.key_list[0], self.key_list[1], None, self.key_list[3]])
+
+        info_list = self.solana.get_account_info_list(self.key_list[:4])
+        self.assertEqual(self.session.rpc_call_cnt, 2)
+        self.assertEqual(len(info_list), 4)
+
+    def test_invalidate_on_send_tx(self):
+        self.solana.get_account_info(self.key_list[0])
+        self.solana.get_account_info(self.key_list[1])
+
+        tx = SolLegacyTx().add(SolTxIx(
+            program_id=self.key_list[5],
+            data=b'',
+            keys=[
+                SolAccountMeta(pubkey=self.key_list[0], is_signer=False, is_writable=True),
+                SolAccountMeta(pubkey=self.key_list[1], is_signer=False, is_writable=False),
+            ]
+        ))
+        self.solana.invalidate_account_info_list(self.solana._get_writable_key_list([tx]))
+
+        self.solana.get_account_info(self.key_list[0])
+        self.solana.get_account_info(self.key_list[1])
+        self.assertEqual(self.session.rpc_call_cnt, 3)
+
+    def test_invalidate_neon_account(self):
+        eth_address = EthereumAddress.random()
+        pda_account = ether2program(eth_address)[0]
+
+        self.solana.get_account_info(pda_account)
+        self.solana.invalidate_neon_account_info_list([str(eth_address)])
+        self.solana.get_account_info(pda_account)
+        self.assertEqual(self.session.rpc_call_cnt, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
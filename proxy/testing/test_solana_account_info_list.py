@@ -0,0 +1,109 @@
+import base64
+import json
+import threading
+import time
+import unittest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+from logged_groups import logged_group
+
+from ..common_neon.config import Config
+from ..common_neon.solana_interactor import SolInteractor
+from ..common_neon.solana_transaction import SolPubKey
+
+
+class FakeSolanaRequestHandler(BaseHTTPRequestHandler):
+    """Answers getMultipleAccounts and records the number and the concurrency of HTTP requests"""
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        stat = self.server.stat
+        with stat['lock']:
+            stat['active_cnt'] += 1
+            stat['post_cnt'] += 1
+            stat['max_active_cnt'] = max(stat['max_active_cnt'], stat['active_cnt'])
+
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        # one round trip to the Solana node
+        time.sleep(0.05)
+        if isinstance(request, list):
+            response = [self._response(r) for r in request]
+        else:
+            response = self._response(request)
+
+        with stat['lock']:
+            stat['active_cnt'] -= 1
+
+        body = json.dumps(response).encode('utf8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _response(request: Dict[str, Any]) -> Dict[str, Any]:
+        value = []
+        for key in request['params'][0]:
+            data = base64.b64encode(bytes([7]) + key.encode('utf8')).decode('utf8')
+            value.append({'data': [data, 'base64'], 'lamports': 1, 'owner': str(SolPubKey(bytes(32)))})
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': {'context': {'slot': 1}, 'value': value}}
+
+
+@logged_group("neon.TestCases")
+class TestSolanaAccountInfoList(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeSolanaRequestHandler)
+        cls.server.stat = {}
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.solana = SolInteractor(Config(), f'http://127.0.0.1:{cls.server.server_address[1]}')
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.server.stat.update(lock=threading.Lock(), active_cnt=0, max_active_cnt=0, post_cnt=0)
+
+    def test_chunks_in_one_batch(self):
+        key_list: List[SolPubKey] = [SolPubKey(idx.to_bytes(32, 'big')) for idx in range(1, 501)]
+
+        start_time = time.monotonic()
+        account_info_list = self.solana.get_account_info_list(key_list)
+        batch_time = time.monotonic() - start_time
+
+        # 10 chunks of getMultipleAccounts are sent in one HTTP request instead of 10 serial requests
+        self.assertEqual(self.server.stat['post_cnt'], 1)
+        self.assertEqual(self.server.stat['max_active_cnt'], 1)
+        self.info(f'getMultipleAccounts for 500 accounts: {batch_time * 1000:.1f} ms, 1 http request')
+
+        self.assertEqual(len(account_info_list), len(key_list))
+        for key, account_info in zip(key_list, account_info_list):
+            self.assertEqual(account_info.address, key)
+            self.assertEqual(account_info.data, bytes([7]) + str(key).encode('utf8'))
+            self.assertEqual(account_info.tag, 7)
+            self.assertEqual(account_info.owner, SolPubKey(bytes(32)))
+
+    def test_lazy_decode(self):
+        account_info = self.solana.get_account_info_list([SolPubKey(bytes([1] * 32))])[0]
+        self.assertIsNotNone(account_info._raw_data)
+        self.assertIsNotNone(account_info._raw_owner)
+        self.assertEqual(account_info.lamports, 1)
+        self.assertIsNotNone(account_info._raw_data)
+
+        self.assertEqual(account_info.tag, 7)
+        self.assertIsNone(account_info._raw_data)
+        self.assertIsNotNone(account_info._raw_owner)
+
+    def test_empty_list(self):
+        self.assertEqual(self.solana.get_account_info_list([]), [])
+        self.assertEqual(self.server.stat['post_cnt'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import asyncio
+import time
+import unittest
+
+from typing import Any, Dict
+
+from aiohttp import web
+from logged_groups import logged_group
+
+from ..common_neon.config import Config
+from ..common_neon.errors import SolanaUnavailableError
+from ..common_neon.solana_async_interactor import AsyncSolInteractor
+from ..common_neon.solana_transaction import SolPubKey
+
+
+class FakeConfig(Config):
+    @property
+    def retry_on_fail(self) -> int:
+        return 3
+
+    @property
+    def solana_conn_pool_size(self) -> int:
+        return 4
+
+    @property
+    def solana_timeout_sec(self) -> int:
+        return 1
+
+
+class FakeSolanaServer:
+    """aiohttp stub of the Solana node: adds latency, answers 429 to the first too_many_cnt requests"""
+    def __init__(self):
+        self.latency_sec = 0.0
+        self.too_many_cnt = 0
+        self.post_cnt = 0
+        self.active_cnt = 0
+        self.max_active_cnt = 0
+        self._runner = None
+        self.url = ''
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post('/', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f'http://127.0.0.1:{port}/'
+
+    async def stop(self) -> None:
+        await self._runner.cleanup()
+
+    @staticmethod
+    def _response(request: Dict[str, Any]) -> Dict[str, Any]:
+        if request['method'] == 'getSlot':
+            result = 100
+        elif request['method'] == 'getMultipleAccounts':
+            value = [{'data': ['', 'base64'], 'lamports': 1, 'owner': str(SolPubKey(bytes(32)))}] * len(request['params'][0])
+            result = {'context': {'slot': 100}, 'value': value}
+        else:
+            return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32601, 'message': 'unknown method'}}
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.post_cnt += 1
+        self.active_cnt += 1
+        self.max_active_cnt = max(self.max_active_cnt, self.active_cnt)
+        try:
+            await asyncio.sleep(self.latency_sec)
+            if self.too_many_cnt > 0:
+                self.too_many_cnt -= 1
+                return web.Response(status=429, headers={'Retry-After': '0'})
+
+            data = await request.json()
+            if isinstance(data, list):
+                return web.json_response([self._response(r) for r in data])
+            return web.json_response(self._response(data))
+        finally:
+            self.active_cnt -= 1
+
+
+@logged_group("neon.TestCases")
+class TestAsyncSolInteractor(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = FakeSolanaServer()
+        await self.server.start()
+        self.solana = AsyncSolInteractor(FakeConfig(), self.server.url)
+
+    async def asyncTearDown(self) -> None:
+        await self.solana.close()
+        await self.server.stop()
+
+    async def test_retry_on_too_many_requests(self):
+        self.server.too_many_cnt = 2
+        self.assertEqual(await self.solana.get_block_slot(), 100)
+        self.assertEqual(self.server.post_cnt, 3)
+
+        self.server.too_many_cnt = 10
+        with self.assertRaises(SolanaUnavailableError):
+            await self.solana.get_block_slot()
+
+    async def test_per_call_timeout(self):
+        self.server.latency_sec = 1.5
+        with self.assertRaises(SolanaUnavailableError):
+            await self.solana.get_block_slot()
+        # each of 4 attempts is interrupted by the timeout of 1 second
+        self.assertEqual(self.server.post_cnt, 4)
+
+    async def test_bounded_connection_pool(self):
+        self.server.latency_sec = 0.1
+        start_time = time.monotonic()
+        result_list = await asyncio.gather(*[self.solana.get_block_slot() for _ in range(16)])
+        elapsed_time = time.monotonic() - start_time
+
+        self.assertEqual(result_list, [100] * 16)
+        self.assertEqual(self.server.max_active_cnt, 4)
+        self.info(f'16 calls with latency 100 ms through 4 connections: {elapsed_time * 1000:.1f} ms')
+
+    async def test_loop_is_not_blocked(self):
+        self.server.latency_sec = 0.2
+        self.server.too_many_cnt = 1
+
+        tick_cnt = 0
+
+        async def _tick():
+            nonlocal tick_cnt
+            while True:
+                tick_cnt += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.get_event_loop().create_task(_tick())
+        key_list = [SolPubKey(idx.to_bytes(32, 'big')) for idx in range(1, 121)]
+        account_info_list = await self.solana.get_account_info_list(key_list)
+        tick_task.cancel()
+
+        self.assertEqual(len(account_info_list), len(key_list))
+        self.assertTrue(all(info.lamports == 1 for info in account_info_list))
+        # other coroutines run while the client waits for the node and for the backoff
+        self.assertGreater(tick_cnt, 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+
+from typing import List
+
+import base58
+
+from logged_groups import logged_group
+
+from ..common_neon.config import Config
+from ..common_neon.solana_blockhash_provider import BlockhashProvider
+from ..common_neon.solana_interactor import SolSendResult
+from ..common_neon.solana_transaction import SolBlockhash
+from ..common_neon.solana_tx_list_sender import SolTxListSender
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTx:
+    def __init__(self, idx: int):
+        self.recent_blockhash = None
+        self.sign_cnt = 0
+        self._idx = idx
+
+    def sign(self, signer) -> None:
+        self.sign_cnt += 1
+
+    def signature(self) -> bytes:
+        return bytes([self._idx, self.sign_cnt] * 32)
+
+
+class FakeConfirmWaiter:
+    def wait_for_confirmation(self, tx_sig_list: List[str], timeout_sec: float) -> bool:
+        return True
+
+
+class FakeSolInteractor:
+    """Rejects the first blockhash_notfound_cnt transactions with BlockhashNotFound"""
+    def __init__(self, clock: FakeClock, blockhash_notfound_cnt: int = 0):
+        self.blockhash_provider = BlockhashProvider(self.get_recent_blockhash, refresh_sec=0.4, clock=clock)
+        self.blockhash_rpc_cnt = 0
+        self._blockhash_notfound_cnt = blockhash_notfound_cnt
+
+    def get_recent_blockhash(self) -> SolBlockhash:
+        self.blockhash_rpc_cnt += 1
+        return SolBlockhash(f'blockhash{self.blockhash_rpc_cnt}')
+
+    def send_tx_list(self, tx_list: List[FakeTx], skip_preflight: bool) -> List[SolSendResult]:
+        result_list = []
+        for tx in tx_list:
+            if self._blockhash_notfound_cnt > 0:
+                self._blockhash_notfound_cnt -= 1
+                error = {'code': -32002, 'message': 'Transaction simulation failed',
+                         'data': {'err': 'BlockhashNotFound', 'logs': []}}
+                result_list.append(SolSendResult(result=None, error=error))
+            else:
+                result_list.append(SolSendResult(result=base58.b58encode(tx.signature()).decode(), error=None))
+        return result_list
+
+    def get_tx_receipt_list(self, tx_sig_list: List[str]):
+        return [{'slot': 1, 'meta': {'err': None, 'logMessages': ['Program log: ok']}} for _ in tx_sig_list]
+
+
+@logged_group("neon.TestCases")
+class TestBlockhashProvider(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+
+    def _create_sender(self, solana: FakeSolInteractor) -> SolTxListSender:
+        return SolTxListSender(Config(), solana, signer=None, skip_preflight=True, confirm_waiter=FakeConfirmWaiter())
+
+    def test_cached_blockhash_with_age(self):
+        solana = FakeSolInteractor(self.clock)
+        provider = solana.blockhash_provider
+
+        # the first request can't avoid the RPC call
+        self.assertEqual(provider.get_blockhash(), (SolBlockhash('blockhash1'), 0.0))
+
+        self.clock.now += 0.3
+        blockhash, age = provider.get_blockhash()
+        self.assertEqual(blockhash, SolBlockhash('blockhash1'))
+        self.assertAlmostEqual(age, 0.3)
+
+        # the timer refresh
+        provider.refresh()
+        self.clock.now += 0.1
+        blockhash, age = provider.get_blockhash()
+        self.assertEqual(blockhash, SolBlockhash('blockhash2'))
+        self.assertAlmostEqual(age, 0.1)
+
+        # the background refresh is broken, the too old blockhash isn't used
+        self.clock.now += 30
+        self.assertEqual(provider.get_blockhash(), (SolBlockhash('blockhash3'), 0.0))
+        self.assertEqual(solana.blockhash_rpc_cnt, 3)
+
+    def test_send_does_not_wait_for_blockhash(self):
+        solana = FakeSolInteractor(self.clock)
+        solana.blockhash_provider.refresh()
+
+        for send_idx in range(3):
+            self.clock.now += 0.2
+            tx_list = [FakeTx(1), FakeTx(2)]
+            self._create_sender(solana).send(tx_list)
+            self.assertTrue(all(tx.recent_blockhash == SolBlockhash('blockhash1') for tx in tx_list))
+
+        self.assertEqual(solana.blockhash_rpc_cnt, 1)
+
+    def test_blockhash_notfound_forces_refresh(self):
+        solana = FakeSolInteractor(self.clock, blockhash_notfound_cnt=1)
+        provider = solana.blockhash_provider
+        provider.refresh()
+
+        tx = FakeTx(1)
+        self._create_sender(solana).send([tx])
+
+        # the rejected blockhash is dropped and the refresh thread is woken up
+        self.assertTrue(provider._refresh_event.is_set())
+        self.assertEqual(tx.sign_cnt, 2)
+        self.assertEqual(tx.recent_blockhash, SolBlockhash('blockhash2'))
+
+        # an old blockhash doesn't drop the new one
+        provider.invalidate(SolBlockhash('blockhash1'))
+        self.assertEqual(provider.get_blockhash()[0], SolBlockhash('blockhash2'))
+        self.assertEqual(solana.blockhash_rpc_cnt, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import json
+import socket
+import threading
+import time
+import unittest
+
+from typing import List, Optional, Set
+
+from logged_groups import logged_group
+
+from ..common.utils import build_websocket_handshake_response
+from ..common_neon.solana_tx_confirm_waiter import SolTxPollConfirmWaiter, SolTxWebsocketConfirmWaiter
+from ..http.parser import HttpParser, httpParserTypes
+from ..http.websocket import WebsocketFrame
+
+
+class FakeSolInteractor:
+    """
+    Transactions become confirmed after confirm_delay_sec since the creation,
+    the transactions from confirmed_sig_set are confirmed from the start
+    """
+    def __init__(self, confirm_delay_sec: float, confirmed_sig_set: Optional[Set[str]] = None):
+        self._confirm_time = time.monotonic() + confirm_delay_sec
+        self._confirmed_sig_set = confirmed_sig_set or set()
+        self.call_cnt = 0
+
+    def _is_confirmed(self, tx_sig: str) -> bool:
+        return (tx_sig in self._confirmed_sig_set) or (time.monotonic() >= self._confirm_time)
+
+    def get_confirmed_slot_for_tx_sig_list(self, tx_sig_list: List[str]):
+        self.call_cnt += 1
+        return 1, all(self._is_confirmed(tx_sig) for tx_sig in tx_sig_list)
+
+    def get_confirmed_tx_sig_list(self, tx_sig_list: List[str]) -> List[str]:
+        self.call_cnt += 1
+        return [tx_sig for tx_sig in tx_sig_list if self._is_confirmed(tx_sig)]
+
+
+class FakeSolPubSubServer:
+    """
+    Answers signatureSubscribe-s and sends signatureNotification-s after notify_delay_sec.
+    As Solana, it doesn't notify about the transactions from confirmed_sig_set, they are confirmed before subscription.
+    """
+    def __init__(self, notify_delay_sec: float, confirmed_sig_set: Optional[Set[str]] = None):
+        self._notify_delay_sec = notify_delay_sec
+        self._confirmed_sig_set = confirmed_sig_set or set()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind(('127.0.0.1', 0))
+        self._sock.listen(1)
+        self.sig_set: Set[str] = set()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return f'ws://127.0.0.1:{self._sock.getsockname()[1]}'
+
+    def close(self) -> None:
+        # the thread is a daemon, it can still sleep before notifications
+        self._sock.close()
+
+    def _run(self) -> None:
+        try:
+            conn, _ = self._sock.accept()
+        except OSError:
+            return
+
+        with conn:
+            data = b''
+            while b'\r\n\r\n' not in data:
+                data += conn.recv(65536)
+            request = HttpParser(httpParserTypes.REQUEST_PARSER)
+            request.parse(data)
+            accept = WebsocketFrame.key_to_accept(request.header(b'Sec-WebSocket-Key'))
+            conn.sendall(build_websocket_handshake_response(accept))
+
+            sub_list = []
+            data = b''
+            while len(sub_list) < 2:
+                data += conn.recv(65536)
+                while len(data) > 0:
+                    frame = WebsocketFrame()
+                    rest = frame.parse(data)
+                    if len(frame.data) < frame.payload_length:
+                        break
+                    data = rest
+                    msg = json.loads(frame.data)
+                    sub_id = len(sub_list) + 100
+                    if msg['params'][0] not in self._confirmed_sig_set:
+                        sub_list.append(sub_id)
+                    else:
+                        sub_list.append(None)
+                    self.sig_set.add(msg['params'][0])
+                    self._send(conn, {'jsonrpc': '2.0', 'id': msg['id'], 'result': sub_id})
+
+            time.sleep(self._notify_delay_sec)
+            for sub_id in filter(None, sub_list):
+                self._send(conn, {
+                    'jsonrpc': '2.0',
+                    'method': 'signatureNotification',
+                    'params': {'result': {'context': {'slot': 1}, 'value': {'err': None}}, 'subscription': sub_id}
+                })
+            time.sleep(0.5)
+
+    @staticmethod
+    def _send(conn: socket.socket, msg) -> None:
+        conn.sendall(WebsocketFrame.text(json.dumps(msg).encode('utf8')))
+
+
+@logged_group("neon.TestCases")
+class TestSolTxConfirmWaiter(unittest.TestCase):
+    tx_sig_list = ['sig1', 'sig2']
+    check_delay_sec = 0.4
+
+    def _create_waiter(self, ws_url: str, solana: FakeSolInteractor) -> SolTxWebsocketConfirmWaiter:
+        return SolTxWebsocketConfirmWaiter(ws_url, SolTxPollConfirmWaiter(solana, self.check_delay_sec))
+
+    def test_notification_is_faster_than_polling(self):
+        server = FakeSolPubSubServer(notify_delay_sec=0.1)
+        solana = FakeSolInteractor(confirm_delay_sec=0.1)
+        try:
+            start_time = time.monotonic()
+            self.assertTrue(self._create_waiter(server.url, solana).wait_for_confirmation(self.tx_sig_list, 5))
+            ws_time = time.monotonic() - start_time
+        finally:
+            server.close()
+        self.assertEqual(server.sig_set, set(self.tx_sig_list))
+
+        solana = FakeSolInteractor(confirm_delay_sec=0.1)
+        start_time = time.monotonic()
+        self.assertTrue(SolTxPollConfirmWaiter(solana, self.check_delay_sec).wait_for_confirmation(self.tx_sig_list, 5))
+        poll_time = time.monotonic() - start_time
+
+        self.info(f'Confirmation of 2 transactions: websocket {ws_time * 1000:.1f} ms, polling {poll_time * 1000:.1f} ms')
+
+    def test_confirmed_before_subscription(self):
+        server = FakeSolPubSubServer(notify_delay_sec=10)
+        solana = FakeSolInteractor(confirm_delay_sec=0)
+        try:
+            self.assertTrue(self._create_waiter(server.url, solana).wait_for_confirmation(self.tx_sig_list, 5))
+            self.assertEqual(solana.call_cnt, 1)
+        finally:
+            server.close()
+
+    def test_part_confirmed_before_subscription(self):
+        # sig1 is confirmed before the subscription, so only sig2 is notified
+        server = FakeSolPubSubServer(notify_delay_sec=0.2, confirmed_sig_set={'sig1'})
+        solana = FakeSolInteractor(confirm_delay_sec=10, confirmed_sig_set={'sig1'})
+        try:
+            self.assertTrue(self._create_waiter(server.url, solana).wait_for_confirmation(self.tx_sig_list, 5))
+            self.assertEqual(solana.call_cnt, 1)
+        finally:
+            server.close()
+
+    def test_fallback_to_polling(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(('127.0.0.1', 0))
+        ws_url = f'ws://127.0.0.1:{sock.getsockname()[1]}'
+        sock.close()
+
+        solana = FakeSolInteractor(confirm_delay_sec=0.5)
+        self.assertTrue(self._create_waiter(ws_url, solana).wait_for_confirmation(self.tx_sig_list, 5))
+        self.assertGreater(solana.call_cnt, 1)
+
+    def test_timeout(self):
+        server = FakeSolPubSubServer(notify_delay_sec=10)
+        solana = FakeSolInteractor(confirm_delay_sec=10)
+        try:
+            self.assertFalse(self._create_waiter(server.url, solana).wait_for_confirmation(self.tx_sig_list, 1))
+        finally:
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import bisect
+import dataclasses
+import random
+import time
+import unittest
+
+from typing import List, Optional, Union
+from unittest.mock import patch
+
+from logged_groups import logged_group
+
+from ..common_neon.sorted_queue import SortedQueue
+
+
+class ListSortedQueue:
+    """The previous list-based implementation, it is used as a reference"""
+
+    class _Impl:
+        def __init__(self, lt_key_func):
+            self.queue = []
+            self.lt_key_func = lt_key_func
+
+        def __getitem__(self, index: int):
+            return self.lt_key_func(self.queue[index])
+
+        def __len__(self) -> int:
+            return len(self.queue)
+
+        def bisect_left(self, item) -> int:
+            return bisect.bisect_left(self, self.lt_key_func(item))
+
+    def __init__(self, lt_key_func, eq_key_func):
+        self._impl = self._Impl(lt_key_func)
+        self._eq_key_func = eq_key_func
+
+    def __getitem__(self, index: int):
+        return self._impl.queue[index]
+
+    def __len__(self) -> int:
+        return len(self._impl)
+
+    def __iter__(self):
+        return iter(self._impl.queue)
+
+    def __contains__(self, item) -> bool:
+        return self.find(item) is not None
+
+    def extract_list_from(self, index: int) -> List:
+        extracted_list = self._impl.queue[index:]
+        self._impl.queue = self._impl.queue[:index]
+        return extracted_list
+
+    def add(self, item) -> None:
+        assert self.find(item) is None, 'item is already in the queue'
+        pos = self._impl.bisect_left(item)
+        self._impl.queue.insert(pos, item)
+
+    def find(self, item) -> Optional[int]:
+        start_pos = self._impl.bisect_left(item)
+        for index in range(start_pos, len(self)):
+            if self._impl.lt_key_func(item) != self._impl.lt_key_func(self._impl.queue[index]):
+                break
+            if self._eq_key_func(self._impl.queue[index]) == self._eq_key_func(item):
+                return index
+        return None
+
+    def pop(self, item_or_index: Union[int, object]):
+        index = item_or_index if isinstance(item_or_index, int) else self.find(item_or_index)
+        return self._impl.queue.pop(index)
+
+    def remove_if(self, predict) -> None:
+        self._impl.queue = [item for item in self._impl.queue if not predict(item)]
+
+
+@dataclasses.dataclass
+class FakeTx:
+    sig: str
+    sender_address: str
+    nonce: int
+    gas_price: int
+
+
+@logged_group("neon.TestCases")
+class TestSortedQueue(unittest.TestCase):
+    @staticmethod
+    def _new_queue_pair():
+        def lt_key_func(a: FakeTx) -> int:
+            return -a.gas_price
+
+        def eq_key_func(a: FakeTx) -> str:
+            return a.sig
+
+        return SortedQueue(lt_key_func, eq_key_func), ListSortedQueue(lt_key_func, eq_key_func)
+
+    def _assert_equal_queue(self, queue: SortedQueue, ref_queue: ListSortedQueue) -> None:
+        self.assertEqual(len(queue), len(ref_queue))
+        self.assertEqual([tx.sig for tx in queue], [tx.sig for tx in ref_queue])
+
+    @patch.object(SortedQueue, '_chunk_size', 4)
+    def test_random_operations(self):
+        rnd = random.Random(1)
+        queue, ref_queue = self._new_queue_pair()
+        tx_list: List[FakeTx] = []
+        for i in range(3000):
+            op = rnd.random()
+            if (op < 0.5) or (len(tx_list) == 0):
+                tx = FakeTx(sig=f'0x{i}', sender_address='', nonce=0, gas_price=rnd.randint(1, 10))
+                queue.add(tx)
+                ref_queue.add(tx)
+                tx_list.append(tx)
+            elif op < 0.7:
+                tx = tx_list.pop(rnd.randrange(len(tx_list)))
+                pos = ref_queue.find(tx)
+                self.assertEqual(queue.find(tx), pos)
+                self.assertIs(queue.pop(tx), ref_queue.pop(pos))
+            elif op < 0.9:
+                index = rnd.choice([0, -1, rnd.randrange(len(tx_list))])
+                self.assertIs(queue[index], ref_queue[index])
+                tx = queue.pop(index)
+                self.assertIs(tx, ref_queue.pop(index))
+                tx_list.remove(tx)
+            elif op < 0.95:
+                index = rnd.randrange(len(tx_list) + 1)
+                extracted_list = queue.extract_list_from(index)
+                self.assertEqual(extracted_list, ref_queue.extract_list_from(index))
+                for tx in extracted_list:
+                    tx_list.remove(tx)
+            else:
+                gas_price = rnd.randint(1, 10)
+                queue.remove_if(lambda a: a.gas_price == gas_price)
+                ref_queue.remove_if(lambda a: a.gas_price == gas_price)
+                tx_list = [tx for tx in tx_list if tx.gas_price != gas_price]
+
+            self._assert_equal_queue(queue, ref_queue)
+            for tx in rnd.sample(tx_list, min(len(tx_list), 3)):
+                self.assertIn(tx, queue)
+                self.assertEqual(queue.find(tx), ref_queue.find(tx))
+
+    def test_errors(self):
+        queue, _ = self._new_queue_pair()
+        tx = FakeTx(sig='0x1', sender_address='', nonce=0, gas_price=1)
+        with self.assertRaises(IndexError):
+            _ = queue[0]
+        with self.assertRaises(AssertionError):
+            queue.pop(tx)
+
+        queue.add(tx)
+        with self.assertRaises(AssertionError):
+            queue.add(tx)
+        with self.assertRaises(IndexError):
+            queue.pop(1)
+        self.assertIsNone(queue.find(FakeTx(sig='0x2', sender_address='', nonce=0, gas_price=1)))
+
+        queue.clear()
+        self.assertEqual(len(queue), 0)
+        self.assertNotIn(tx, queue)
+
+    @staticmethod
+    def _run_mempool_workload(queue_type, tx_list: List[FakeTx]) -> float:
+        """Adds all txs and executes them in the order of MPTxSchedule: by sender gas price, by sender nonce"""
+        start_time = time.monotonic()
+
+        gas_price_queue = queue_type(lambda a: -a.gas_price, lambda a: a.sig)
+        sender_queue = queue_type(lambda a: a[0][-1].gas_price, lambda a: a[1])
+        nonce_queue_dict = {}
+
+        for tx in tx_list:
+            gas_price_queue.add(tx)
+            nonce_queue = nonce_queue_dict.get(tx.sender_address, None)
+            if nonce_queue is None:
+                nonce_queue = queue_type(lambda a: -a.nonce, lambda a: a.sig)
+                nonce_queue_dict[tx.sender_address] = nonce_queue
+            nonce_queue.add(tx)
+
+        for sender_address, nonce_queue in nonce_queue_dict.items():
+            sender_queue.add((nonce_queue, sender_address))
+
+        done_cnt = 0
+        while len(sender_queue) > 0:
+            nonce_queue, sender_address = sender_queue.pop(-1)
+            tx = nonce_queue.pop(-1)
+            gas_price_queue.pop(tx)
+            done_cnt += 1
+            if len(nonce_queue) > 0:
+                sender_queue.add((nonce_queue, sender_address))
+
+        assert done_cnt == len(tx_list)
+        assert len(gas_price_queue) == 0
+        return time.monotonic() - start_time
+
+    def test_benchmark_mempool_workload(self):
+        tx_cnt, sender_cnt = 20_000, 2_000
+        rnd = random.Random(1)
+        tx_list = [
+            FakeTx(sig=f'0x{i}', sender_address=f'0x{i % sender_cnt}', nonce=i // sender_cnt,
+                   gas_price=rnd.randint(1, 1000) * 10**9)
+            for i in range(tx_cnt)
+        ]
+
+        new_time = self._run_mempool_workload(SortedQueue, tx_list)
+        old_time = self._run_mempool_workload(ListSortedQueue, tx_list)
+        self.info(
+            f'Add and remove {tx_cnt} txs from {sender_cnt} senders: '
+            f'list-based queue {old_time:.3f} sec, chunked queue {new_time:.3f} sec'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import math
+import time
+import unittest
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from logged_groups import logged_group
+
+from ..indexer.base_db import BaseDB
+from ..indexer.indexer_db import IndexerDB
+from ..indexer.sql_dict import SQLDict
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@logged_group("neon.TestCases")
+class TestSQLDictCache(unittest.TestCase):
+    key = 'test_sql_dict_cache'
+
+    def setUp(self) -> None:
+        self.db = SQLDict(tablename='constants')
+        self.db.pop(self.key, None)
+
+    def tearDown(self) -> None:
+        self.db.pop(self.key, None)
+
+    @staticmethod
+    def _count_queries(db: SQLDict) -> dict:
+        counter = {'cnt': 0}
+        cursor = db._cursor
+
+        @contextmanager
+        def _counted_cursor() -> Iterator[BaseDB.Cursor]:
+            counter['cnt'] += 1
+            with cursor() as cur:
+                yield cur
+
+        db._cursor = _counted_cursor
+        return counter
+
+    def test_write_through_cache(self):
+        writer = SQLDict(tablename='constants', cache_ttl_sec=math.inf)
+        writer[self.key] = 1
+        counter = self._count_queries(writer)
+
+        for value in range(2, 100):
+            writer[self.key] = value
+            self.assertEqual(writer[self.key], value)
+            self.assertIn(self.key, writer)
+        # only writes go to the table
+        self.assertEqual(counter['cnt'], 98)
+        self.assertEqual(self.db[self.key], 99)
+
+        del writer[self.key]
+        self.assertNotIn(self.key, writer)
+        with self.assertRaises(KeyError):
+            _ = writer[self.key]
+
+    def test_reader_staleness_is_bounded_by_ttl(self):
+        clock = _FakeClock()
+        writer = SQLDict(tablename='constants', cache_ttl_sec=math.inf)
+        reader = SQLDict(tablename='constants', cache_ttl_sec=0.1, clock=clock)
+        counter = self._count_queries(reader)
+
+        writer[self.key] = 1
+        self.assertEqual(reader[self.key], 1)
+        self.assertEqual(counter['cnt'], 1)
+
+        writer[self.key] = 2
+        clock.now += 0.099
+        self.assertEqual(reader[self.key], 1)
+        self.assertEqual(counter['cnt'], 1)
+
+        clock.now += 0.001
+        self.assertEqual(reader[self.key], 2)
+        self.assertEqual(counter['cnt'], 2)
+
+        # missing keys aren't cached
+        del writer[self.key]
+        clock.now += 0.1
+        with self.assertRaises(KeyError):
+            _ = reader[self.key]
+        writer[self.key] = 3
+        self.assertEqual(reader[self.key], 3)
+
+    def test_no_cache_by_default(self):
+        counter = self._count_queries(self.db)
+        self.db[self.key] = 1
+        for _ in range(10):
+            self.assertEqual(self.db[self.key], 1)
+        self.assertEqual(counter['cnt'], 11)
+
+    def test_benchmark_10k_block_number(self):
+        call_cnt = 10000
+        result_dict = {}
+        for name, indexer_db in (
+            ('no cache', IndexerDB()),
+            ('TTL cache', IndexerDB()),
+            ('write-through cache', IndexerDB(is_writer=True)),
+        ):
+            if name == 'no cache':
+                indexer_db._constants_db._cache_ttl_sec = None
+            counter = self._count_queries(indexer_db._constants_db)
+
+            start_time = time.monotonic()
+            for _ in range(call_cnt):
+                indexer_db.get_latest_block_slot()
+            result_dict[name] = (counter['cnt'], time.monotonic() - start_time)
+
+        self.info(f'{call_cnt} eth_blockNumber calls: ' + ', '.join(
+            f'{name} - {query_cnt} queries in {spent_time * 1000:.1f} ms'
+            for name, (query_cnt, spent_time) in result_dict.items()
+        ))
+        self.assertEqual(result_dict['no cache'][0], call_cnt)
+        self.assertLess(result_dict['TTL cache'][0], call_cnt // 10)
+        self.assertEqual(result_dict['write-through cache'][0], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()